@@ -5,9 +5,11 @@ import os
 import html
 import copy
 import re
-import boto3
 from botocore.exceptions import ClientError
 
+from dataset_refresh import DatasetRefresher
+from s3_fetch import S3FrameCache, make_s3_client
+
 # Import authentication functions
 def check_authentication():
     """Check if user is authenticated"""
@@ -281,26 +283,16 @@ def filter_by_project_manager(df, selected_manager):
     return df[df['project_managers'].apply(manager_in_project)]
 
 # --- S3 Helper Functions ---
-@st.cache_data(ttl=60)  # Cache for 1 minute to reduce S3 calls
+@st.cache_resource
+def get_s3_frame_cache():
+    """One pooled S3 client and disk cache shared by every session and thread."""
+    return S3FrameCache(make_s3_client(), S3_BUCKET, S3_PREFIX)
+
+@st.cache_data(ttl=60)  # Revalidate with S3 at most once a minute
 def download_file_from_s3(filename):
-    """Download a file from S3 and return as pandas DataFrame with memory optimization."""
+    """Download a file from S3 and return as pandas DataFrame, reusing the local copy while its ETag is unchanged."""
     try:
-        s3_client = boto3.client('s3')
-        s3_key = f"{S3_PREFIX}{filename}"
-        
-        # Download file content
-        response = s3_client.get_object(Bucket=S3_BUCKET, Key=s3_key)
-        
-        # Read as DataFrame and handle duplicates immediately
-        df = pd.read_csv(response['Body'])
-        
-        # Remove duplicate columns and rows, reset index to ensure clean data
-        if not df.empty:
-            df = df.loc[:, ~df.columns.duplicated()]  # Remove duplicate columns
-            df = df.drop_duplicates()  # Remove duplicate rows
-            df = df.reset_index(drop=True)  # Reset index to avoid duplicate labels
-        
-        return df
+        return get_s3_frame_cache().fetch(filename)
     except ClientError as e:
         st.error(f"Error downloading {filename} from S3: {e}")
         return pd.DataFrame()
@@ -557,6 +549,9 @@ def display_top_action_items(page_key, project_filter=None, office_name_filter=N
 # --- Memory-Efficient Data Filtering ---
 def filter_data_efficiently(original_data, selected_project, selected_office_name, selected_program_manager, selected_project_manager, selected_project_stage, selected_impact_category):
     """Memory-efficient data filtering without deepcopy"""
+    # Deliberately not on dashboard_data.ProjectFilterIndex: these frames come
+    # straight from S3 CSVs (object dtypes, unsorted rows), and the office,
+    # program-manager and stage filters are dimensions the index does not hold.
     if not original_data:
         return None
         
@@ -616,28 +611,46 @@ def filter_data_efficiently(original_data, selected_project, selected_office_nam
         return original_data
 
 # --- Data Loading Function with Memory Optimization ---
-@st.cache_data(ttl=60)  # Cache for 1 minute to reduce S3 calls
-def load_data():
-    """Load all dashboard data from S3 with memory optimization."""
+DATA_PHASES = ['estimating', 'preconstruction', 'construction', 'closeout']
+
+def fetch_dataset(frame_cache):
+    """Load all dashboard data from S3 as (data, messages).
+
+    This runs on the refresher's background thread, so problems are collected
+    as (level, text) messages for load_data to show instead of calling st.* here.
+    """
     data = {}
+    messages = []
     try:
+        # Fetch every file at once; the slowest object bounds the load time
+        filenames = ["executive_summary.csv"] + [f"{phase}_{table}.csv" for phase in DATA_PHASES for table in ('processes', 'kpis')]
+        frames = {}
+        for filename, result in frame_cache.fetch_many(filenames).items():
+            if isinstance(result, ClientError):
+                messages.append(('error', f"Error downloading {filename} from S3: {result}"))
+                result = pd.DataFrame()
+            elif isinstance(result, Exception):
+                messages.append(('error', f"Unexpected error loading {filename}: {result}"))
+                result = pd.DataFrame()
+            frames[filename] = result
+
         # Load executive summary
-        summary_df = download_file_from_s3("executive_summary.csv")
+        summary_df = frames["executive_summary.csv"]
         if not summary_df.empty:
             # Filter for only cost impact category (lowercase)
             data['executive_summary'] = summary_df[summary_df['impact_category'] == 'cost']
         else:
-            st.warning("Executive summary data not found in S3.")
+            messages.append(('warning', "Executive summary data not found in S3."))
             data['executive_summary'] = pd.DataFrame()
         
-        # Load phase data efficiently - only when needed
-        for phase in ['estimating', 'preconstruction', 'construction', 'closeout']:
+        # Every phase is fetched above; split each into its processes and KPIs
+        for phase in DATA_PHASES:
             processes_file = f"{phase}_processes.csv"
             kpis_file = f"{phase}_kpis.csv"
             
             try:
-                df_p = download_file_from_s3(processes_file)
-                df_k = download_file_from_s3(kpis_file)
+                df_p = frames[processes_file]
+                df_k = frames[kpis_file]
                 
                 if not df_p.empty and not df_k.empty:
                     # Add phase column to KPIs
@@ -652,16 +665,37 @@ def load_data():
                     
                     data[phase] = {'processes': df_p, 'kpis': df_k}
                 else:
-                    st.warning(f"Data for {phase} phase not found in S3.")
+                    messages.append(('warning', f"Data for {phase} phase not found in S3."))
                     
             except Exception as e:
-                st.warning(f"Error loading {phase} phase: {str(e)}")
+                messages.append(('warning', f"Error loading {phase} phase: {str(e)}"))
                 continue
         
-        return data
+        return data, messages
     except Exception as e:
-        st.error(f"An unexpected error occurred loading data from S3: {e}")
-        return None
+        messages.append(('error', f"An unexpected error occurred loading data from S3: {e}"))
+        return None, messages
+
+def is_usable_refresh(candidate, current):
+    """Swap in a refreshed dataset only if it has a summary and at least the phases we already serve."""
+    data, _ = candidate
+    if not data or data['executive_summary'].empty:
+        return False
+    current_data = current[0] if current else None
+    return not current_data or set(current_data) <= set(data)
+
+@st.cache_resource
+def get_dataset_refresher():
+    """Process-wide dataset shared by every session, rebuilt in the background once a minute old."""
+    frame_cache = get_s3_frame_cache()
+    return DatasetRefresher(lambda: fetch_dataset(frame_cache), max_age=60, validate=is_usable_refresh)
+
+def load_data():
+    """Return (version, data). Shared and read-only; reruns never block on a reload after the first."""
+    version, (data, messages) = get_dataset_refresher().get()
+    for level, message in messages:
+        getattr(st, level)(message)
+    return version, data
 
 # --- Display Functions ---
 def display_executive_summary(data, summary_for_impact_calc, impact_category_filter, filters):
@@ -892,7 +926,7 @@ def main():
     show_logout_sidebar()
     
     try:
-        original_data = load_data()
+        data_version, original_data = load_data()
         if not original_data: 
             st.error("Could not load data from S3")
             st.stop()
@@ -937,16 +971,22 @@ def main():
         if filters['project_stage'] != 'All Project Stages':
             summary_for_impact_calc = summary_for_impact_calc[summary_for_impact_calc['project_stage'].astype(str) == filters['project_stage']]
 
-        # Use efficient filtering instead of deepcopy
-        filtered_data = filter_data_efficiently(
-            original_data, 
-            filters['project'], 
-            filters['office_name'], 
-            filters['program_manager'],
-            filters['project_manager'],
-            filters['project_stage'],
-            filters['impact_category']
-        )
+        # Use efficient filtering instead of deepcopy; reuse this session's result until the filters or the dataset version change
+        filter_cache_key = (data_version,) + tuple(filters.values())
+        cached_filter = st.session_state.get('filtered_data_cache')
+        if cached_filter and cached_filter[0] == filter_cache_key:
+            filtered_data = cached_filter[1]
+        else:
+            filtered_data = filter_data_efficiently(
+                original_data, 
+                filters['project'], 
+                filters['office_name'], 
+                filters['program_manager'],
+                filters['project_manager'],
+                filters['project_stage'],
+                filters['impact_category']
+            )
+            st.session_state['filtered_data_cache'] = (filter_cache_key, filtered_data)
         
         if not filtered_data:
             st.error("Error filtering data")
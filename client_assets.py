@@ -0,0 +1,381 @@
+"""Browser-side assets (stylesheet and scripts) installed once per session.
+
+Streamlit renders `components.html` in a sandboxed iframe that is torn down
+when it stops being rendered, and listeners created in that iframe die with
+it. The installer therefore copies each script into the parent document,
+where it keeps running for the lifetime of the page.
+"""
+import json
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+_SESSION_FLAG = '_client_assets_installed'
+
+# Accent colors used by the KPI summary sections; each gets its own rule set.
+KPI_ACCENT_COLORS = ('#16a34a', '#ef4444')
+
+def kpi_accent_class(accent_color):
+    return f"kpi-accent-{''.join(c for c in (accent_color or 'default') if c.isalnum())}"
+
+def _kpi_accent_rules(accent_color):
+    marker = kpi_accent_class(accent_color)
+    h = accent_color.lstrip('#')
+    r, g, b = int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
+    return f"""
+div[data-testid="stVerticalBlockBorderWrapper"]:has(.{marker}) {{
+    border-top: 4px solid {accent_color} !important;
+    border-radius: 0.5rem !important;
+}}
+div[data-testid="stVerticalBlockBorderWrapper"]:has(.{marker}) > div[data-testid="stVerticalBlock"] {{
+    padding-top: 0 !important;
+}}
+div[data-testid="stVerticalBlockBorderWrapper"]:has(.kpi-section-toggle.{marker}) {{
+    background: rgba({r},{g},{b},0.30) !important;
+}}
+h2.kpi-section-title.{marker} {{ background: rgba({r},{g},{b},0.30); }}
+.kpi-tbl.{marker} th:not(:last-child) {{ border-right:1px solid rgba({r},{g},{b},0.3); }}
+.kpi-tbl.{marker} .kpi-badge {{ background:{accent_color}; }}
+"""
+
+# Class-based styles for every renderer, installed once per session. Widget
+# rules select on Streamlit's `st-key-<key>` container classes.
+DASHBOARD_CSS = """
+/* Page layout and primary buttons */
+div[data-testid="stAppViewContainer"] > section[data-testid="stMain"] > div[data-testid="stMainBlockContainer"] {
+    padding-top: 1rem !important;
+}
+.block-container {
+    padding-top: 1rem !important;
+}
+div.stButton > button[kind="primary"] {
+    background-color: #1d4ed8;
+    color: white;
+    font-weight: 700;
+    border: 1px solid #1e40af;
+}
+div.stButton > button[kind="primary"]:hover {
+    background-color: #1e40af;
+    color: white;
+    border: 1px solid #1e3a8a;
+}
+
+/* Sidebar */
+section[data-testid="stSidebar"] label,
+section[data-testid="stSidebar"] .stSelectbox label,
+section[data-testid="stSidebar"] .stSlider label,
+section[data-testid="stSidebar"] .stRadio label:first-of-type,
+section[data-testid="stSidebar"] p { font-weight: 700 !important; }
+section[data-testid='stSidebar'] > div:first-child { padding-top: 0 !important; }
+section[data-testid='stSidebar'] .stSidebarContent { padding-top: 0 !important; }
+section[data-testid='stSidebar'] [data-testid='stSidebarContent'] { padding-top: 0 !important; }
+[data-testid='stSidebarHeader'] { height: 2rem !important; min-height: 0 !important; padding: 0 !important; }
+section[data-testid='stSidebar'] h1:first-of-type { margin-top: 0 !important; padding-top: 0 !important; }
+
+/* KPI summary sections */
+div[data-testid="stVerticalBlockBorderWrapper"]:has(.kpi-section-toggle) {
+    padding-bottom: 0 !important;
+    overflow-x: hidden !important;
+    overflow-y: visible !important;
+}
+div[data-testid="stVerticalBlockBorderWrapper"]:has(.kpi-section-toggle) > div[data-testid="stVerticalBlock"] {
+    padding-top: 0 !important;
+    padding-bottom: 0 !important;
+    gap: 0 !important;
+    background: transparent !important;
+}
+div[class*="st-key-kpi_toggle_"] {
+    margin-top: -3.2rem !important;
+    margin-bottom: -0.7rem !important;
+    display: flex !important;
+    justify-content: flex-end !important;
+    padding-right: 0.5rem !important;
+    padding-bottom: 0.4rem !important;
+    width: 100% !important;
+    flex-shrink: 0 !important;
+}
+div[class*="st-key-kpi_toggle_"] > div[data-testid="stButton"] {
+    width: fit-content !important;
+    margin-bottom: 0 !important;
+    flex-shrink: 0 !important;
+    white-space: nowrap !important;
+}
+div[class*="st-key-kpi_toggle_"] > div[data-testid="stButton"] > button {
+    width: fit-content !important;
+    margin-bottom: 0 !important;
+    white-space: nowrap !important;
+}
+h2.kpi-section-title { text-align: center; font-size: 1.8rem; font-weight: 700; margin: -2rem -1rem 0.748rem -1rem; padding: 0.748rem 1rem; background: transparent; color: #111; border-radius: 0.5rem 0.5rem 0 0; }
+h2.kpi-section-title.kpi-section-toggle { font-size: clamp(1rem, 3vw, 1.8rem); margin: -2rem -1rem 0 -1rem; padding: 0.748rem 9rem 0.748rem 1rem; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+.kpi-tbl { width:100%; border-collapse:separate; border-spacing:0 0.35rem; font-size:0.95rem; }
+div[data-testid="stVerticalBlockBorderWrapper"]:has(.kpi-tbl) {
+    padding-top: 0 !important;
+}
+div[data-testid="stVerticalBlockBorderWrapper"]:has(.kpi-tbl) > div[data-testid="stVerticalBlock"] {
+    padding-top: 0 !important;
+    gap: 0 !important;
+}
+.kpi-tbl th { text-align:left; padding:0.5rem 0.6rem; background:#f3f4f6; color:#374151; font-weight:700; font-size:0.8rem; text-transform:uppercase; letter-spacing:0.05em; border-bottom:none; }
+.kpi-tbl th:not(:last-child) { border-right:1px solid #e5e7eb; }
+.kpi-tbl th:first-child { border-radius:0.375rem 0 0 0.375rem; }
+.kpi-tbl th:last-child  { border-radius:0 0.375rem 0.375rem 0; }
+.kpi-tbl td { padding:0.6rem 0.6rem; background:#f9fafb; vertical-align:top; border-right:none; height:4.5rem; }
+.kpi-tbl td:first-child { border-radius:0.375rem 0 0 0.375rem; }
+.kpi-tbl td:last-child  { border-radius:0 0.375rem 0.375rem 0; }
+.kpi-tbl td.rank { width:3rem; }
+.kpi-tbl td.kpi-name { font-weight:700; text-transform:uppercase; color:#111; width:28%; vertical-align:middle; text-align:center; }
+.kpi-tbl td.guidance { color:#374151; }
+.kpi-tbl .kpi-badge { display:inline-flex; align-items:center; justify-content:center; width:1.8rem; height:1.8rem; background:#6b7280; color:white; border-radius:0.3rem; font-weight:700; font-size:0.9rem; }
+/* Equal height KPI boxes */
+div[data-testid="stHorizontalBlock"]:has(.kpi-tbl) { align-items:stretch !important; }
+div[data-testid="stHorizontalBlock"]:has(.kpi-tbl) > div[data-testid="stColumn"] { display:flex !important; flex-direction:column !important; }
+div[data-testid="stHorizontalBlock"]:has(.kpi-tbl) > div[data-testid="stColumn"] > div[data-testid="stVerticalBlock"] { flex:1 !important; display:flex; flex-direction:column; }
+div[data-testid="stHorizontalBlock"]:has(.kpi-tbl) > div[data-testid="stColumn"] > div[data-testid="stVerticalBlock"] > div[data-testid="stVerticalBlockBorderWrapper"] { flex:1; display:flex; flex-direction:column; }
+div[data-testid="stHorizontalBlock"]:has(.kpi-tbl) > div[data-testid="stColumn"] > div[data-testid="stVerticalBlock"] > div[data-testid="stVerticalBlockBorderWrapper"] > div[data-testid="stVerticalBlock"] { flex:1; }
+""" + "".join(_kpi_accent_rules(color) for color in KPI_ACCENT_COLORS) + """
+/* Phase page process rows */
+div[data-testid="stColumn"]:has(div[class*="st-key-btn_show_kpis_"]) > div[data-testid="stVerticalBlock"] {
+    display: flex !important;
+    flex-direction: row !important;
+    align-items: center !important;
+    gap: 0.75rem !important;
+}
+div[data-testid="stColumn"]:has(div[class*="st-key-btn_show_kpis_"]) > div[data-testid="stVerticalBlock"] > div {
+    width: auto !important;
+    flex-shrink: 0 !important;
+}
+div[class*="st-key-btn_show_kpis_"] > div[data-testid="stButton"] > button {
+    white-space: nowrap !important;
+}
+.process-name { font-size: 1.5rem; white-space: nowrap; }
+
+/* Process KPI tables */
+.proc-tbl { width:100%; border-collapse:separate; border-spacing:0 0.35rem; font-size:1.235rem; }
+.proc-tbl th { text-align:left; padding:0.5rem 0.6rem; background:#f3f4f6; color:#374151; font-weight:700; font-size:1.04rem; text-transform:uppercase; letter-spacing:0.05em; }
+.proc-tbl th:first-child { border-radius:0.375rem 0 0 0.375rem; }
+.proc-tbl th:last-child  { border-radius:0 0.375rem 0.375rem 0; }
+.proc-tbl th:not(:last-child) { border-right:1px solid #e5e7eb; }
+.proc-tbl th:nth-child(2), .proc-tbl th:nth-child(3), .proc-tbl th:nth-child(4), .proc-tbl th:nth-child(5) { text-align:center; }
+.proc-tbl td { padding:0.6rem; background:#f9fafb; text-align:center; }
+.proc-tbl td:not(:last-child) { font-size:1.235rem; }
+.proc-tbl td:first-child { text-align:left; border-radius:0.375rem 0 0 0.375rem; }
+.proc-tbl td:last-child  { border-radius:0 0.375rem 0.375rem 0; }
+.priority-pill { display:inline-block; min-width:5rem; text-align:center; padding:0.2rem 0.6rem; border-radius:9999px; font-size:1.1rem; font-weight:700; }
+.priority-high { background:#dcfce7; color:#166534; }
+.priority-average { background:#ecfccb; color:#3f6212; }
+.priority-low { background:#fef9c3; color:#854d0e; }
+.kpi-tip-wrap { display:inline-block; cursor:help; }
+.kpi-tip-marker { font-size:1.04rem; color:#6b7280; font-weight:600; }
+.kpi-tip-box { display:none; position:fixed; background:#1e293b; color:#f8fafc; padding:0.55rem 0.8rem; border-radius:0.4rem; font-size:1.23rem; font-weight:400; line-height:1.5; width:420px; z-index:99999; pointer-events:none; white-space:normal; box-shadow:0 4px 12px rgba(0,0,0,0.3); }
+
+/* Portfolio scoreboard */
+body:has(.st-key-scoreboard_search) h1 a,
+body:has(.st-key-scoreboard_search) h2 a,
+body:has(.st-key-scoreboard_search) h3 a { display: none !important; }
+div.st-key-sc_search_input { margin-top: -1.2rem !important; }
+div.st-key-sc_search_input input { font-size: 0.95rem !important; padding: 0.35rem 0.6rem !important; }
+div[data-testid="stHorizontalBlock"]:has(.st-key-sc_sort_segment) {
+    gap: 0 !important; margin-bottom: 0 !important;
+}
+div.st-key-sc_sort_segment button,
+div.st-key-sc_sort_cr button,
+div.st-key-sc_sort_value button,
+div.st-key-sc_sort_start button,
+div.st-key-sc_sort_end button {
+    background: #f3f4f6 !important; color: #374151 !important;
+    border: none !important; border-right: 1px solid #e5e7eb !important;
+    border-radius: 0 !important;
+    box-shadow: none !important; outline: none !important;
+    font-size: 0.8rem !important; font-weight: 700 !important;
+    text-transform: uppercase !important; letter-spacing: 0.05em !important;
+    padding: 0.5rem 0.6rem !important; transition: none !important;
+}
+div.st-key-sc_sort_segment button:hover,
+div.st-key-sc_sort_cr button:hover,
+div.st-key-sc_sort_value button:hover,
+div.st-key-sc_sort_start button:hover,
+div.st-key-sc_sort_end button:hover {
+    background: #e5e7eb !important; color: #111 !important;
+}
+div.st-key-sc_sort_segment button:focus:not(:active),
+div.st-key-sc_sort_cr button:focus:not(:active),
+div.st-key-sc_sort_value button:focus:not(:active),
+div.st-key-sc_sort_start button:focus:not(:active),
+div.st-key-sc_sort_end button:focus:not(:active) {
+    box-shadow: none !important;
+}
+div.st-key-sc_sort_segment button { border-radius: 0.375rem 0 0 0.375rem !important; }
+div.st-key-sc_sort_end button     { border-radius: 0 0.375rem 0.375rem 0 !important; border-right: none !important; }
+.sc-tbl { width:100%; border-collapse:separate; border-spacing:0 0.35rem; font-size:0.95rem; }
+.sc-tbl td { padding:0.6rem 0.6rem; background:#f9fafb; vertical-align:middle; border:none; }
+.sc-tbl td:first-child { border-radius:0.375rem 0 0 0.375rem; }
+.sc-tbl td:last-child  { border-radius:0 0.375rem 0.375rem 0; }
+.sc-tbl td.seg-name    { font-weight:700; color:#111; width:20%; font-size:1.19rem; }
+.sc-tbl td.cr-score   { width:22%; padding-top:0.6rem; }
+.sc-tbl td.proj-value { text-align:center; width:20%; font-size:1.19rem; }
+.sc-tbl td.proj-date  { text-align:center; width:19%; font-size:1.19rem; }
+.sc-tbl .sc-bar-wrap span { padding: 0.1rem 0.30rem !important; line-height: 1 !important; }
+div[data-testid="stVerticalBlockBorderWrapper"]:has(.st-key-sc_sort_segment) { margin-top: -1.5rem !important; }
+
+/* Scoreboard pagination */
+div.st-key-sc_pg_first button, div.st-key-sc_pg_prev button,
+div.st-key-sc_pg_next button, div.st-key-sc_pg_last button {
+    background: #f3f4f6 !important; color: #000 !important;
+    border: 1px solid #e5e7eb !important; border-radius: 0.375rem !important;
+    font-size: 2.55rem !important; font-weight: 700 !important;
+    padding: 0 0.4rem !important; box-shadow: none !important;
+    height: 2.0rem !important; min-height: 0 !important; width: auto !important;
+    line-height: 1 !important; overflow: visible !important;
+    display: flex !important; align-items: center !important;
+    justify-content: center !important;
+}
+div.st-key-sc_pg_first button p, div.st-key-sc_pg_prev button p,
+div.st-key-sc_pg_next button p, div.st-key-sc_pg_last button p {
+    font-size: 2.55rem !important; font-weight: 700 !important;
+    color: #000 !important; line-height: 1 !important; margin: 0 !important;
+    padding: 0 !important; display: flex !important;
+    align-items: center !important; justify-content: center !important;
+}
+div.st-key-sc_pg_first button:hover, div.st-key-sc_pg_prev button:hover,
+div.st-key-sc_pg_next button:hover, div.st-key-sc_pg_last button:hover {
+    background: #e5e7eb !important; color: #000 !important;
+}
+div.st-key-sc_pg_first button:disabled, div.st-key-sc_pg_prev button:disabled,
+div.st-key-sc_pg_next button:disabled, div.st-key-sc_pg_last button:disabled {
+    opacity: 1 !important; cursor: default !important;
+}
+div.st-key-sc_pg_first button:disabled p, div.st-key-sc_pg_prev button:disabled p,
+div.st-key-sc_pg_next button:disabled p, div.st-key-sc_pg_last button:disabled p {
+    color: #bbb !important;
+}
+div[data-testid="stHorizontalBlock"]:has(.st-key-sc_pg_first) {
+    margin-top: -0.5rem !important;
+    margin-bottom: 0 !important;
+    margin-left: auto !important;
+    margin-right: auto !important;
+    gap: 0.5rem !important;
+    align-items: center !important;
+    flex-wrap: nowrap !important;
+    min-width: max-content !important;
+    width: max-content !important;
+}
+div[data-testid="stHorizontalBlock"]:has(.st-key-sc_pg_first) > div[data-testid="stColumn"] {
+    flex: 0 0 auto !important;
+    width: auto !important;
+    min-width: 0 !important;
+    overflow: visible !important;
+}
+p.sc-page-label { text-align:center; margin:0; margin-top:-0.4rem; padding:0 1.5rem; font-weight:700; font-size:1.3rem; width:100%; white-space:nowrap; display:flex; align-items:center; justify-content:center; height:2.0rem; }
+div[data-testid="stHorizontalBlock"]:has(.st-key-sc_goto_input) {
+    margin-top: 0 !important;
+    margin-left: auto !important;
+    margin-right: auto !important;
+    width: max-content !important;
+    align-items: center !important;
+    gap: 0.4rem !important;
+}
+div[data-testid="stHorizontalBlock"]:has(.st-key-sc_goto_input) + div,
+div[data-testid="stVerticalBlock"] > div:has(div[data-testid="stHorizontalBlock"]:has(.st-key-sc_goto_input)) {
+    margin-top: 0 !important;
+    padding-top: 0 !important;
+}
+div[data-testid="stVerticalBlock"] > div:has(+ div > div[data-testid="stHorizontalBlock"]:has(.st-key-sc_goto_input)) {
+    margin-bottom: 0 !important;
+    padding-bottom: 0 !important;
+}
+div.st-key-sc_goto_input, div.st-key-sc_goto_input > div, div.st-key-sc_goto_input > div > div {
+    min-height: 0 !important; height: auto !important;
+    margin-bottom: 0 !important; padding-bottom: 0 !important;
+}
+div.st-key-sc_goto_input input {
+    width: 3.0rem !important; text-align: center !important;
+    height: 2.0rem !important; min-height: 0 !important;
+    padding-top: 0 !important; padding-bottom: 0 !important;
+    padding-left: 0.4rem !important; padding-right: 0.4rem !important;
+    font-size: 1.3rem !important; font-weight: 700 !important;
+    line-height: normal !important; box-sizing: border-box !important;
+}
+div[data-testid="stHorizontalBlock"]:has(.st-key-sc_goto_input) > div[data-testid="stColumn"]:first-child {
+    flex: 0 0 max-content !important; width: max-content !important;
+    display: flex !important; align-items: center !important;
+}
+div[data-testid="stHorizontalBlock"]:has(.st-key-sc_goto_input) > div[data-testid="stColumn"]:last-child {
+    flex: 0 0 auto !important; width: auto !important;
+    display: flex !important; align-items: center !important;
+}
+div.st-key-sc_goto_btn button {
+    background: #f3f4f6 !important; color: #000 !important;
+    border: 1px solid #e5e7eb !important; border-radius: 0.375rem !important;
+    font-size: 0.85rem !important; font-weight: 600 !important;
+    padding: 0.3rem 0.7rem !important; box-shadow: none !important;
+}
+p.sc-goto-label { font-size:1.3rem; font-weight:700; margin:0; display:flex; align-items:center; height:2.0rem; white-space:nowrap; }
+"""
+
+# A single delegated controller for every `.kpi-tip-wrap[data-tip]` on the
+# page. It shows one shared `.kpi-tip-box`, positioned next to the hovered
+# marker, so tables need no per-row markup or per-table observers.
+TOOLTIP_MANAGER_JS = """
+(function() {
+    var doc = document;
+    if (doc.__kpiTipManager) return;
+    doc.__kpiTipManager = true;
+
+    var box = doc.createElement('div');
+    box.className = 'kpi-tip-box';
+    doc.body.appendChild(box);
+    var current = null;
+
+    function hide() {
+        current = null;
+        box.style.display = 'none';
+    }
+
+    function show(wrap) {
+        current = wrap;
+        box.textContent = wrap.getAttribute('data-tip');
+        box.style.display = 'block';
+        var rect = wrap.getBoundingClientRect();
+        var tipH = box.offsetHeight;
+        var tipW = box.offsetWidth;
+        var top = rect.top - tipH - 8;
+        if (top < 8) top = rect.bottom + 8;
+        var left = rect.left;
+        if (left + tipW > window.innerWidth - 8) left = window.innerWidth - tipW - 8;
+        if (left < 8) left = 8;
+        box.style.top = top + 'px';
+        box.style.left = left + 'px';
+    }
+
+    doc.addEventListener('mouseover', function(event) {
+        var wrap = event.target.closest && event.target.closest('.kpi-tip-wrap[data-tip]');
+        if (wrap && wrap !== current) show(wrap);
+    });
+    doc.addEventListener('mouseout', function(event) {
+        if (current && !current.contains(event.relatedTarget)) hide();
+    });
+    doc.addEventListener('scroll', hide, true);
+})();
+"""
+
+def install_client_assets():
+    """Inject the stylesheet and page scripts into the parent document on the first run of a session."""
+    if st.session_state.get(_SESSION_FLAG):
+        return
+    scripts = [TOOLTIP_MANAGER_JS]
+    components.html(f"""<script>
+    (function() {{
+        var doc = window.parent.document;
+        // Appended to the end of <body> so it follows Streamlit's own <head> styles.
+        var style = doc.getElementById('dashboard-stylesheet') || doc.createElement('style');
+        style.id = 'dashboard-stylesheet';
+        style.textContent = {json.dumps(DASHBOARD_CSS)};
+        doc.body.appendChild(style);
+        {json.dumps(scripts)}.forEach(function(code) {{
+            var script = doc.createElement('script');
+            script.textContent = code;
+            doc.head.appendChild(script);
+        }});
+    }})();
+    </script>""", height=0)
+    st.session_state[_SESSION_FLAG] = True
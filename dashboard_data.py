@@ -0,0 +1,870 @@
+"""Data layer for the CR-Score dashboard.
+
+Tables are read from a columnar store (Parquet or Arrow IPC files written next
+to the CSV exports) when one exists, falling back to the CSVs otherwise.
+Arrow IPC copies are memory-mapped, so server processes on one host share a
+single copy of the data; ``sync_arrow_store`` keeps them current.
+Every table is typed once on the way in (``ingest_table``, per the declared
+``TABLE_SCHEMAS``), so the store and the frames read from it carry
+categories, compact numeric measures and parsed dates rather than raw text.
+The store also holds small precomputed tables (``DERIVED_TABLES``): the KPI
+cube and the ``projects`` dimension, so the summary pages never read a phase's
+KPI rows.
+Run ``python dashboard_data.py`` to (re)build the columnar files.
+"""
+import argparse
+import contextlib
+import hashlib
+import os
+import re
+import threading
+import uuid
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+PHASES = ['bidding', 'preconstruction', 'construction', 'closeout']
+
+# Read order when more than one columnar copy of a table is present (see
+# read_table): the memory-mapped Arrow IPC copy first, as long as it is not
+# older than its source, then Parquet. The converter CLI writes Parquet by
+# default, the compact copy to ship; streamlit_app.py keeps the Arrow copies
+# current itself.
+COLUMNAR_FORMATS = {
+    'arrow': '.arrow',
+    'parquet': '.parquet',
+}
+
+_UNNAMED_COLUMN = re.compile(r'^Unnamed: \d+$')
+
+# Declared column types per table, applied once at ingest (ingest_table), so
+# the columnar store and every frame built from it are already typed:
+#   'category'          keys and repeated labels: dense integer codes plus a
+#                       dictionary (the categories) to translate them back
+#   'float32', 'float64', 'bool'
+#                       float32 only for values that are shown or averaged for
+#                       display; anything summed and ranked (KPI scores, weights,
+#                       unrealized values, item weights) stays float64 so ties
+#                       order the same as in the source data
+#   'number'            numeric text that may carry '%', '$' or ',' -> float64
+#   'date'              DATE_FORMAT text -> datetime64
+#   str                 free text
+DATE_FORMAT = '%m/%d/%Y'
+
+_PROCESS_SCHEMA = {
+    'projectId': 'category',
+    'project_id': 'category',
+    'region': 'category',
+    'projectManager': 'category',
+    'impact_category': 'category',
+    'process_name': 'category',
+    'score': 'float32',
+}
+
+_KPI_SCHEMA = {
+    'projectId': 'category',
+    'project_id': 'category',
+    'startDate': 'date',
+    'endDate': 'date',
+    'ProjValue': 'number',
+    'impact_category': 'category',
+    'process_name': 'category',
+    'kpi_name': 'category',
+    'actual': 'number',
+    'bp_lower_bound': 'float32',
+    'bp_upper_bound': 'float32',
+    'bp_range_display': str,
+    'unit': 'category',
+    'higher_is_better': 'bool',
+    'importance_weight': 'float64',
+    'score': 'float64',
+    'phase wt': 'float64',
+    'process wt': 'float64',
+    'KPI wt': 'float64',
+    'realized_value': 'float64',
+    'unrealized_value': 'float64',
+    'process_level_unrealized_value': 'float64',
+    'phase_level_unrealized_value': 'float64',
+    'ID': str,
+}
+
+TABLE_SCHEMAS = {
+    'executive_summary': {
+        'projectId': 'category',
+        'region': 'category',
+        'projectManager': 'category',
+        'impact_category': 'category',
+        'score': 'float64',
+        'phaseScore_bidding': 'float32',
+        'phaseScore_precon': 'float32',
+        'phaseScore_construction': 'float32',
+        'phaseScore_closeout': 'float32',
+    },
+    'procore-itemized-combined': {
+        'projectId': 'category',
+        'region': 'category',
+        'projectManager': 'category',
+        'impact_category': 'category',
+        'action_item_type': 'category',
+        'action_item_id': str,
+        'description': str,
+        'required_action': str,
+        'weight': 'float64',
+    },
+}
+for _phase in PHASES:
+    TABLE_SCHEMAS[f"{_phase}_processes"] = _PROCESS_SCHEMA
+    TABLE_SCHEMAS[f"{_phase}_kpis"] = _KPI_SCHEMA
+
+# Bumped whenever the schema changes, so Arrow copies written under an older one are rebuilt.
+STORE_VERSION = '5'
+_STORE_VERSION_KEY = b'dashboard_store_version'
+
+
+# Precomputed tables (KpiCube cells, build_projects()) and the source tables each is built from.
+DERIVED_TABLES = {
+    'kpi_cube': [f"{phase}_kpis" for phase in PHASES],
+    'projects': ['executive_summary', 'construction_kpis'],
+}
+
+# Low-value near-miss KPIs are left out of the Construction/Safety views.
+EXCLUDED_KPIS = {'construction': ('safety', {'near miss rate', 'near miss detail quality'})}
+
+
+def table_path(base_path, name, fmt='csv'):
+    extension = '.csv' if fmt == 'csv' else COLUMNAR_FORMATS[fmt]
+    return os.path.join(base_path, f"{name}{extension}")
+
+def columnar_path(base_path, name):
+    """Return the path of the first columnar copy of a table in COLUMNAR_FORMATS order, or None."""
+    for fmt in COLUMNAR_FORMATS:
+        path = table_path(base_path, name, fmt)
+        if os.path.exists(path):
+            return path
+    return None
+
+def table_exists(base_path, name):
+    return columnar_path(base_path, name) is not None or os.path.exists(table_path(base_path, name))
+
+def parse_number(values):
+    """Numbers from text that may carry '%', '$' or thousands separators, as float64."""
+    if values.dtype.kind not in 'iufb':
+        values = values.astype(str).str.replace(r'[%$,]', '', regex=True).str.strip()
+    return pd.to_numeric(values, errors='coerce').astype('float64')
+
+def parse_date(values):
+    """Dates in DATE_FORMAT as datetime64; values in another format fall back to inference."""
+    if values.dtype.kind == 'M':
+        return values
+    parsed = pd.to_datetime(values, format=DATE_FORMAT, errors='coerce')
+    unparsed = parsed.isna() & values.notna()
+    if unparsed.any():
+        parsed[unparsed] = pd.to_datetime(values[unparsed], errors='coerce')
+    return parsed
+
+def _parse_bool(values):
+    if values.dtype == bool:
+        return values
+    return values.astype(str).str.strip().str.lower().isin(['true', '1', 'yes'])
+
+def _to_declared(values, kind):
+    if kind == 'number':
+        return parse_number(values)
+    if kind == 'date':
+        return parse_date(values)
+    if kind == 'bool':
+        return _parse_bool(values)
+    if kind == 'category':
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype('category')
+        # Sorted categories make code order match value order (read_csv collects them chunk by chunk).
+        if not values.cat.categories.is_monotonic_increasing:
+            values = values.cat.reorder_categories(values.cat.categories.sort_values())
+        return values
+    return values if values.dtype == kind else pd.to_numeric(values, errors='coerce').astype(kind)
+
+def sort_by_project(df):
+    """df with its rows in projectId order (stable), so each project's rows are contiguous."""
+    column = next((c for c in ('projectId', 'project_id') if c in df.columns), None)
+    if column is None or df[column].is_monotonic_increasing:
+        return df
+    return df.sort_values(column, kind='stable', ignore_index=True)
+
+def ingest_table(name, df):
+    """Apply the table's declared schema and sort its rows by project.
+
+    Columns already of their declared type, and tables already in project
+    order, are left as they are.
+    """
+    converted = {}
+    for column, kind in TABLE_SCHEMAS.get(name, {}).items():
+        if kind is str or column not in df.columns:
+            continue
+        values = _to_declared(df[column], kind)
+        if values is not df[column]:
+            converted[column] = values
+    df = df.assign(**converted) if converted else df
+    return sort_by_project(df) if name in TABLE_SCHEMAS else df
+
+def read_csv_table(base_path, name):
+    """Read a table from its CSV export and apply its declared schema."""
+    schema = TABLE_SCHEMAS.get(name, {})
+    # read_csv parses the plain types itself; the rest are read as text for ingest_table.
+    dtypes = {column: kind if kind in ('category', 'float32', 'float64', 'bool') else str for column, kind in schema.items()}
+    df = pd.read_csv(table_path(base_path, name), dtype=dtypes)
+    # Some exports carry trailing empty columns; they hold no data.
+    empty_unnamed = [c for c in df.columns if _UNNAMED_COLUMN.match(str(c)) and df[c].isna().all()]
+    if empty_unnamed:
+        df = df.drop(columns=empty_unnamed)
+    return ingest_table(name, df)
+
+def read_table(base_path, name):
+    """Read a table from the columnar store, falling back to its CSV export.
+
+    An Arrow IPC copy is preferred: it is memory-mapped rather than parsed.
+    A derived table with no stored copy is computed from the phase tables.
+    Columnar copies go through ingest_table too, which is a no-op for copies
+    written from typed frames.
+    """
+    df = _read_columnar_copy(base_path, name)
+    if df is not None:
+        return df
+    if name in DERIVED_TABLES:
+        return build_derived_tables(base_path)[name]
+    return read_csv_table(base_path, name)
+
+def read_derived_tables(base_path="."):
+    """Read every DERIVED_TABLES entry, building the ones with no stored copy in one pass.
+
+    Prefer this to one read_table call per derived table: without a columnar
+    store each of those calls would read the phase tables and build them all.
+    """
+    tables = {name: _read_columnar_copy(base_path, name) for name in DERIVED_TABLES}
+    if any(df is None for df in tables.values()):
+        built = build_derived_tables(base_path)
+        tables = {name: built[name] if df is None else df for name, df in tables.items()}
+    return tables
+
+def _read_columnar_copy(base_path, name):
+    arrow_path = table_path(base_path, name, 'arrow')
+    if os.path.exists(arrow_path) and not _arrow_copy_is_stale(base_path, name):
+        return ingest_table(name, read_arrow_table(arrow_path))
+    # A stale Arrow copy is skipped: the Parquet copy or the source is newer.
+    parquet_path = table_path(base_path, name, 'parquet')
+    if os.path.exists(parquet_path):
+        return ingest_table(name, pd.read_parquet(parquet_path))
+    return None
+
+def read_arrow_table(path):
+    """Memory-map an Arrow IPC file into a DataFrame.
+
+    Numeric columns without nulls and the string columns (as pyarrow-backed
+    strings) stay views onto the mapped file, so every process that maps it
+    shares the same page-cache pages instead of holding a private copy.
+    """
+    table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    return table.to_pandas(split_blocks=True, types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+
+def _to_arrow(df):
+    # Numeric columns go in as raw numpy data so NaN stays a value rather than
+    # becoming a null, which would force a copy when the file is mapped back.
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        if values.dtype.kind in 'iuf':
+            columns[column] = pa.array(values.to_numpy())
+        else:
+            columns[column] = pa.array(values, from_pandas=True)
+    return pa.table(columns)
+
+def write_arrow(df, path):
+    """Write df as an uncompressed Arrow IPC file (mappable), replacing path atomically."""
+    table = _to_arrow(df).replace_schema_metadata({_STORE_VERSION_KEY: STORE_VERSION})
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        # Processes that mapped the previous file keep reading its (unlinked) pages.
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+ARROW_STORE_LOCK = '.dashboard_store.lock'
+
+@contextlib.contextmanager
+def store_lock(base_path):
+    """Exclusive lock, shared by every process on the host, held while the Arrow store is rebuilt."""
+    with open(os.path.join(base_path, ARROW_STORE_LOCK), 'a+b') as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _store_source(base_path, name):
+    """The file a table's Arrow copy is built from: its CSV export, else its Parquet copy."""
+    for path in (table_path(base_path, name), table_path(base_path, name, 'parquet')):
+        if os.path.exists(path):
+            return path
+    return None
+
+def _read_store_source(base_path, name, source):
+    """Read a table from its _store_source() path with its declared schema applied."""
+    if source.endswith('.csv'):
+        return read_csv_table(base_path, name)
+    return ingest_table(name, pd.read_parquet(source))
+
+def _store_sources(base_path, name):
+    if name in DERIVED_TABLES:
+        sources = (_store_source(base_path, source) for source in DERIVED_TABLES[name])
+    else:
+        sources = [_store_source(base_path, name)]
+    return [source for source in sources if source is not None]
+
+def _arrow_store_version(path):
+    try:
+        metadata = pa.ipc.open_file(pa.memory_map(path, 'r')).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    return metadata.get(_STORE_VERSION_KEY, b'').decode()
+
+def _arrow_copy_is_stale(base_path, name):
+    sources = _store_sources(base_path, name)
+    if not sources:
+        return False
+    target = table_path(base_path, name, 'arrow')
+    if not os.path.exists(target) or os.path.getmtime(target) < max(os.path.getmtime(source) for source in sources):
+        return True
+    return _arrow_store_version(target) != STORE_VERSION
+
+def sync_arrow_store(base_path=".", names=None):
+    """Rebuild the Arrow IPC copy of every table whose source is newer; returns the paths written.
+
+    Safe to call from every server process at startup: rebuilds are serialised
+    by store_lock and each process re-checks staleness once it holds the lock,
+    so a changed table is converted once per host.
+    """
+    if names is None:
+        names = list(TABLE_SCHEMAS) + list(DERIVED_TABLES)
+    if not any(_arrow_copy_is_stale(base_path, name) for name in names):
+        return []
+    written = []
+    derived = None
+    with store_lock(base_path):
+        # Source tables first, so the derived tables are built from fresh Arrow copies.
+        for name in sorted(names, key=lambda name: name in DERIVED_TABLES):
+            if not _arrow_copy_is_stale(base_path, name):
+                continue
+            if name in DERIVED_TABLES:
+                if derived is None:
+                    derived = build_derived_tables(base_path)
+                df = derived[name]
+            else:
+                df = _read_store_source(base_path, name, _store_source(base_path, name))
+            written.append(write_arrow(df, table_path(base_path, name, 'arrow')))
+    return written
+
+def write_columnar(base_path=".", fmt='parquet', names=None):
+    """Convert the tables under base_path to columnar files; returns the paths written.
+
+    Each table is converted from its CSV export, else from its Parquet copy,
+    so a Parquet-only directory can still be given an Arrow store.
+    """
+    if names is None:
+        names = list(TABLE_SCHEMAS) + list(DERIVED_TABLES)
+    written = []
+    derived = None
+    for name in names:
+        if name in DERIVED_TABLES:
+            if not _store_sources(base_path, name):
+                continue
+            if derived is None:
+                derived = build_derived_tables(base_path)
+            df = derived[name]
+        else:
+            source = _store_source(base_path, name)
+            # Nothing to convert, or the table is already stored in this format.
+            if source is None or source == table_path(base_path, name, fmt):
+                continue
+            df = _read_store_source(base_path, name, source)
+        path = table_path(base_path, name, fmt)
+        if fmt == 'parquet':
+            df.to_parquet(path, index=False)
+        else:
+            write_arrow(df, path)
+        written.append(path)
+    return written
+
+def phase_exists(base_path, phase):
+    return table_exists(base_path, f"{phase}_processes") and table_exists(base_path, f"{phase}_kpis")
+
+def prepare_phase_kpis(phase, kpi_df):
+    """KPI rows of a phase as the dashboard shows them: excluded KPIs dropped, ``phase`` column added."""
+    if phase in EXCLUDED_KPIS and {'process_name', 'kpi_name'}.issubset(kpi_df.columns):
+        process, kpi_names = EXCLUDED_KPIS[phase]
+        is_process = kpi_df['process_name'].astype(str).str.strip().str.lower() == process
+        is_excluded_kpi = kpi_df['kpi_name'].astype(str).str.strip().str.lower().isin(kpi_names)
+        kpi_df = kpi_df[~(is_process & is_excluded_kpi)]
+    kpi_df = kpi_df.assign(phase=phase.capitalize())
+    if 'project_id' in kpi_df.columns:
+        kpi_df = kpi_df.rename(columns={'project_id': 'projectId'})
+    return kpi_df
+
+def read_phase(base_path, phase):
+    """Return {'processes': ..., 'kpis': ...} for one phase."""
+    processes = read_table(base_path, f"{phase}_processes")
+    if 'project_id' in processes.columns:
+        processes = processes.rename(columns={'project_id': 'projectId'})
+    return {'processes': processes, 'kpis': prepare_phase_kpis(phase, read_table(base_path, f"{phase}_kpis"))}
+
+def build_derived_tables(base_path="."):
+    """Compute every DERIVED_TABLES entry in one pass over the phase KPI tables."""
+    phase_kpis = {phase: prepare_phase_kpis(phase, read_table(base_path, f"{phase}_kpis"))
+                  for phase in PHASES if phase_exists(base_path, phase)}
+    summary_df = read_table(base_path, 'executive_summary') if table_exists(base_path, 'executive_summary') else pd.DataFrame()
+    return {
+        'kpi_cube': KpiCube.from_phase_kpis(phase_kpis).cells,
+        'projects': build_projects(summary_df, phase_kpis.get('construction', pd.DataFrame())),
+    }
+
+
+KPI_CUBE_KEYS = ['phase', 'impact_category', 'process_name', 'kpi_name']
+KPI_WEIGHT_COLUMNS = ['KPI wt', 'kpi_wt', 'kpi_weight', 'importance_weight']
+KPI_PRIORITY_COLUMNS = ['process_level_unrealized_value', 'phase_level_unrealized_value', 'unrealized_value']
+KPI_CUBE_MEASURES = ['score_weighted', 'priority_metric']
+
+
+class KpiCube:
+    """Pre-aggregated KPI measures keyed by (phase, impact_category, process_name, kpi_name).
+
+    ``cells`` holds one sum/count pair per measure for each key and project, so
+    the mean for any project selection is a sum of cells; ``totals`` holds the
+    same cells already rolled up over every project.
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+        self.totals = cells.groupby(KPI_CUBE_KEYS, as_index=False, sort=False, dropna=False, observed=True).sum(numeric_only=True)
+        self.project_ids = frozenset(cells['projectId'].dropna())
+
+    @classmethod
+    def from_phase_kpis(cls, phase_kpis):
+        """Build the cube from a mapping of phase key -> KPI DataFrame."""
+        frames = []
+        for phase, kpi_df in phase_kpis.items():
+            if kpi_df.empty:
+                continue
+            score = kpi_df['score'].astype('float64').fillna(0) if 'score' in kpi_df.columns else 0.0
+            weight_col = next((c for c in KPI_WEIGHT_COLUMNS if c in kpi_df.columns), None)
+            weight = kpi_df[weight_col].astype('float64').fillna(0) if weight_col else 1.0
+            metric_col = next((c for c in KPI_PRIORITY_COLUMNS if c in kpi_df.columns), None)
+            cells = pd.DataFrame({
+                'phase': phase,
+                'impact_category': kpi_df['impact_category'],
+                'process_name': kpi_df['process_name'],
+                'kpi_name': kpi_df['kpi_name'],
+                'projectId': kpi_df['projectId'],
+                'score_weighted_sum': score * weight,
+                'score_weighted_count': 1,
+                'priority_metric_sum': kpi_df[metric_col].astype('float64').fillna(0) if metric_col else 0.0,
+                'priority_metric_count': 1 if metric_col else 0,
+            })
+            frames.append(cells.groupby(KPI_CUBE_KEYS + ['projectId'], as_index=False, sort=False, dropna=False, observed=True).sum())
+        if frames:
+            cells = pd.concat(frames, ignore_index=True)
+            # Phases carry different categories, so concat falls back to object; re-encode once.
+            cells[KPI_CUBE_KEYS + ['projectId']] = cells[KPI_CUBE_KEYS + ['projectId']].astype('category')
+        else:
+            cells = pd.DataFrame(columns=KPI_CUBE_KEYS + ['projectId'] + [f"{m}_{s}" for m in KPI_CUBE_MEASURES for s in ('sum', 'count')])
+        return cls(cells)
+
+    def top(self, measure, project_ids=None, phase=None, impact_category=None, n=5):
+        """Return the n KPIs with the highest mean ``measure`` for the selected cells."""
+        if project_ids is None or self.project_ids.issubset(project_ids):
+            cells = self.totals
+        else:
+            cells = self.cells[self.cells['projectId'].isin(project_ids)]
+        if phase is not None:
+            cells = cells[cells['phase'] == phase]
+        if impact_category is not None:
+            cells = cells[cells['impact_category'] == impact_category]
+        sum_col, count_col = f"{measure}_sum", f"{measure}_count"
+        totals = cells.groupby('kpi_name', as_index=False, observed=True)[[sum_col, count_col]].sum()
+        totals = totals[totals[count_col] > 0]
+        totals[measure] = totals[sum_col] / totals[count_col]
+        return totals[['kpi_name', measure]].sort_values(measure, ascending=False).head(n).reset_index(drop=True)
+
+
+
+PROJECT_COLUMNS = ['projectId', 'region', 'projectManager', 'ProjValue', 'startDate', 'endDate']
+
+
+def build_projects(summary_df, kpi_df):
+    """The project dimension: one row per projectId with region, PM, value and start/end dates.
+
+    Region and PM come from the executive summary; value and dates are repeated
+    on every KPI row of the phase that carries them, and are taken once here.
+    The loader indexes it by projectId; pages join against it rather than
+    deduplicating fact rows.
+    """
+    projects = summary_df.reindex(columns=['projectId', 'region', 'projectManager']).dropna(subset=['projectId']).drop_duplicates('projectId')
+    if {'projectId', 'ProjValue', 'startDate'}.issubset(kpi_df.columns):
+        terms = [c for c in ['projectId', 'ProjValue', 'startDate', 'endDate'] if c in kpi_df.columns]
+        terms = kpi_df[terms].drop_duplicates().groupby('projectId', as_index=False, observed=True).first()
+        projects = projects.merge(terms, on='projectId', how='outer')
+    missing = {'ProjValue': np.nan, 'startDate': pd.NaT, 'endDate': pd.NaT}
+    projects = projects.assign(**{c: v for c, v in missing.items() if c not in projects.columns})
+    return projects[PROJECT_COLUMNS].sort_values('projectId').reset_index(drop=True)
+
+
+class ProjectFilterIndex:
+    """Project bitmaps for the sidebar global filters, built once at load time.
+
+    Projects are numbered by their position in ``project_ids``. Categorical
+    filters map each value to a boolean bitmap over those positions; value and
+    start-date ranges are answered from sorted arrays with two binary searches.
+    Registered frames sorted by projectId (as ingest_table leaves them) keep
+    each project's row range, so a selection is gathered as a few contiguous
+    slices; any other frame keeps a per-row project position instead.
+    """
+
+    def __init__(self, summary_df, projects):
+        self.project_ids = sorted(summary_df['projectId'].dropna().unique())
+        self._positions = pd.Index(self.project_ids)
+        # Per-project attributes come from the projects dimension (indexed by
+        # projectId); only impact category varies within a project.
+        listed = projects[self._positions.get_indexer(projects.index) >= 0].rename_axis('projectId').reset_index()
+        self.by_region = self._bitmaps(listed, 'region')
+        self.by_project_manager = self._bitmaps(listed, 'projectManager')
+        self.by_impact_category = self._bitmaps(summary_df, 'impact_category')
+        positions = self._project_positions(listed['projectId'])
+        self._values = self._sorted_range_index(positions, listed['ProjValue'].to_numpy(dtype='float64'))
+        self._starts = self._sorted_range_index(positions, listed['startDate'].to_numpy(dtype='datetime64[ns]'))
+        # key -> (row ranges or None, row positions or None, impact category masks),
+        # replaced as a whole so a reader never sees a half-registered frame.
+        self._row_layouts = {}
+        self._row_frames = {}
+        # The index is shared by every session; phases are registered lazily from their threads.
+        self._register_lock = threading.Lock()
+        # Distinguishes this load from any other when fingerprinting selections.
+        self.token = uuid.uuid4().hex
+
+    def __len__(self):
+        return len(self.project_ids)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['_register_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._register_lock = threading.Lock()
+
+    def _project_positions(self, ids):
+        """Position in project_ids of each of ids (-1 if unknown); categorical ids are mapped through their codes."""
+        if isinstance(ids.dtype, pd.CategoricalDtype):
+            return np.append(self._positions.get_indexer(ids.cat.categories), -1)[ids.cat.codes.to_numpy()]
+        return self._positions.get_indexer(ids)
+
+    def _bitmaps(self, df, column):
+        frame = df[['projectId', column]].dropna()
+        positions = self._project_positions(frame['projectId'])
+        bitmaps = {}
+        for value, rows in frame.groupby(column, observed=True).indices.items():
+            bitmap = np.zeros(len(self.project_ids), dtype=bool)
+            bitmap[positions[rows]] = True
+            bitmaps[value] = bitmap
+        return bitmaps
+
+    @staticmethod
+    def _sorted_range_index(positions, keys):
+        present = ~pd.isna(keys)
+        positions, keys = positions[present], keys[present]
+        order = np.argsort(keys, kind='stable')
+        return keys[order], positions[order]
+
+    def _range_bitmap(self, sorted_index, low, high):
+        keys, positions = sorted_index
+        start = np.searchsorted(keys, low, side='left')
+        stop = np.searchsorted(keys, high, side='right')
+        bitmap = np.zeros(len(self.project_ids), dtype=bool)
+        bitmap[positions[start:stop]] = True
+        return bitmap
+
+    def start_date_bounds(self):
+        """Earliest and latest project start date, or (None, None)."""
+        keys = self._starts[0]
+        if len(keys) == 0:
+            return None, None
+        return pd.Timestamp(keys[0]), pd.Timestamp(keys[-1])
+
+    def select(self, project=None, region=None, project_manager=None, impact_category=None, value_range=None, start_range=None):
+        """Return the bitmap of projects matching every given filter (None means unfiltered)."""
+        bitmap = np.ones(len(self.project_ids), dtype=bool)
+        empty = np.zeros(len(self.project_ids), dtype=bool)
+        if project is not None:
+            project_bitmap = empty.copy()
+            position = self._positions.get_indexer([project])[0]
+            if position >= 0:
+                project_bitmap[position] = True
+            bitmap &= project_bitmap
+        if region is not None:
+            bitmap &= self.by_region.get(region, empty)
+        if project_manager is not None:
+            bitmap &= self.by_project_manager.get(project_manager, empty)
+        if impact_category is not None:
+            bitmap &= self.by_impact_category.get(impact_category, empty)
+        if value_range is not None:
+            bitmap &= self._range_bitmap(self._values, float(value_range[0]), float(value_range[1]))
+        if start_range is not None:
+            low, high = (np.datetime64(pd.Timestamp(v), 'ns') for v in start_range)
+            bitmap &= self._range_bitmap(self._starts, low, high)
+        return bitmap
+
+    def fingerprint(self, bitmap):
+        """Stable key for a project selection, usable as a cache key."""
+        digest = hashlib.blake2b(np.packbits(bitmap).tobytes(), digest_size=16).hexdigest()
+        return f"{self.token}:{digest}"
+
+    def selected_ids(self, bitmap):
+        return [self.project_ids[i] for i in np.flatnonzero(bitmap)]
+
+    def register_rows(self, key, df):
+        """Record where each project's rows (and each impact category's rows) sit in df."""
+        if 'projectId' not in df.columns:
+            return
+        ids = df['projectId']
+        ranges = positions = None
+        if isinstance(ids.dtype, pd.CategoricalDtype):
+            # Searched on the integer codes; a project absent from df gets code -1 and an empty range.
+            keys, project_keys = ids.cat.codes.to_numpy(), ids.cat.categories.get_indexer(self.project_ids)
+        else:
+            keys, project_keys = ids.to_numpy(dtype=object), np.array(self.project_ids, dtype=object)
+        if ids.notna().all() and pd.Index(keys).is_monotonic_increasing:
+            ranges = (np.searchsorted(keys, project_keys, 'left'), np.searchsorted(keys, project_keys, 'right'))
+        else:
+            positions = self._project_positions(ids)
+        categories = {}
+        if 'impact_category' in df.columns:
+            categories = {value: (df['impact_category'] == value).to_numpy() for value in self.by_impact_category}
+        self._row_layouts[key] = (ranges, positions, categories)
+
+    def ensure_rows(self, key, df):
+        """register_rows(key, df) unless df is already the frame registered under key.
+
+        Safe to call from several sessions at once: the first caller registers
+        df under a lock, and the rest wait for it and find it registered.
+        """
+        if self._row_frames.get(key) == id(df):
+            return
+        with self._register_lock:
+            if self._row_frames.get(key) != id(df):
+                self.register_rows(key, df)
+                self._row_frames[key] = id(df)
+
+    def rows(self, key, bitmap, impact_category=None):
+        """Rows of a registered frame whose project is in bitmap, as a slice or positions for ``.iloc``."""
+        ranges, positions, categories = self._row_layouts[key]
+        if ranges is not None:
+            rows = self._ranges_to_rows(*ranges, bitmap)
+        else:
+            # Rows whose project is unknown carry position -1 and land on the trailing False.
+            rows = np.flatnonzero(np.append(bitmap, False)[positions])
+        if impact_category is not None:
+            in_category = categories.get(impact_category)
+            if in_category is None:
+                return np.zeros(0, dtype=np.intp)
+            if isinstance(rows, slice):
+                rows = np.arange(len(in_category))[rows]
+            rows = rows[in_category[rows]]
+        return rows
+
+    @staticmethod
+    def _ranges_to_rows(starts, stops, bitmap):
+        starts, stops = starts[bitmap], stops[bitmap]
+        present = stops > starts
+        starts, stops = starts[present], stops[present]
+        if len(starts) == 0:
+            return slice(0, 0)
+        if not np.all(starts[1:] >= starts[:-1]):
+            # Rows sorted by codes whose categories are out of order; keep the frame's row order.
+            order = np.argsort(starts, kind='stable')
+            starts, stops = starts[order], stops[order]
+        # Projects whose row ranges touch merge into one run; a single run is a plain slice.
+        breaks = np.flatnonzero(starts[1:] != stops[:-1]) + 1
+        run_starts = starts[np.r_[0, breaks]]
+        run_stops = stops[np.r_[breaks - 1, len(stops) - 1]]
+        if len(run_starts) == 1:
+            return slice(int(run_starts[0]), int(run_stops[0]))
+        lengths = run_stops - run_starts
+        offsets = np.r_[0, np.cumsum(lengths)[:-1]]
+        return np.repeat(run_starts - offsets, lengths) + np.arange(lengths.sum())
+
+    def take(self, key, df, bitmap, impact_category=None):
+        """The rows of registered frame df selected by rows(); df itself when every row is kept."""
+        rows = self.rows(key, bitmap, impact_category)
+        kept = len(range(len(df))[rows]) if isinstance(rows, slice) else len(rows)
+        return df if kept == len(df) else df.iloc[rows]
+
+
+
+class FilteredDataset(Mapping):
+    """Read-only view of the loaded data restricted to a project selection.
+
+    Holds the cached base frames plus a project bitmap. A phase's processes or
+    KPIs are sliced from the base frame the first time a page reads them, so
+    frames the current page never touches are never copied. ``overrides``
+    supplies entries that were already filtered (e.g. the executive summary).
+
+    Phases listed in ``base['phases']`` but not held by ``base`` itself are
+    fetched with ``load_phase(phase)`` on first access, so a page that never
+    reads a phase never loads it.
+    """
+
+    def __init__(self, base, filter_index, project_bitmap, overrides=None, load_phase=None):
+        self._base = base
+        self._index = filter_index
+        self._bitmap = np.array(project_bitmap, dtype=bool)
+        self._bitmap.setflags(write=False)
+        self._overrides = dict(overrides or {})
+        self._load_phase = load_phase
+        self._lazy_phases = [phase for phase in base.get('phases', ()) if phase not in base] if load_phase else []
+        self._phases = {}
+
+    @property
+    def project_bitmap(self):
+        return self._bitmap
+
+    def __getitem__(self, key):
+        if key in self._overrides:
+            return self._overrides[key]
+        if key in PHASES and (key in self._base or key in self._lazy_phases):
+            if key not in self._phases:
+                frames = self._base[key] if key in self._base else self._load_phase(key)
+                self._phases[key] = _FilteredPhase(key, frames, self._index, self._bitmap)
+            return self._phases[key]
+        return self._base[key]
+
+    def __contains__(self, key):
+        # Answered without loading a lazy phase.
+        return key in self._overrides or key in self._base or key in self._lazy_phases
+
+    def __iter__(self):
+        return iter(list(self._base) + self._lazy_phases)
+
+    def __len__(self):
+        return len(self._base) + len(self._lazy_phases)
+
+
+class _FilteredPhase(Mapping):
+    """Lazily filtered {'processes': ..., 'kpis': ...} entry of a FilteredDataset."""
+
+    def __init__(self, phase, frames, filter_index, project_bitmap):
+        self._phase = phase
+        self._frames = frames
+        self._index = filter_index
+        self._bitmap = project_bitmap
+        self._slices = {}
+
+    def __getitem__(self, key):
+        if key not in self._slices:
+            frame = self._frames[key]
+            self._index.ensure_rows(f"{self._phase}_{key}", frame)
+            # A selection that keeps every row hands out the shared frame itself.
+            self._slices[key] = self._index.take(f"{self._phase}_{key}", frame, self._bitmap)
+        return self._slices[key]
+
+    def __iter__(self):
+        return iter(self._frames)
+
+    def __len__(self):
+        return len(self._frames)
+
+
+def freeze_frame(df):
+    """Mark the numpy arrays backing ``df`` read-only, so in-place writes raise.
+
+    Frames derived from it (filters, column selections, ``assign``) are
+    unaffected: under pandas copy-on-write, which streamlit_app.py turns on,
+    they copy before their first write. Extension-typed columns (categoricals, Arrow strings) are left as they are.
+    """
+    for position, dtype in enumerate(df.dtypes):
+        if not isinstance(dtype, np.dtype):
+            continue
+        # to_numpy() hands out a view; the array owning the column's memory is
+        # reached through .base, and every array on the way is frozen too.
+        values = df.iloc[:, position].to_numpy()
+        while isinstance(values, np.ndarray):
+            values.flags.writeable = False
+            values = values.base
+    return df
+
+
+def freeze_dataset(data):
+    """Read-only version of a loaded dataset that is safe to share between sessions.
+
+    Dict levels become ``MappingProxyType`` views and DataFrames are frozen in
+    place; other values (cube, filter index) are returned as they are.
+    """
+    if isinstance(data, dict):
+        return MappingProxyType({key: freeze_dataset(value) for key, value in data.items()})
+    if isinstance(data, pd.DataFrame):
+        return freeze_frame(data)
+    return data
+
+
+SCOREBOARD_COLUMNS = ['Segment', 'CR-Score', 'Estimated Project Value', 'Est Proj Start Date', 'Est Proj End Date']
+
+
+def build_scoreboard(summary_df, projects, segment_col):
+    """Portfolio scoreboard rows for one segmentation, computed in a single groupby pass.
+
+    CR-Score is the mean summary score per segment; value is the sum over the
+    segment's projects (rows of the projectId-indexed ``projects`` dimension)
+    and the dates span their earliest start and latest end.
+    """
+    if summary_df.empty:
+        return pd.DataFrame(columns=SCOREBOARD_COLUMNS)
+    scores = summary_df.groupby(segment_col, sort=True, observed=True)['score'].mean()
+    members = projects[projects.index.isin(summary_df['projectId'].unique())].rename_axis('projectId').reset_index()
+    grouped = members.groupby(segment_col, observed=True)
+    return pd.DataFrame({
+        'Segment': scores.index,
+        'CR-Score': scores.to_numpy(),
+        'Estimated Project Value': grouped['ProjValue'].sum(min_count=1).reindex(scores.index).to_numpy(),
+        'Est Proj Start Date': grouped['startDate'].min().reindex(scores.index).to_numpy(),
+        'Est Proj End Date': grouped['endDate'].max().reindex(scores.index).to_numpy(),
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert the dashboard CSV exports to a columnar store.")
+    parser.add_argument('--base-path', default=".", help="Directory holding the CSV exports (default: current directory)")
+    parser.add_argument('--format', choices=sorted(COLUMNAR_FORMATS), default='parquet', help="Columnar format to write")
+    args = parser.parse_args(argv)
+    for path in write_columnar(args.base_path, args.format):
+        print(f"wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
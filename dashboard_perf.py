@@ -0,0 +1,282 @@
+"""Per-rerun timing spans for the CR-Score dashboard.
+
+Wrap a stage of the script in ``span(name)``, or decorate a function with
+``@timed()``. main() calls ``start_rerun()`` first and ``finish_rerun()`` last.
+Each finished rerun is logged as one JSON line on the ``dashboard.perf`` logger,
+and can be shown in a sidebar panel with ``render_panel()`` (opt in with
+``?perf=1``).
+
+``SamplingProfiler`` samples the script thread's stack while one rerun runs
+and writes a collapsed-stack file (flamegraph.pl / speedscope) plus a table of
+the hottest functions. It is for admins only: it is offered only when
+``DASHBOARD_PROFILE_TOKEN`` is set and the page URL carries
+``?profile=<that token>``.
+
+Spans are kept per script thread, and Streamlit runs each session's reruns on
+its own thread. Outside a rerun (scripts calling ``load_data()`` directly, or a
+fragment rerunning on its own, for example) a span records nothing.
+"""
+import collections
+import contextlib
+import functools
+import hmac
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+import streamlit as st
+
+PANEL_QUERY_PARAM = 'perf'
+PROFILE_QUERY_PARAM = 'profile'
+PROFILE_DIR = os.environ.get('DASHBOARD_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'cr-score-profiles'))
+_PROFILE_NEXT_KEY = '_profile_next_rerun'
+
+logger = logging.getLogger('dashboard.perf')
+if not logger.handlers:
+    # One bare JSON object per line; set DASHBOARD_PERF_LOG=0 to turn the lines off.
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO if os.environ.get('DASHBOARD_PERF_LOG', '1') != '0' else logging.WARNING)
+    logger.propagate = False
+
+_local = threading.local()
+
+# sys.setswitchinterval is process-wide: the first profiler to start saves the
+# interval and the last one to stop restores it, whatever order they finish in.
+_switch_lock = threading.Lock()
+_switch_users = 0
+_saved_switch_interval = None
+
+def _lower_switch_interval(interval):
+    global _switch_users, _saved_switch_interval
+    with _switch_lock:
+        if _switch_users == 0:
+            _saved_switch_interval = sys.getswitchinterval()
+        _switch_users += 1
+        sys.setswitchinterval(min(sys.getswitchinterval(), interval))
+
+def _restore_switch_interval():
+    global _switch_users
+    with _switch_lock:
+        _switch_users -= 1
+        if _switch_users == 0:
+            sys.setswitchinterval(_saved_switch_interval)
+
+class RerunTimings:
+    """Spans recorded during one rerun, aggregated by name in the order they first started."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stats = {}
+        self._stack = []
+
+    def enter(self, name):
+        if name not in self.stats:
+            self.stats[name] = {'name': name, 'depth': len(self._stack), 'calls': 0, 'total_ms': 0.0, 'self_ms': 0.0, 'max_ms': 0.0}
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def exit(self):
+        name, started, child_s = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        entry = self.stats[name]
+        entry['calls'] += 1
+        entry['total_ms'] += elapsed * 1000
+        entry['self_ms'] += (elapsed - child_s) * 1000
+        entry['max_ms'] = max(entry['max_ms'], elapsed * 1000)
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def summary(self, **context):
+        spans = [dict(entry, total_ms=round(entry['total_ms'], 3), self_ms=round(entry['self_ms'], 3), max_ms=round(entry['max_ms'], 3))
+                 for entry in self.stats.values()]
+        return dict(context, total_ms=round((time.perf_counter() - self.started) * 1000, 3), spans=spans)
+
+def start_rerun():
+    """Begin collecting spans for the rerun running on this thread."""
+    _local.timings = RerunTimings()
+
+def finish_rerun(**context):
+    """Stop collecting, log the rerun as one JSON line and return its summary (None outside a rerun)."""
+    timings = getattr(_local, 'timings', None)
+    if timings is None:
+        return None
+    _local.timings = None
+    summary = timings.summary(**context)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(dict(event='rerun', ts=round(time.time(), 3), **summary), default=str))
+    return summary
+
+@contextlib.contextmanager
+def span(name):
+    """Time the enclosed block as `name` within the current rerun."""
+    timings = getattr(_local, 'timings', None)
+    if timings is None:
+        yield
+        return
+    timings.enter(name)
+    try:
+        yield
+    finally:
+        timings.exit()
+
+def timed(name=None):
+    """Decorator form of span(); the span is named after the function unless `name` is given."""
+    def decorate(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, 'timings', None) is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+# @timed() wrapper frames add nothing to a profile; the sampler leaves them out.
+_TIMED_WRAPPER_CODE = timed()(lambda: None).__code__
+
+def _query_param(name):
+    if hasattr(st, 'query_params'):
+        return st.query_params.get(name)
+    # Streamlit < 1.30
+    return (st.experimental_get_query_params().get(name) or [None])[-1]
+
+def query_flag(name):
+    """True when the page URL carries ?name=1 (or true/on)."""
+    return str(_query_param(name)).lower() in ('1', 'true', 'on')
+
+def panel_requested():
+    return query_flag(PANEL_QUERY_PARAM)
+
+def render_panel(summary):
+    """Show a rerun summary from finish_rerun() in the sidebar."""
+    if not summary:
+        return
+    with st.sidebar.expander(f"Performance: {summary['total_ms']:.0f} ms", expanded=True):
+        rows = [{
+            'Stage': '  ' * entry['depth'] + entry['name'],
+            'Calls': entry['calls'],
+            'Total ms': round(entry['total_ms'], 1),
+            'Self ms': round(entry['self_ms'], 1),
+        } for entry in summary['spans']]
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+
+class SamplingProfiler:
+    """Samples one thread's Python stack every `interval` seconds until stop()."""
+
+    def __init__(self, interval=0.001, max_seconds=120):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.samples = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, root_frame=None):
+        """Profile the calling thread. Stacks are cut at `root_frame` (default: the caller's frame)."""
+        self._target = threading.get_ident()
+        self._root = (root_frame or sys._getframe(1)).f_code
+        # The sampler needs the GIL to take a sample; hand it over more often while profiling.
+        _lower_switch_interval(self.interval / 2)
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='rerun-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling; calling it again is a no-op."""
+        if self._thread is None:
+            return self
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        _restore_switch_interval()
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def _run(self):
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                return
+            stack = []
+            while frame is not None:
+                if frame.f_code is not _TIMED_WRAPPER_CODE:
+                    stack.append(_frame_label(frame.f_code))
+                if frame.f_code is self._root:
+                    break
+                frame = frame.f_back
+            self.samples[tuple(reversed(stack))] += 1
+
+    def collapsed(self):
+        """Collapsed-stack lines, "root;...;leaf count", as flamegraph.pl and speedscope read them."""
+        return [f"{';'.join(stack)} {count}" for stack, count in self.samples.most_common()]
+
+    def hot_functions(self, limit=25):
+        """Top `limit` functions by self samples, with their inclusive samples alongside."""
+        own, inclusive = collections.Counter(), collections.Counter()
+        for stack, count in self.samples.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                inclusive[label] += count
+        total = sum(self.samples.values()) or 1
+        return [{
+            'function': label,
+            'self_pct': round(100 * own[label] / total, 1),
+            'total_pct': round(100 * inclusive[label] / total, 1),
+            'samples': own[label],
+        } for label, _ in own.most_common(limit)]
+
+    def save(self, label, directory=None, limit=25):
+        """Write <stamp>-<label>.collapsed and .top.txt under `directory`; returns both paths."""
+        directory = directory or PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{re.sub(r'[^A-Za-z0-9]+', '-', label).strip('-').lower()}")
+        with open(f"{stem}.collapsed", 'w') as f:
+            f.write('\n'.join(self.collapsed()) + '\n')
+        with open(f"{stem}.top.txt", 'w') as f:
+            f.write(f"{label}: {self.elapsed * 1000:.0f} ms, {sum(self.samples.values())} samples every {self.interval * 1000:g} ms\n\n")
+            f.write(f"{'self %':>7} {'total %':>8} {'samples':>8}  function\n")
+            for row in self.hot_functions(limit):
+                f.write(f"{row['self_pct']:7.1f} {row['total_pct']:8.1f} {row['samples']:8d}  {row['function']}\n")
+        return f"{stem}.collapsed", f"{stem}.top.txt"
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def profiling_allowed():
+    """True for admins: DASHBOARD_PROFILE_TOKEN is set and ?profile= carries it."""
+    token = os.environ.get('DASHBOARD_PROFILE_TOKEN')
+    if not token:
+        return False
+    value = _query_param(PROFILE_QUERY_PARAM)
+    return value is not None and hmac.compare_digest(str(value), token)
+
+def start_requested_profile():
+    """Start a profiler if an admin asked for this rerun to be profiled; call first thing in main()."""
+    if not (st.session_state.pop(_PROFILE_NEXT_KEY, False) and profiling_allowed()):
+        return None
+    return SamplingProfiler().start(root_frame=sys._getframe(1))
+
+def render_profiler_controls(profiler, label):
+    """Finish `profiler` (if one ran) and show the admin's profiling controls in the sidebar."""
+    if not profiling_allowed():
+        return
+    with st.sidebar.expander("Profiler", expanded=profiler is not None):
+        st.button("Profile this view", key='profile_next_rerun',
+                  on_click=lambda: st.session_state.update({_PROFILE_NEXT_KEY: True}),
+                  help="Reruns the current view under a sampling profiler")
+        if profiler is None:
+            return
+        profiler.stop()
+        collapsed_path, top_path = profiler.save(label)
+        st.caption(f"{profiler.elapsed * 1000:.0f} ms, {sum(profiler.samples.values())} samples. "
+                   f"Saved {collapsed_path} and {top_path}")
+        st.dataframe(profiler.hot_functions(15), hide_index=True, use_container_width=True)
@@ -0,0 +1,58 @@
+"""Stale-while-revalidate holder for the dashboard dataset.
+
+The first request builds the dataset inline. After that, reruns never wait on
+a reload. Once the dataset is older than `max_age`, the next request starts a
+rebuild on a background thread and keeps getting the current dataset. The
+rebuilt dataset replaces it only if it passes validation. Each swap bumps
+`version`, which session-level caches can use as part of their key.
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class DatasetRefresher:
+    """Serves one shared dataset and rebuilds it in the background once it goes stale."""
+
+    def __init__(self, build, max_age=60, validate=None):
+        self._build = build
+        self.max_age = max_age
+        # validate(candidate, current) -> bool; by default anything but None replaces the current dataset.
+        self._validate = validate or (lambda candidate, current: candidate is not None)
+        self._lock = threading.Lock()
+        self._dataset = None
+        self._built_at = 0.0
+        self._refreshing = False
+        self.version = 0
+
+    def get(self):
+        """Return (version, dataset). Only the first call ever blocks on a build."""
+        with self._lock:
+            if self.version == 0:
+                # Concurrent first sessions wait here for this one build.
+                self._install(self._build())
+            elif not self._refreshing and time.monotonic() - self._built_at >= self.max_age:
+                self._refreshing = True
+                threading.Thread(target=self._refresh, name='dataset-refresh', daemon=True).start()
+            return self.version, self._dataset
+
+    def _install(self, dataset):
+        self._dataset = dataset
+        self._built_at = time.monotonic()
+        self.version += 1
+
+    def _refresh(self):
+        try:
+            candidate = self._build()
+        except Exception:
+            logger.exception("Background dataset refresh failed; keeping version %s", self.version)
+            candidate = None
+        with self._lock:
+            self._refreshing = False
+            if candidate is not None and self._validate(candidate, self._dataset):
+                self._install(candidate)
+            else:
+                # Keep serving the current dataset and try again after another max_age.
+                logger.warning("Refreshed dataset was rejected; keeping version %s", self.version)
+                self._built_at = time.monotonic()
@@ -0,0 +1,291 @@
+"""KPI catalog: definitions, improvement guidance and strength text for the dashboard.
+
+Entries are keyed by normalized KPI name (stripped, lower-case). KPIs without a
+guidance entry fall back to keyword rules, which are compiled into one pattern
+at import time; lookups are memoised per KPI name. Add new KPIs here as phases
+are onboarded.
+"""
+import functools
+import re
+
+KPI_GUIDANCE = {
+    '% of bids targeted': 'Tighten go/no-go criteria by market, client, and margin profile so bid effort focuses on highest win-probability opportunities.',
+    'as-built drawing accuracy': 'Run weekly as-built QA checks with field engineers and require redline updates before each pay-app cycle.',
+    'avg days to submit bid': 'Standardize bid kickoff templates and intermediate deadlines to compress estimating cycle time without reducing quality.',
+    'avg number of sub quotes per trade': 'Expand bidder lists per trade and set minimum quote coverage targets before final estimate lock.',
+    'avg selected sub emr': 'Prioritize subcontractors with stronger safety records and require mitigation plans when EMR exceeds target.',
+    'avg sub quote variance': 'Normalize scope sheets across bidders and hold scope leveling reviews to reduce spread caused by assumptions.',
+    'avg sub response rate': 'Issue bid invites earlier and automate reminder cadences to increase subcontractor response participation.',
+    'avg time to close punch item': 'Assign trade owner and due date to each punch item, then track aging in daily closeout huddles.',
+    'avg time to submit bid': 'Preload historical assemblies and vendor pricing to cut estimate build time for repeat project types.',
+    'bid package completeness rate': 'Use package completeness checklists before release to eliminate missing scope and addenda gaps.',
+    'bid rate per $1m of acv': 'Improve bid efficiency by reusing estimate components and limiting bids with low strategic fit.',
+    'bid win rate': 'Perform bid debriefs by segment and refine pricing strategy where losses consistently exceed threshold.',
+    'budgets create date': 'Set a post-award budget creation SLA and enforce it through project startup readiness gates.',
+    'budgets usage rate': 'Make budget adherence visible in weekly cost reviews and require explanations for off-budget commitments.',
+    'change order time to close': 'Create a fast-lane review workflow for pending change orders with clear owner and approval SLA.',
+    'change order to budget ratio': 'Reduce scope churn by validating design and owner decisions earlier in preconstruction.',
+    'client satisfaction score': 'Close client feedback loops monthly and assign action plans to recurring service pain points.',
+    'client training completion': 'Schedule owner training milestones before turnover and require signoff for each trained system.',
+    'compliance matrix completion rate': 'Track matrix completion weekly and escalate unresolved compliance items ahead of critical gates.',
+    'contract to budget ratio (deviation)': 'Reconcile contract values to control budget early and review deviations before procurement starts.',
+    'cost variance': 'Run variance-to-budget review weekly and trigger corrective action when any cost code drifts beyond threshold.',
+    'daily logs delay': 'Set same-day log submission standards and alert superintendents when logs are missing or late.',
+    'daily logs rate': 'Increase reporting consistency with mobile log prompts and end-of-day completion checks.',
+    'final payment received time': 'Submit complete closeout packages earlier and track owner payment blockers to resolution.',
+    'incident detail quality': 'Use a structured incident template and supervisor review to improve root-cause quality in reports.',
+    'incident rate': 'Focus on pre-task planning, high-risk activity controls, and rapid closure of corrective actions.',
+    'invoice to contract ratio (deviation)': 'Audit billing against contract milestones to prevent over/under billing drift.',
+    'licensing & certification compliance rate': 'Maintain a rolling credential register and block assignments for expired certifications.',
+    'meetings documentation': 'Standardize meeting minutes with decisions, owners, and due dates published within 24 hours.',
+    'meetings rate': 'Set recurring coordination cadence and enforce attendance for critical project functions.',
+    'near miss detail quality': 'Capture near-miss narratives with clear causal factors to improve preventive action quality.',
+    'near miss rate': 'Encourage reporting and trend near misses by activity type to target preventive controls.',
+    'o&m manuals submitted timely': 'Track O&M submittals by system and require trade turnover checklists ahead of handoff.',
+    'observation rate': 'Increase field observation frequency with scheduled safety walks and supervisor accountability.',
+    'observations closed on time': 'Assign close dates during observation entry and escalate overdue items in safety meetings.',
+    'payments to invoices ratio (deviation)': 'Align payment release workflow to approved invoices and resolve disputed line items quickly.',
+    'profit variance': 'Review forecasted margin monthly and intervene early on labor productivity or procurement overrun trends.',
+    'punch list items closed rate': 'Use zone-based closeout plans and trade-specific closure targets to maintain turnover pace.',
+    'quality insp. attach. rate': 'Require photo/document evidence on all quality inspections before closeout approval.',
+    'quality inspection rate': 'Set minimum inspection coverage by work package and track completion against plan.',
+    'rfis closed on time': 'Publish RFI aging dashboards and enforce turnaround SLAs with design and consultant teams.',
+    'rfis lead time': 'Prioritize critical-path RFIs and route them through expedited review with clear ownership.',
+    'rfis rate': 'Reduce avoidable RFIs via pre-install coordination and design clarification workshops.',
+    'safety insp. attach. rate': 'Require visual proof and corrective evidence for all safety inspections to ensure closure quality.',
+    'safety inspection rate': 'Increase planned safety inspection frequency and tie completion to supervisor KPIs.',
+    'safety training': 'Close training gaps with role-based refreshers and track completion before high-risk work starts.',
+    'schedule variance': 'Use look-ahead planning and constraint removal to recover tasks drifting off baseline.',
+    'sub prequal rate': 'Broaden and maintain a prequalified vendor pool to improve competition and reduce procurement risk.',
+    'subcontractor final payments': 'Link final payment release to complete closeout deliverables and verified lien documentation.',
+    'submittals closed on time': 'Track submittal aging by reviewer and escalate overdue approvals before they hit critical path.',
+    'submittals lead time': 'Submit long-lead packages first and lock reviewer turnaround commitments upfront.',
+    'submittals rate': 'Improve planning by mapping required submittals to upcoming work packages earlier.',
+    'avg insurance acquired cycle': 'Pre-collect insurance requirements and automate follow-ups to shorten policy acquisition cycle time.',
+    'avg permit approval cycle': 'Engage permitting authorities early and submit complete packages to reduce review rework.',
+    'avg sub coi received time': 'Set COI deadlines at award and automate reminders until compliant certificates are received.',
+    'budget to bid variance': 'Improve estimate handoff quality and scope alignment to reduce budget drift after award.',
+    'clash detection rate': 'Run model coordination at fixed intervals and require closure of high-severity clashes before release.',
+    'contingency adequacy': 'Calibrate contingency by risk register trends and adjust allowances as uncertainty resolves.',
+    'days until sub contracts executed': 'Use contract execution trackers and pre-negotiate key terms to accelerate signature turnaround.',
+    'drawings usage': 'Drive adoption of current drawing sets through mobile access and version-control checks in the field.',
+    'equipment cost variance': 'Track equipment utilization versus plan and redeploy underused assets to cut variance.',
+    'gantt chart completion rate': 'Enforce schedule update discipline weekly so plan progress reflects real execution status.',
+    'labor cost variance': 'Monitor labor productivity by crew and shift resources where earned-value trends deteriorate.',
+    'materials cost variance': 'Lock buyout pricing early and monitor material quantity deltas against takeoff baselines.',
+    'permit submission timeliness': 'Build permit deliverables into preconstruction milestones and enforce submit-by dates.',
+    'photos usage': 'Standardize photo capture requirements by activity to strengthen documentation and quality validation.',
+    'prime contract to budget variance': 'Align scope interpretation between prime contract and control budget during startup.',
+    'schedule to bid variance': 'Validate bid assumptions against detailed execution logic before final baseline approval.',
+    'specifications usage': 'Improve spec compliance by requiring scope teams to reference spec sections during planning and QA.'
+}
+
+KPI_STRENGTH = {
+    '% of bids targeted': 'A strong result shows the team is focusing effort on the right opportunities instead of spreading resources across low-fit pursuits.',
+    'as-built drawing accuracy': 'A strong result shows field conditions are being documented correctly, which lowers rework, warranty, and turnover risk.',
+    'avg days to submit bid': 'A strong result shows the estimating team can respond quickly without delaying pipeline decisions.',
+    'avg number of sub quotes per trade': 'A strong result shows good market coverage, which improves pricing confidence and reduces buyout risk.',
+    'avg selected sub emr': 'A strong result shows safer subcontractor selection, which lowers incident exposure during execution.',
+    'avg sub quote variance': 'A strong result shows scope alignment across bidders, which reduces pricing uncertainty and missed scope risk.',
+    'avg sub response rate': 'A strong result shows healthy subcontractor engagement, which improves estimate quality and procurement flexibility.',
+    'avg time to close punch item': 'A strong result shows the team resolves finish issues quickly, reducing turnover delays and owner dissatisfaction.',
+    'avg time to submit bid': 'A strong result shows the preconstruction process is efficient and responsive under deadline pressure.',
+    'bid package completeness rate': 'A strong result shows scope packages are well prepared, which lowers bidder confusion and post-award scope gaps.',
+    'bid rate per $1m of acv': 'A strong result shows bid effort is being used efficiently relative to available contract value.',
+    'bid win rate': 'A strong result shows the company is pursuing and pricing work effectively, which indicates strong market discipline.',
+    'budgets create date': 'A strong result shows projects are financially organized early, reducing startup confusion and cost control risk.',
+    'budgets usage rate': 'A strong result shows the budget is actively guiding decisions, which supports stronger cost governance.',
+    'change order time to close': 'A strong result shows scope changes are resolved quickly, reducing revenue leakage and schedule disruption.',
+    'change order to budget ratio': 'A strong result shows scope is stable and well controlled, which lowers commercial and execution risk.',
+    'client satisfaction score': 'A strong result shows the project team is delivering a positive client experience, lowering relationship and repeat-work risk.',
+    'client training completion': 'A strong result shows the owner is prepared to operate the asset, reducing turnover friction and support issues.',
+    'compliance matrix completion rate': 'A strong result shows required obligations are being tracked and completed, reducing legal and contractual risk.',
+    'contract to budget ratio (deviation)': 'A strong result shows the control budget accurately reflects contract scope, lowering downstream cost surprises.',
+    'cost variance': 'A strong result shows the project is staying close to plan financially, which is a direct sign of healthy cost control.',
+    'daily logs delay': 'A strong result shows field records are entered promptly, improving decision quality and reducing documentation gaps.',
+    'daily logs rate': 'A strong result shows disciplined field reporting, which improves visibility into project conditions and issues.',
+    'final payment received time': 'A strong result shows closeout and billing are being completed effectively, improving cash flow reliability.',
+    'incident detail quality': 'A strong result shows safety events are documented clearly, which improves learning and corrective action quality.',
+    'incident rate': 'A strong result shows the project is controlling hazardous work well, reducing harm and operational disruption.',
+    'invoice to contract ratio (deviation)': 'A strong result shows billing stays aligned with contract value, reducing commercial and collection risk.',
+    'licensing & certification compliance rate': 'A strong result shows work is being performed by properly qualified parties, lowering regulatory and safety risk.',
+    'meetings documentation': 'A strong result shows decisions and action items are captured well, reducing coordination failures and ambiguity.',
+    'meetings rate': 'A strong result shows the team maintains consistent coordination rhythm, which lowers communication breakdowns.',
+    'near miss detail quality': 'A strong result shows the team documents weak signals well, improving prevention before incidents occur.',
+    'near miss rate': 'A strong result shows hazards are being surfaced and monitored, which supports proactive risk reduction.',
+    'o&m manuals submitted timely': 'A strong result shows turnover requirements are under control, reducing late closeout and owner readiness risk.',
+    'observation rate': 'A strong result shows the team is actively looking for unsafe conditions, which strengthens leading-indicator safety management.',
+    'observations closed on time': 'A strong result shows issues are being acted on quickly, lowering the chance that known risks remain open.',
+    'payments to invoices ratio (deviation)': 'A strong result shows payment execution is staying aligned with invoicing, reducing cash-flow and dispute risk.',
+    'profit variance': 'A strong result shows the project is protecting expected margin, which indicates solid operational and financial control.',
+    'punch list items closed rate': 'A strong result shows closeout execution is disciplined, reducing turnover delay and reputational risk.',
+    'quality insp. attach. rate': 'A strong result shows inspections are backed by evidence, improving accountability and quality assurance confidence.',
+    'quality inspection rate': 'A strong result shows the team is checking work consistently, which lowers defect escape and rework risk.',
+    'rfis closed on time': 'A strong result shows information gaps are resolved quickly enough to avoid delaying field execution.',
+    'rfis lead time': 'A strong result shows questions are being answered within planned windows, reducing waiting and coordination risk.',
+    'rfis rate': 'A strong result shows design and field coordination are healthy, reducing confusion that can slow production.',
+    'safety insp. attach. rate': 'A strong result shows safety inspections are supported by evidence, improving trust in field verification.',
+    'safety inspection rate': 'A strong result shows safety oversight is active and consistent, which lowers exposure to uncontrolled conditions.',
+    'safety training': 'A strong result shows workers are being prepared for risk, which supports safer and more reliable execution.',
+    'schedule variance': 'A strong result shows the project is performing close to plan, reducing delay risk and recovery pressure.',
+    'sub prequal rate': 'A strong result shows the team has a strong vetted subcontractor pool, reducing performance and compliance risk.',
+    'subcontractor final payments': 'A strong result shows trade closeout is being completed cleanly, reducing lingering contractual disputes.',
+    'submittals closed on time': 'A strong result shows review workflows are supporting production instead of delaying material and equipment release.',
+    'submittals lead time': 'A strong result shows submittal cycles are staying within needed time windows, reducing procurement and schedule risk.',
+    'submittals rate': 'A strong result shows the team is actively moving required submittals through the pipeline, supporting execution readiness.',
+    'avg insurance acquired cycle': 'A strong result shows insurance compliance is secured quickly, reducing startup delay and exposure risk.',
+    'avg permit approval cycle': 'A strong result shows regulatory approvals are moving efficiently, reducing schedule uncertainty before work starts.',
+    'avg sub coi received time': 'A strong result shows subcontractor insurance documentation is being collected promptly, lowering compliance exposure.',
+    'budget to bid variance': 'A strong result shows the handoff from estimate to operating budget is accurate, reducing financial surprises after award.',
+    'clash detection rate': 'A strong result shows design coordination issues are being found early, reducing field conflicts and rework.',
+    'contingency adequacy': 'A strong result shows the project has realistic protection against uncertainty, lowering downside financial risk.',
+    'days until sub contracts executed': 'A strong result shows subcontract agreements are being finalized quickly, reducing procurement and mobilization risk.',
+    'drawings usage': 'A strong result shows teams are using current drawings in the field, reducing installation errors and confusion.',
+    'equipment cost variance': 'A strong result shows equipment spending is under control, indicating disciplined planning and utilization.',
+    'gantt chart completion rate': 'A strong result shows schedule data is being maintained reliably, improving planning and recovery decisions.',
+    'labor cost variance': 'A strong result shows labor productivity is tracking to plan, which is a strong indicator of execution health.',
+    'materials cost variance': 'A strong result shows procurement and consumption are being controlled well, reducing cost overrun risk.',
+    'permit submission timeliness': 'A strong result shows approvals are being pursued on schedule, reducing preventable startup delays.',
+    'photos usage': 'A strong result shows project conditions are being documented visually, improving transparency and issue resolution.',
+    'prime contract to budget variance': 'A strong result shows scope and budget are aligned early, lowering downstream commercial risk.',
+    'schedule to bid variance': 'A strong result shows execution planning is consistent with bid assumptions, reducing delivery risk after award.',
+    'specifications usage': 'A strong result shows teams are relying on technical requirements during execution, lowering quality and compliance risk.'
+}
+
+KPI_DEFINITIONS = {
+    # Bidding - bidresults
+    'bid win rate': 'Percentage of submitted bids that result in a contract award. Reflects the effectiveness of targeting, estimating, and proposal quality.',
+    'cost variance': 'Difference between estimated and actual project costs. Persistent variance signals estimation gaps, scope creep, or poor cost control.',
+    'profit variance': 'Difference between projected and actual profit margin. Reveals how well pricing and cost controls held up through execution.',
+    'schedule variance': 'Difference between planned and actual project completion timeline. Indicates schedule discipline and execution predictability.',
+    # Bidding - bidreview
+    '% of bids targeted': 'Percentage of identified opportunities intentionally pursued. High targeting rates signal disciplined go/no-go decision-making.',
+    'avg days to submit bid': 'Average elapsed time from bid invitation to submission. Shorter cycles with quality output indicate an efficient estimating process.',
+    'avg time to submit bid': 'Average elapsed time from bid invitation to completed submission. Tracks estimating team responsiveness and capacity under deadline pressure.',
+    'bid rate per $1m of acv': 'Number of bids submitted per $1M of annual contract value. Balances bid volume against revenue targets to avoid over- or under-bidding.',
+    # Bidding - compliance
+    'bid package completeness rate': 'Percentage of bid packages submitted with all required documents. Incomplete packages risk disqualification and signal process gaps.',
+    'compliance matrix completion rate': 'Percentage of compliance checklist items completed per bid. Tracks adherence to internal and client bidding requirements.',
+    'licensing & certification compliance rate': 'Percentage of required licenses and certifications held and current across the team. Non-compliance creates legal, safety, and operational risk.',
+    'sub prequal rate': 'Percentage of subcontractors that have passed prequalification screening. Higher rates reduce execution risk from unvetted or underqualified partners.',
+    # Bidding - estimating
+    'avg number of sub quotes per trade': 'Average number of competitive subcontractor bids received per trade. More quotes improve pricing accuracy and reduce cost and risk exposure.',
+    'avg selected sub emr': 'Average Experience Modification Rate of selected subcontractors. Lower EMR indicates a safer, less risky subcontractor pool with better safety track records.',
+    'avg sub quote variance': 'Spread between the highest and lowest subcontractor quotes per trade. High variance signals unclear scope, inconsistent takeoffs, or market uncertainty.',
+    'avg sub response rate': 'Percentage of subcontractors invited to bid who actually submit a quote. Low response rates may indicate scope issues, timing conflicts, or weak relationships.',
+    # Preconstruction - compliance
+    'avg insurance acquired cycle': 'Average days to obtain required insurance certificates after contract award. Delays can hold up project start and create uninsured liability gaps.',
+    'avg permit approval cycle': 'Average days from permit submission to regulatory approval. Longer cycles delay project start and indicate scope complexity or process inefficiency.',
+    'avg sub coi received time': 'Average time to receive Certificates of Insurance from subcontractors after request. Slow COI receipt exposes the project to periods of uninsured risk.',
+    'permit submission timeliness': 'Percentage of permits submitted within the required timeframe ahead of planned start. Late submissions cascade into downstream schedule risk.',
+    # Preconstruction - designReview
+    'clash detection rate': 'Frequency of design clashes identified during BIM or drawing coordination. Early detection prevents costly field conflicts and rework during construction.',
+    'drawings usage': 'Extent to which current drawing sets are actively referenced by project teams. Low usage signals document control gaps or teams working off outdated information.',
+    'photos usage': 'Rate of photo documentation captured and attached to field records. Supports accountability, dispute resolution, and quality verification throughout the project.',
+    'specifications usage': 'Extent to which technical specifications are actively referenced during work. Low usage increases risk of non-compliant installations and failed inspections.',
+    # Preconstruction - financialSetup
+    'budget to bid variance': 'Difference between the awarded contract amount and the internal project budget. Large gaps indicate estimation errors or scope changes made post-award.',
+    'contingency adequacy': 'Assessment of whether the contingency reserve is sized appropriately for the project risk profile. Underfunded contingency is a leading predictor of budget overruns.',
+    'days until sub contracts executed': 'Average days from subcontractor award to fully executed subcontract agreements. Delays leave scope, pricing, and liability undefined during early mobilization.',
+    'prime contract to budget variance': 'Difference between the prime contract value and the internal cost budget. Tracks whether margin integrity is preserved from contract execution through planning.',
+    # Preconstruction - subcontractorPlanning
+    'equipment cost variance': 'Difference between planned and actual equipment costs at close. Identifies gaps in equipment planning assumptions or unexpected field conditions.',
+    'gantt chart completion rate': 'Percentage of scheduled tasks marked complete on time in the master schedule. Reflects schedule discipline and the accuracy of preconstruction planning.',
+    'labor cost variance': 'Difference between planned and actual labor costs. Persistent variance signals productivity shortfalls, scope creep, or inaccurate labor estimating.',
+    'materials cost variance': 'Difference between planned and actual materials costs. High variance indicates procurement inefficiency, price escalation, or uncontrolled scope changes.',
+    'schedule to bid variance': 'Difference between the bid schedule duration and the actual execution schedule at completion. Tracks whether initial timeline commitments were realistic and maintained.',
+    # Construction - communication
+    'daily logs rate': 'Frequency and consistency of daily field log completion by site supervisors. Gaps in logging create accountability, documentation, and dispute risk.',
+    'daily logs delay': 'Lag between the field activity date and the daily log submission date. Delayed logs reduce accuracy and limit the ability to reconstruct events accurately.',
+    'meetings documentation': 'Completeness and timeliness of meeting records, decisions, and assigned actions. Poor documentation leads to unresolved issues, missed commitments, and disputes.',
+    'meetings rate': 'Frequency of planned coordination and production meetings held on schedule. Consistent meetings drive issue resolution, alignment, and proactive risk management.',
+    # Construction - financial
+    'budgets create date': 'Elapsed time to create the baseline project budget after project kickoff. Late budget creation delays cost control visibility and performance benchmarking.',
+    'budgets usage rate': 'Frequency with which project budgets are actively accessed and updated during execution. Low usage suggests cost tracking is disconnected from daily field operations.',
+    'change order time to close': 'Average days to fully execute a change order from identification to written approval. Slow closure ties up cash flow and allows scope ambiguity to persist.',
+    'change order to budget ratio': 'Total change order value relative to the original budget. High ratios indicate scope instability, owner-driven changes, or ineffective change management.',
+    'contract to budget ratio (deviation)': 'Deviation between contract value and the working cost budget. Reveals whether the project is being managed within its contracted and estimated scope.',
+    'invoice to contract ratio (deviation)': 'Deviation between amounts invoiced and contract values over time. Persistent over- or under-invoicing signals billing process breakdowns or disputes.',
+    'payments to invoices ratio (deviation)': 'Deviation between payments received and invoices submitted. Tracks cash flow health and whether the client is paying in accordance with contract terms.',
+    # Construction - operations
+    'rfis closed on time': 'Percentage of Requests for Information resolved within the required response window. Delays in RFI closure directly stall field productivity and sequence downstream work.',
+    'rfis lead time': 'Average elapsed time from RFI submission to design team response. Long lead times indicate design bottlenecks, unclear scope, or insufficient staffing.',
+    'rfis rate': 'Number of RFIs generated per unit of project time. Elevated rates may signal design gaps, scope ambiguity, or inadequate preconstruction coordination.',
+    'submittals closed on time': 'Percentage of submittals reviewed and approved within the required timeframe. Late approvals constrain procurement schedules and delay material deliveries.',
+    'submittals lead time': 'Average time from submittal submission to design team review completion. Long cycles compress the procurement schedule and create installation delays.',
+    'submittals rate': 'Frequency of submittals generated and processed per time period. Tracks whether the submittal pipeline is aligned with and supporting the construction schedule.',
+    # Construction - quality
+    'observation rate': 'Frequency of quality observations logged per project day by field supervisors. Higher rates reflect proactive quality monitoring and a culture of continuous inspection.',
+    'observations closed on time': 'Percentage of quality observations resolved and closed within the required timeframe. Unresolved items accumulate and increase the probability of rework and defects.',
+    'quality insp. attach. rate': 'Percentage of quality inspections with supporting photos or documents attached. Attachments validate compliance, support approvals, and protect against disputes.',
+    'quality inspection rate': 'Frequency of formal quality inspections conducted per project day. Consistent inspections catch defects early when correction costs are lowest.',
+    # Construction - safety
+    'incident detail quality': 'Completeness and accuracy of incident report documentation. Poor quality reports limit root cause analysis, corrective action, and regulatory compliance.',
+    'incident rate': 'Number of recordable safety incidents per hours worked on site. A key lagging indicator of safety culture, site conditions, and hazard control effectiveness.',
+    'near miss detail quality': 'Quality and completeness of near-miss event documentation. Well-documented near misses enable pattern recognition and prevention of future incidents.',
+    'near miss rate': 'Frequency of near-miss events reported per project period. Higher reporting rates often reflect a stronger safety culture where workers feel safe raising concerns.',
+    'safety insp. attach. rate': 'Percentage of safety inspections with supporting photos or documents attached. Documentation provides evidence of hazard identification and corrective action taken.',
+    'safety inspection rate': 'Frequency of formal safety inspections per project day. Regular inspections identify hazards before they escalate into recordable incidents.',
+    'safety training': 'Percentage of required safety training completed by field personnel on time. Undertrained workers are at significantly higher risk of incident involvement.',
+    # Closeout - clientHandover
+    'client satisfaction score': 'Client-rated satisfaction score collected at project completion. Reflects overall delivery quality, communication, and relationship management throughout the project.',
+    'client training completion': 'Percentage of required owner and end-user training sessions completed before handover. Incomplete training increases post-handover support burden and client frustration.',
+    # Closeout - finalDocumentation
+    'as-built drawing accuracy': 'Degree to which final as-built drawings match actual installed field conditions. Inaccurate as-builts create long-term facility management and renovation risk for the owner.',
+    'o&m manuals submitted timely': 'Percentage of Operations & Maintenance manuals submitted by required turnover deadlines. Late delivery delays the client\'s ability to operate and maintain the facility.',
+    # Closeout - financialReconciliation
+    'final payment received time': 'Days elapsed from project completion milestone to receipt of final payment. Delays indicate unresolved disputes, billing errors, or client cash flow issues.',
+    'subcontractor final payments': 'Percentage of subcontractors paid in full within required timeframes after closeout. Delayed final payments damage subcontractor relationships and create lien exposure.',
+    # Closeout - punchlistCompletion
+    'avg time to close punch item': 'Average days to resolve and formally close a punch list item. Long resolution times delay final acceptance, certificate of occupancy, and final payment.',
+    'punch list items closed rate': 'Percentage of punch list items closed relative to total items identified. Low rates signal resource constraints, scope disputes, or poor closeout planning.',
+}
+
+# Keyword fallbacks for KPIs without a guidance entry, checked in order. A rule
+# matches when any one of its keyword groups is fully contained in the name.
+GUIDANCE_RULES = [
+    ((("rfi", "lead time"),), "Set a 48-hour response SLA, assign an RFI owner per trade, and triage high-impact RFIs in daily coordination huddles."),
+    ((("rfi", "closed on time"),), "Track overdue RFIs by age bucket, escalate >7-day items to PM leadership, and require closeout notes for every late item."),
+    ((("rfi", "rate"),), "Reduce avoidable RFIs by tightening design coordination, running pre-install reviews, and validating scopes before field release."),
+    ((("submittal", "lead time"),), "Submit long-lead packages first, pre-coordinate reviewer calendars, and enforce target turnaround windows by submittal type."),
+    ((("submittal", "rate"),), "Increase first-pass approval rates by using a pre-submittal checklist and peer QA before formal submission."),
+    ((("submittal", "closed on time"),), "Create weekly aging reports, prioritize safety/critical-path submittals, and escalate stalled approvals after agreed thresholds."),
+    ((("incident",), ("safety",)), "Focus on leading indicators: complete weekly hazard observations, close corrective actions within 48 hours, and coach repeat-risk crews."),
+    ((("change order",),), "Standardize change order documentation, pre-price scope changes early, and set approval SLAs with owners and subcontractors."),
+    ((("punch",),), "Run rolling punch walks by zone, assign responsible trade/date for each item, and verify closure with photo evidence."),
+    ((("quality",),), "Use hold-point inspections, trend recurring defects by trade, and deploy corrective training to the highest-defect work packages."),
+    ((("cost",), ("budget",)), "Review cost variance weekly, lock procurement assumptions early, and trigger recovery actions when variance exceeds thresholds."),
+    ((("schedule",), ("timeline",)), "Protect critical path tasks with look-ahead planning, resolve handoff blockers early, and track PPC for weekly commitments."),
+]
+DEFAULT_GUIDANCE = "Define a clear owner, set a weekly target, and review variance-to-target in operations meetings until performance stabilizes."
+DEFAULT_STRENGTH = "Strong performance here reflects reliable execution and lower risk exposure in this process area."
+
+_RULE_KEYWORDS = sorted({keyword for groups, _ in GUIDANCE_RULES for group in groups for keyword in group}, key=len, reverse=True)
+# Lookahead so overlapping keywords are all reported, one scan per name.
+_KEYWORD_PATTERN = re.compile("(?=(" + "|".join(re.escape(keyword) for keyword in _RULE_KEYWORDS) + "))")
+
+def normalize_kpi_name(kpi_name):
+    return str(kpi_name or "").strip().lower()
+
+def _keywords_in(lowered):
+    return {match.group(1) for match in _KEYWORD_PATTERN.finditer(lowered)}
+
+@functools.lru_cache(maxsize=4096)
+def get_kpi_guidance(kpi_name):
+    lowered = normalize_kpi_name(kpi_name)
+    if lowered in KPI_GUIDANCE:
+        return KPI_GUIDANCE[lowered]
+    found = _keywords_in(lowered)
+    for groups, guidance in GUIDANCE_RULES:
+        if any(found.issuperset(group) for group in groups):
+            return guidance
+    return DEFAULT_GUIDANCE
+
+@functools.lru_cache(maxsize=4096)
+def get_kpi_strength_detail(kpi_name):
+    return KPI_STRENGTH.get(normalize_kpi_name(kpi_name), DEFAULT_STRENGTH)
+
+@functools.lru_cache(maxsize=4096)
+def build_kpi_tooltip(kpi_name):
+    name = str(kpi_name or "").strip()
+    return KPI_DEFINITIONS.get(name.lower(), f"Operational performance metric tracking {name} across projects.")
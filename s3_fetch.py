@@ -0,0 +1,111 @@
+"""Conditional S3 fetches backed by a local on-disk cache.
+
+Each object is stored on disk as Parquet, next to a small JSON sidecar that
+records its ETag and LastModified. Later fetches send `If-None-Match`. When S3
+answers 304 Not Modified, the parsed copy is read back from disk instead of
+downloading and parsing the CSV again. `fetch_many` runs several fetches at
+once over a single pooled client.
+"""
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import pandas as pd
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'cr-score-s3-cache')
+DEFAULT_MAX_CONCURRENCY = 10
+
+def make_s3_client(max_pool_connections=DEFAULT_MAX_CONCURRENCY):
+    """One S3 client whose connection pool is sized for concurrent fetches; boto3 clients are thread-safe."""
+    return boto3.client('s3', config=Config(max_pool_connections=max_pool_connections))
+
+def clean_frame(df):
+    """Drop duplicate columns and rows and reset the index, as the dashboard expects."""
+    if not df.empty:
+        df = df.loc[:, ~df.columns.duplicated()]  # Remove duplicate columns
+        df = df.drop_duplicates()  # Remove duplicate rows
+        df = df.reset_index(drop=True)  # Reset index to avoid duplicate labels
+    return df
+
+def _is_not_modified(error):
+    status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+    return status == 304 or error.response.get('Error', {}).get('Code') in ('304', 'NotModified')
+
+class S3FrameCache:
+    """Fetches CSV objects from one bucket/prefix as DataFrames, revalidating by ETag."""
+
+    def __init__(self, s3_client, bucket, prefix='', cache_dir=None):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.cache_dir = cache_dir or os.environ.get('S3_CACHE_DIR', DEFAULT_CACHE_DIR)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _paths(self, filename):
+        stem = os.path.join(self.cache_dir, filename.replace('/', '__'))
+        return f"{stem}.parquet", f"{stem}.meta.json"
+
+    def _read_meta(self, meta_path):
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_atomic(self, path, write):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def fetch(self, filename):
+        """Return `filename` as a DataFrame, downloading it only if its ETag changed."""
+        frame_path, meta_path = self._paths(filename)
+        meta = self._read_meta(meta_path) if os.path.exists(frame_path) else None
+        request = {'Bucket': self.bucket, 'Key': f"{self.prefix}{filename}"}
+        if meta and meta.get('etag'):
+            request['IfNoneMatch'] = meta['etag']
+
+        try:
+            response = self.s3_client.get_object(**request)
+        except ClientError as e:
+            if meta and _is_not_modified(e):
+                return pd.read_parquet(frame_path)
+            raise
+
+        df = clean_frame(pd.read_csv(response['Body']))
+        try:
+            self._store(frame_path, meta_path, df, response)
+        except (OSError, TypeError, ValueError):
+            # Disk full, or a column Parquet cannot hold: serve the frame uncached.
+            pass
+        return df
+
+    def fetch_many(self, filenames, max_workers=DEFAULT_MAX_CONCURRENCY):
+        """Fetch several files concurrently; returns {filename: DataFrame or the exception it raised}."""
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {filename: pool.submit(self.fetch, filename) for filename in dict.fromkeys(filenames)}
+        return {filename: future.exception() or future.result() for filename, future in futures.items()}
+
+    def _store(self, frame_path, meta_path, df, response):
+        # The frame is written first, so a sidecar never points at a stale frame.
+        self._write_atomic(frame_path, lambda path: df.to_parquet(path, index=False))
+        last_modified = response.get('LastModified')
+        meta = {
+            'etag': response.get('ETag'),
+            'last_modified': last_modified.isoformat() if last_modified is not None else None,
+        }
+        self._write_atomic(meta_path, lambda path: _dump_json(meta, path))
+
+def _dump_json(obj, path):
+    with open(path, 'w') as f:
+        json.dump(obj, f)
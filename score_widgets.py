@@ -0,0 +1,109 @@
+"""HTML/SVG score widgets for the CR-Score dashboard.
+
+Rendered fragments are memoised per process in bounded LRU caches. Scores are
+whole numbers 0-100, so the caches hit almost every time. This module is
+imported rather than re-executed on each Streamlit rerun, so the caches stay
+warm across reruns and sessions.
+"""
+import functools
+import html
+import math
+
+import pandas as pd
+
+import dashboard_perf
+
+METER_CX, METER_CY = 110, 122
+METER_RADIUS = 74
+METER_START_ANGLE = 210
+METER_TOTAL_SWEEP = 240
+METER_SEGMENT_COLORS = ["#ef4444", "#f97316", "#fbbf24", "#86efac", "#16a34a"]
+
+
+@dashboard_perf.timed()
+def horizontal_risk_bar_html(score, height='1.65rem', font_size='1.2rem', top_offset='-1.8rem', width_percentage=100, box_height=None):
+    score = int(score) if pd.notna(score) else 0
+    return _risk_bar_fragment(score, height, font_size, top_offset, width_percentage, box_height)
+
+@functools.lru_cache(maxsize=1024)
+def _risk_bar_fragment(score, height, font_size, top_offset, width_percentage, box_height):
+    indicator_position = f"{score}%"
+    gradient = "linear-gradient(to right, #ef4444 0%, #facc15 50%, #16a34a 100%)"
+    score_color = "black"
+    box_height_style = f"height: {box_height}; line-height: 1; overflow: visible;" if box_height else ""
+    html_content = f"""
+    <div style="width: {width_percentage}%; position: relative; margin-top: 0.75rem; margin-bottom: 1.2rem;">
+        <div style="width: 100%; background-color: #e5e7eb; border-radius: 9999px; height: {height}; position: relative;">
+            <div style="height: 100%; border-radius: 9999px; background: {gradient};"></div>
+            <div style="position: absolute; top: 0; bottom: 0; left: {indicator_position}; width: 3px; background-color: black; transform: translateX(-50%); z-index: 10;"></div>
+            <span style="position: absolute; top: {top_offset}; left: {indicator_position}; transform: translateX(-50%); color: {score_color}; font-weight: bold; font-size: {font_size}; white-space: nowrap; z-index: 20; background-color: white; padding: 0 0.3rem; border-radius: 0.25rem; border: 1px solid #d1d5db; display: inline-flex; align-items: center; justify-content: center; {box_height_style}">
+                {html.escape(str(score))}
+            </span>
+        </div>
+        <span style="position: absolute; top: 100%; left: 0; margin-top: 1px; font-weight:700;">0</span>
+        <span style="position: absolute; top: 100%; right: 0%; transform: translateX(50%); font-weight:700;">100</span>
+    </div>
+    """
+    return html_content
+
+def _polar_to_cartesian(cx, cy, radius, angle_deg):
+    angle_rad = math.radians(angle_deg)
+    return cx + radius * math.cos(angle_rad), cy - radius * math.sin(angle_rad)
+
+def _arc_path(cx, cy, radius, start_angle, end_angle):
+    start_x, start_y = _polar_to_cartesian(cx, cy, radius, start_angle)
+    end_x, end_y = _polar_to_cartesian(cx, cy, radius, end_angle)
+    large_arc_flag = 1 if abs(end_angle - start_angle) > 180 else 0
+    sweep_flag = 1 if end_angle < start_angle else 0
+    return f"M {start_x:.2f} {start_y:.2f} A {radius:.2f} {radius:.2f} 0 {large_arc_flag} {sweep_flag} {end_x:.2f} {end_y:.2f}"
+
+@functools.lru_cache(maxsize=None)
+def _score_meter_dial():
+    """Segment arcs and tick labels; identical for every score and size (the SVG is scaled by viewBox)."""
+    segment_span = METER_TOTAL_SWEEP / 5
+    gap = 3.0
+
+    segment_paths = []
+    for index, color in enumerate(METER_SEGMENT_COLORS):
+        seg_start = METER_START_ANGLE - (index * segment_span)
+        seg_end = seg_start - (segment_span - gap)
+        segment_paths.append(
+            f'<path d="{_arc_path(METER_CX, METER_CY, METER_RADIUS, seg_start, seg_end)}" fill="none" stroke="{color}" stroke-width="24" stroke-linecap="butt"></path>'
+        )
+
+    tick_labels = []
+    for value in range(0, 101, 20):
+        angle = METER_START_ANGLE - ((value / 100.0) * METER_TOTAL_SWEEP)
+        label_x, label_y = _polar_to_cartesian(METER_CX, METER_CY, METER_RADIUS + 28, angle)
+        tick_labels.append(
+            f'<text x="{label_x:.2f}" y="{label_y:.2f}" text-anchor="middle" dominant-baseline="middle" font-size="16" font-weight="800" fill="#111827">{value}</text>'
+        )
+    return ''.join(segment_paths), ''.join(tick_labels)
+
+@dashboard_perf.timed()
+def circular_score_meter_html(score, size=220):
+    score = float(score) if pd.notna(score) else 0
+    score = max(0, min(score, 100))
+    # The needle is keyed to a tenth of a point (well under a pixel); the label keeps the exact rounding.
+    return _score_meter_fragment(round(score, 1), f"{score:.0f}", size)
+
+@functools.lru_cache(maxsize=512)
+def _score_meter_fragment(needle_score, label, size):
+    segment_paths, tick_labels = _score_meter_dial()
+    cx, cy = METER_CX, METER_CY
+    needle_angle = METER_START_ANGLE - ((needle_score / 100.0) * METER_TOTAL_SWEEP)
+    needle_x, needle_y = _polar_to_cartesian(cx, cy, METER_RADIUS - 22, needle_angle)
+
+    html_content = f"""
+    <div style="display:flex; justify-content:center; align-items:center; width:100%; margin:0.25rem 0 0 0;">
+        <svg width="{size}" height="{int(size * 0.82)}" viewBox="0 0 220 220">
+            {segment_paths}
+            {tick_labels}
+            <circle cx="{cx}" cy="{cy}" r="48" fill="white" stroke="#d1d5db" stroke-width="2"></circle>
+            <line x1="{cx}" y1="{cy}" x2="{needle_x:.2f}" y2="{needle_y:.2f}" stroke="#1f2937" stroke-width="4" stroke-linecap="round"></line>
+            <circle cx="{cx}" cy="{cy}" r="6" fill="#1f2937"></circle>
+            <text x="{cx}" y="{cy + 29}" text-anchor="middle" font-size="34" font-weight="800" fill="#111827">{label}</text>
+        </svg>
+    </div>
+    """
+    return html_content
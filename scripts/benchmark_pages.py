@@ -0,0 +1,266 @@
+"""Headless page benchmark for streamlit_app.py.
+
+Drives the dashboard through Streamlit's AppTest against datasets of increasing
+size and writes a JSON report. Every step records its wall time, the peak RSS
+of the process so far and the bytes of element payload the rerun emitted.
+Steps cover load_data, each page, the sidebar filters, the KPI expansions and
+the Portfolio Scoreboard sort and paging controls.
+
+Datasets come from scripts/generate_dataset.py (one per --projects size,
+generated once into --work-dir and reused) or from existing trees given with
+--dataset. Each dataset is measured in its own subprocess, so peak RSS and
+the load_data cache start clean.
+
+Usage: python scripts/benchmark_pages.py [--projects 1000 10000] [--dataset .] [--repeat 3] [--output benchmark_report.json]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import dashboard_data  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, 'streamlit_app.py')
+DEFAULT_WORK_DIR = os.path.join(tempfile.gettempdir(), 'cr-score-bench')
+PAGES = ["Executive Summary", "Portfolio Scoreboard", "Bidding", "Preconstruction", "Construction", "Closeout"]
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    return round(peak / (2**20 if sys.platform == 'darwin' else 2**10), 1)
+
+def payload_stats(at):
+    """(bytes, elements) of everything the last rerun rendered, sidebar included."""
+    total = count = 0
+    stack = [at._tree]
+    while stack:
+        node = stack.pop()
+        proto = getattr(node, 'proto', None)
+        if hasattr(proto, 'ByteSize'):
+            total += proto.ByteSize()
+            count += 1
+        children = getattr(node, 'children', None)
+        if isinstance(children, dict):
+            stack.extend(children.values())
+    return total, count
+
+def _sidebar_selectbox(at, label):
+    return next(s for s in at.sidebar.selectbox if s.label == label)
+
+def _button(at, key=None, label=None):
+    return next((b for b in at.button if (key is not None and b.key == key) or (label is not None and b.label == label)), None)
+
+def _click(key=None, label=None):
+    def act(at):
+        button = _button(at, key, label)
+        if button is None or button.disabled:
+            return False
+        button.click()
+        return True
+    return act
+
+def _goto(page):
+    def act(at):
+        at.sidebar.radio[0].set_value(page)
+    return act
+
+def _select(label, pick):
+    def act(at):
+        box = _sidebar_selectbox(at, label)
+        box.set_value(pick(box.options))
+    return act
+
+def _scoreboard_segment(segment):
+    def act(at):
+        next(s for s in at.selectbox if s.label == 'Segment Portfolio By:').set_value(segment)
+    return act
+
+def _value_range(low, high):
+    def act(at):
+        at.sidebar.select_slider[0].set_value((low, high))
+    return act
+
+def _start_range(at):
+    if not at.sidebar.date_input:
+        return False
+    low, high = at.sidebar.date_input[0].value
+    at.sidebar.date_input[0].set_value((low, low + (high - low) / 2))
+
+def scenario():
+    """(step name, action) pairs, run in order on one session. An action returning False is skipped."""
+    steps = [("first run", None)]
+    for page in PAGES:
+        steps.append((f"page: {page}", _goto(page)))
+        if page == "Portfolio Scoreboard":
+            steps += [
+                ("scoreboard: sort by CR-Score", _click(key='sc_sort_cr')),
+                ("scoreboard: segment by Project", _scoreboard_segment('Project')),
+                ("scoreboard: next page", _click(key='sc_pg_next')),
+                ("scoreboard: last page", _click(key='sc_pg_last')),
+                ("scoreboard: sort by value", _click(key='sc_sort_value')),
+                ("scoreboard: segment by Region", _scoreboard_segment('Region')),
+            ]
+        elif page != "Executive Summary":
+            steps.append((f"{page}: show KPIs", _click(label='Show KPIs')))
+    steps += [
+        ("filter: region", _select("Select Region", lambda options: options[1])),
+        ("filter: impact category", _select("Select Impact Category", lambda options: options[0])),
+        ("filter: project value", _value_range("$1,000,000", "$25,000,000")),
+        ("filter: start date", _start_range),
+        ("page: Portfolio Scoreboard (filtered)", _goto("Portfolio Scoreboard")),
+        ("page: Executive Summary (filtered)", _goto("Executive Summary")),
+        ("filter: project", _select("Select Project", lambda options: options[len(options) // 2])),
+        ("filter: clear region", _select("Select Region", lambda options: options[0])),
+    ]
+    return steps
+
+def time_load_data(repeat):
+    """Wall time of streamlit_app.load_data() from a cold cache, run in bare mode."""
+    import streamlit as st
+    import streamlit_app
+
+    times = []
+    for _ in range(repeat):
+        st.cache_resource.clear()
+        start = time.perf_counter()
+        streamlit_app.load_data()
+        times.append(time.perf_counter() - start)
+    return times
+
+def run_session(timeout):
+    """Run the scenario once on a fresh AppTest session; returns one record per step."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    records = []
+    for name, action in scenario():
+        if action is not None and action(at) is False:
+            records.append({'step': name, 'skipped': True})
+            continue
+        start = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{name}: {[e.value for e in at.exception]}")
+        payload_bytes, elements = payload_stats(at)
+        records.append({'step': name, 'wall_s': elapsed, 'payload_bytes': payload_bytes,
+                        'elements': elements, 'peak_rss_mb': peak_rss_mb()})
+    return records
+
+def _summarize(samples):
+    return {'median': round(statistics.median(samples), 4), 'min': round(min(samples), 4), 'samples': [round(s, 4) for s in samples]}
+
+def measure_dataset(data_dir, repeat, timeout):
+    """Benchmark the dataset in data_dir from inside this process (the worker side)."""
+    os.chdir(data_dir)
+    os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')  # silence bare-mode warnings
+    rows = {name: len(dashboard_data.read_table('.', name))
+            for name in dashboard_data.TABLE_SCHEMAS if dashboard_data.table_exists('.', name)}
+
+    load_times = time_load_data(repeat)
+    steps = [{'step': 'load_data', 'wall_s': _summarize(load_times), 'peak_rss_mb': peak_rss_mb()}]
+    # Sessions share the cached dataset, as they do on a server after the first load.
+    sessions = [run_session(timeout) for _ in range(repeat)]
+    for index, record in enumerate(sessions[0]):
+        if record.get('skipped'):
+            steps.append(record)
+            continue
+        samples = [session[index]['wall_s'] for session in sessions]
+        steps.append(dict(record, wall_s=_summarize(samples), peak_rss_mb=sessions[-1][index]['peak_rss_mb']))
+    return {'path': os.path.abspath(data_dir), 'rows': rows, 'peak_rss_mb': peak_rss_mb(), 'steps': steps}
+
+def prepare_generated(work_dir, projects, seed):
+    """Generate (or reuse) a dataset of `projects` projects and return its directory."""
+    import generate_dataset
+
+    data_dir = os.path.join(work_dir, f"projects-{projects}-seed-{seed}")
+    if not dashboard_data.table_exists(data_dir, 'executive_summary'):
+        print(f"generating {projects:,} projects into {data_dir}", flush=True)
+        # Parquet sources: writing 10k projects as CSV alone takes about 1.5 minutes.
+        generate_dataset.main(['--projects', str(projects), '--seed', str(seed), '--out', data_dir,
+                               '--format', 'parquet', '--columnar', 'arrow'])
+    # The app reads its logo relative to the working directory.
+    shutil.copytree(os.path.join(ROOT, 'static'), os.path.join(data_dir, 'static'), dirs_exist_ok=True)
+    return data_dir
+
+def run_worker(data_dir, repeat, timeout):
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+        result_path = f.name
+    try:
+        command = [sys.executable, os.path.abspath(__file__), '--worker', data_dir, '--result', result_path,
+                   '--repeat', str(repeat), '--timeout', str(timeout)]
+        subprocess.run(command, check=True)
+        with open(result_path) as f:
+            return json.load(f)
+    finally:
+        os.remove(result_path)
+
+def _versions():
+    import pandas
+    import streamlit
+    return {'python': platform.python_version(), 'streamlit': streamlit.__version__, 'pandas': pandas.__version__}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--projects', type=int, nargs='*', default=[1000, 10000], help="generated dataset sizes to benchmark")
+    parser.add_argument('--dataset', action='append', default=[], help="existing dataset directory to benchmark as well (needs static/)")
+    parser.add_argument('--seed', type=int, default=0, help="seed for generated datasets")
+    parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR, help="where generated datasets are kept between runs")
+    parser.add_argument('--repeat', type=int, default=3, help="sessions (and cold loads) per dataset; medians are reported")
+    parser.add_argument('--timeout', type=float, default=300, help="per-rerun AppTest timeout in seconds")
+    parser.add_argument('--output', default='benchmark_report.json', help="JSON report path")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        result = measure_dataset(args.worker, args.repeat, args.timeout)
+        with open(args.result, 'w') as f:
+            json.dump(result, f)
+        return
+
+    datasets = [(None, os.path.abspath(path)) for path in args.dataset]
+    datasets += [(n, prepare_generated(args.work_dir, n, args.seed)) for n in sorted(args.projects)]
+    report = {
+        'generated_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'platform': platform.platform(),
+        'versions': _versions(),
+        'repeat': args.repeat,
+        'datasets': [],
+    }
+    for projects, data_dir in datasets:
+        print(f"benchmarking {data_dir}", flush=True)
+        result = run_worker(data_dir, args.repeat, args.timeout)
+        result['projects'] = projects
+        report['datasets'].append(result)
+        for step in result['steps']:
+            if step.get('skipped'):
+                print(f"  {step['step']:<42} skipped")
+                continue
+            payload = f"{step['payload_bytes'] / 1024:10.1f} KiB" if 'payload_bytes' in step else ' ' * 14
+            print(f"  {step['step']:<42} {step['wall_s']['median'] * 1000:9.1f} ms {payload}   peak {step['peak_rss_mb']} MiB")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""Synthetic CR-Score dataset of any size, for load and capacity testing.
+
+Writes executive_summary.csv, the four <phase>_processes.csv / <phase>_kpis.csv
+pairs and procore-itemized-combined.csv for --projects projects spread over
+--regions regions and --pms project managers. The bundled exports (or
+--template) are the catalogue: every phase keeps its processes, KPI names,
+bounds, units and weights, and every KPI draws its score/actual pairs from that
+KPI's observed values. A per-project latent keeps scores correlated within a
+project, so CR-Scores spread the way the real ones do. Process, phase and
+summary scores are rolled up from the generated KPI scores.
+
+The same --seed always gives the same files.
+
+Generating is quick (about 6 s for 10,000 projects); writing 10,000 projects
+as CSV takes about 1.5 minutes more. --format parquet writes the tables as
+Parquet instead (the dashboard reads them as its sources), which is much faster
+for large datasets.
+
+Usage: python scripts/generate_dataset.py --projects 10000 --out /tmp/cr-10k [--seed 0] [--format parquet] [--columnar arrow]
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import dashboard_data  # noqa: E402
+
+CATALOGUE_KEYS = ['impact_category', 'process_name', 'kpi_name']
+CATALOGUE_COLUMNS = [
+    'bp_lower_bound', 'bp_upper_bound', 'bp_range_display', 'unit', 'higher_is_better',
+    'importance_weight', 'phase wt', 'process wt', 'KPI wt',
+]
+SUMMARY_PHASE_COLUMNS = {
+    'bidding': 'phaseScore_bidding',
+    'preconstruction': 'phaseScore_precon',
+    'construction': 'phaseScore_construction',
+    'closeout': 'phaseScore_closeout',
+}
+PROCORE_TABLE = 'procore-itemized-combined'
+
+# Regions past the template's own, with the code used in project IDs.
+EXTRA_REGIONS = [
+    ('Southwest', 'SW'), ('Northwest', 'NW'), ('Mountain', 'MT'), ('Central', 'CE'),
+    ('Pacific', 'PA'), ('Gulf Coast', 'GC'), ('Mid-Atlantic', 'MA'), ('Great Plains', 'GP'),
+]
+FIRST_NAMES = [
+    'Alex', 'Maria', 'David', 'Priya', 'Carlos', 'Emily', 'James', 'Fatima', 'Robert', 'Linda',
+    'Kevin', 'Sofia', 'Daniel', 'Grace', 'Marcus', 'Hannah', 'Omar', 'Laura', 'Victor', 'Nina',
+]
+LAST_NAMES = [
+    'Garcia', 'Chen', 'Williams', 'Patel', 'Miller', 'Nguyen', 'Davis', 'Lopez', 'Wilson', 'Kim',
+    'Anderson', 'Thomas', 'Martin', 'Clark', 'Lewis', 'Walker', 'Young', 'Hall', 'Wright', 'Scott',
+]
+
+# How strongly one project's KPI scores move together (0 = independent draws).
+PROJECT_CORRELATION = 0.8
+
+def _read_template(base_path, name):
+    df = pd.read_csv(dashboard_data.table_path(base_path, name))
+    return df.loc[:, [c for c in df.columns if not c.startswith('Unnamed:')]]
+
+def _region_code(name):
+    words = name.replace('-', ' ').split()
+    return (words[0][0] + words[1][0] if len(words) > 1 else name[:2]).upper()
+
+def make_regions(template_summary, count):
+    """(name, code) pairs: the template's regions first, then EXTRA_REGIONS, then numbered ones."""
+    codes = {}
+    for project_id, region in template_summary[['projectId', 'region']].drop_duplicates('region').itertuples(index=False):
+        parts = str(project_id).split('-')
+        codes[region] = parts[1] if len(parts) == 3 else _region_code(region)
+    regions = list(codes.items()) + [r for r in EXTRA_REGIONS if r[0] not in codes]
+    regions += [(f"Region {i}", f"R{i}") for i in range(len(regions) + 1, count + 1)]
+    return regions[:count]
+
+def make_managers(template_summary, count, rng):
+    """Distinct PM names: the template's own first, then random first/last pairings."""
+    managers = list(dict.fromkeys(template_summary['projectManager']))
+    pool = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+    pool = [name for name in pool if name not in managers]
+    extra = [pool[i] for i in rng.permutation(len(pool))[:max(0, count - len(managers))]]
+    managers += extra + [f"PM {i}" for i in range(len(managers) + len(extra) + 1, count + 1)]
+    return managers[:count]
+
+def make_projects(template, n_projects, n_regions, n_pms, rng):
+    """One row per project: projectId, region, projectManager, plus construction dates and value."""
+    summary = template['executive_summary']
+    regions = make_regions(summary, n_regions)
+    managers = make_managers(summary, max(n_pms, n_regions), rng)
+    # Every region gets at least one PM; projects cycle through regions like the exports do.
+    pm_region = np.concatenate([np.arange(n_regions), rng.integers(0, n_regions, len(managers) - n_regions)])
+    region_idx = np.arange(n_projects) % n_regions
+    pm_idx = np.empty(n_projects, dtype=np.int64)
+    for r in range(n_regions):
+        in_region = np.flatnonzero(region_idx == r)
+        pm_idx[in_region] = rng.choice(np.flatnonzero(pm_region == r), len(in_region))
+
+    width = max(3, len(str(n_projects)))
+    codes = np.array([code for _, code in regions], dtype=object)
+    projects = pd.DataFrame({
+        'projectId': [f"P-{code}-{i:0{width}d}" for i, code in enumerate(codes[region_idx], start=1)],
+        'region': np.array([name for name, _ in regions], dtype=object)[region_idx],
+        'projectManager': np.array(managers, dtype=object)[pm_idx],
+    })
+
+    meta = template['construction_kpis'].drop_duplicates('projectId')
+    starts = pd.to_datetime(meta['startDate'], format='%m/%d/%Y')
+    durations = (pd.to_datetime(meta['endDate'], format='%m/%d/%Y') - starts).dt.days.to_numpy()
+    start_days = rng.integers(0, (starts.max() - starts.min()).days + 1, n_projects)
+    start = starts.min() + pd.to_timedelta(start_days, unit='D')
+    end = start + pd.to_timedelta(rng.choice(durations, n_projects), unit='D')
+    projects['startDate'] = _format_dates(start)
+    projects['endDate'] = _format_dates(end)
+    projects['ProjValue'] = rng.choice(meta['ProjValue'].to_numpy(), n_projects)
+    return projects
+
+def _format_dates(dates):
+    # m/d/YYYY without zero padding, as in the exports.
+    return [f"{d.month}/{d.day}/{d.year}" for d in dates]
+
+def _latent_quantiles(project_latent, n_cells, rng):
+    """Per-cell quantiles in (0, 1) that share each project's latent draw."""
+    noise = rng.standard_normal((len(project_latent), n_cells))
+    z = PROJECT_CORRELATION * project_latent[:, None] + np.sqrt(1 - PROJECT_CORRELATION ** 2) * noise
+    return 1.0 / (1.0 + np.exp(-1.702 * z))  # logistic approximation of the normal CDF
+
+def generate_phase(template_kpis, projects, project_latent, rng):
+    """(processes, kpis, phase_scores) for one phase; phase_scores is indexed by (projectId, impact_category)."""
+    kpis = template_kpis.copy()
+    kpis['score'] = pd.to_numeric(kpis['score'], errors='coerce').fillna(0)
+    kpis['actual'] = pd.to_numeric(kpis['actual'], errors='coerce').fillna(0)
+    catalogue = kpis.drop_duplicates(CATALOGUE_KEYS)[CATALOGUE_KEYS + CATALOGUE_COLUMNS].reset_index(drop=True)
+
+    # Observed (score, actual) pairs of each KPI, sorted by score so a quantile picks a rank.
+    observed = kpis.merge(catalogue[CATALOGUE_KEYS].reset_index(), on=CATALOGUE_KEYS)
+    observed = observed.sort_values(['index', 'score'], kind='stable')
+    counts = observed.groupby('index').size().reindex(catalogue.index).to_numpy()
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    n_projects, n_kpis = len(projects), len(catalogue)
+    quantiles = _latent_quantiles(project_latent, n_kpis, rng)
+    picks = (starts + np.minimum((quantiles * counts).astype(np.int64), counts - 1)).ravel()
+
+    out = catalogue.iloc[np.tile(np.arange(n_kpis), n_projects)].reset_index(drop=True)
+    project_rows = np.repeat(np.arange(n_projects), n_kpis)
+    for column in ['projectId', 'startDate', 'endDate', 'ProjValue']:
+        if column in template_kpis.columns:
+            out[column] = projects[column].to_numpy()[project_rows]
+    out['score'] = observed['score'].to_numpy()[picks]
+    out['actual'] = observed['actual'].to_numpy()[picks]
+    out['realized_value'] = (out['score'] * out['KPI wt']).round(4)
+    out['unrealized_value'] = (100 * out['KPI wt'] - out['realized_value']).round(4)
+    out['process_level_unrealized_value'] = (out['unrealized_value'] * out['process wt']).round(4)
+    out['phase_level_unrealized_value'] = (out['process_level_unrealized_value'] * out['phase wt']).round(4)
+    if 'ID' in template_kpis.columns:
+        out['ID'] = out['projectId'] + out['impact_category'] + out['process_name']
+
+    # Process score: KPI-weight average of its KPI scores.
+    out['_weighted'] = out['score'] * out['KPI wt']
+    process_keys = ['projectId', 'impact_category', 'process_name']
+    rolled = out.groupby(process_keys, sort=False).agg(
+        weighted=('_weighted', 'sum'), weight=('KPI wt', 'sum'), process_wt=('process wt', 'first'))
+    rolled['score'] = (rolled['weighted'] / rolled['weight'].where(rolled['weight'] > 0)).fillna(0).round(2)
+    processes = rolled['score'].reset_index().merge(projects[['projectId', 'region', 'projectManager']], on='projectId')
+    processes = processes.sort_values(process_keys, kind='stable')
+    processes = processes[['projectId', 'region', 'projectManager', 'impact_category', 'process_name', 'score']]
+
+    # Phase score: process-weight average of its process scores.
+    rolled['_weighted'] = rolled['score'] * rolled['process_wt']
+    phase = rolled.groupby(['projectId', 'impact_category'], sort=False)[['_weighted', 'process_wt']].sum()
+    phase_scores = (phase['_weighted'] / phase['process_wt'].where(phase['process_wt'] > 0)).fillna(0).round(4)
+
+    out = out[[c for c in template_kpis.columns if c in out.columns]]
+    return processes.reset_index(drop=True), out, phase_scores
+
+def generate_summary(template_summary, projects, phase_scores):
+    categories = list(dict.fromkeys(template_summary['impact_category']))
+    summary = projects[['projectId', 'region', 'projectManager']].loc[np.repeat(projects.index, len(categories))]
+    summary['impact_category'] = categories * len(projects)
+    index = pd.MultiIndex.from_frame(summary[['projectId', 'impact_category']])
+    for phase, column in SUMMARY_PHASE_COLUMNS.items():
+        summary[column] = phase_scores[phase].reindex(index).fillna(0).to_numpy()
+    summary['score'] = summary[list(SUMMARY_PHASE_COLUMNS.values())].mean(axis=1).round(6)
+    return summary[list(template_summary.columns)].reset_index(drop=True)
+
+def generate_procore(template_procore, projects, rng):
+    """Action items per project, each listed once per impact category with its own weight."""
+    templates = template_procore.drop_duplicates(['action_item_type', 'description'])
+    templates = templates.sort_values('action_item_type', kind='stable').reset_index(drop=True)
+    item_types, type_starts, type_counts = np.unique(
+        templates['action_item_type'].to_numpy(dtype=str), return_index=True, return_counts=True)
+    categories = sorted(template_procore['impact_category'].unique())
+    per_project = template_procore.groupby(['projectId', 'impact_category']).size().to_numpy()
+    n_projects, n_types = len(projects), len(item_types)
+
+    # Each project takes a random subset of the item types, numbered in random order.
+    n_items = np.minimum(rng.choice(per_project, n_projects), n_types)
+    type_rank = np.argsort(rng.random((n_projects, n_types)), axis=1)
+    chosen = type_rank < n_items[:, None]
+    numbers = np.argsort(np.where(chosen, rng.random((n_projects, n_types)), np.inf), axis=1).argsort(axis=1) + 1
+    project_idx, type_idx = np.nonzero(chosen)
+    template_idx = type_starts[type_idx] + rng.integers(0, type_counts[type_idx])
+
+    codes = pd.Series(item_types[type_idx]).str[:3].str.upper()
+    items = projects[['projectId', 'region', 'projectManager']].iloc[project_idx].reset_index(drop=True)
+    items['action_item_type'] = item_types[type_idx]
+    items['action_item_id'] = (items['projectId'] + '-' + codes + '-'
+                               + pd.Series(numbers[project_idx, type_idx]).map('{:02d}'.format))
+    items['description'] = templates['description'].to_numpy()[template_idx]
+    items['required_action'] = templates['required_action'].to_numpy()[template_idx]
+
+    procore = items.loc[np.repeat(items.index, len(categories))].reset_index(drop=True)
+    procore['impact_category'] = categories * len(items)
+    procore['weight'] = rng.choice(template_procore['weight'].to_numpy(), len(procore))
+    procore = procore.sort_values(['projectId', 'impact_category', 'action_item_type'], kind='stable')
+    return procore[list(template_procore.columns)].reset_index(drop=True)
+
+def generate(template_path, n_projects, n_regions, n_pms, seed):
+    """Return {table name: DataFrame} for a synthetic dataset."""
+    rng = np.random.default_rng(seed)
+    names = ['executive_summary', PROCORE_TABLE]
+    names += [f"{phase}_{table}" for phase in dashboard_data.PHASES for table in ('processes', 'kpis')]
+    template = {name: _read_template(template_path, name) for name in names}
+
+    projects = make_projects(template, n_projects, n_regions, n_pms, rng)
+    project_latent = rng.standard_normal(n_projects)
+    tables, phase_scores = {}, {}
+    for phase in dashboard_data.PHASES:
+        processes, kpis, phase_scores[phase] = generate_phase(template[f"{phase}_kpis"], projects, project_latent, rng)
+        tables[f"{phase}_processes"] = processes
+        tables[f"{phase}_kpis"] = kpis
+    tables['executive_summary'] = generate_summary(template['executive_summary'], projects, phase_scores)
+    tables[PROCORE_TABLE] = generate_procore(template[PROCORE_TABLE], projects, rng)
+    return tables
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--projects', type=int, default=1000, help="number of projects")
+    parser.add_argument('--regions', type=int, default=4, help="number of regions")
+    parser.add_argument('--pms', type=int, default=None, help="number of project managers (default: one per 12 projects)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed; the same seed gives the same files")
+    parser.add_argument('--template', default=ROOT, help="directory holding the exports to resample")
+    parser.add_argument('--out', required=True, help="directory to write the tables to")
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                        help="file format of the tables (parquet is much faster to write at 10k+ projects)")
+    parser.add_argument('--columnar', choices=sorted(dashboard_data.COLUMNAR_FORMATS),
+                        help="also write the columnar store the dashboard reads")
+    args = parser.parse_args(argv)
+    if args.projects < 1 or args.regions < 1:
+        parser.error("--projects and --regions must be at least 1")
+    if os.path.abspath(args.out) == os.path.abspath(args.template):
+        parser.error("--out must not be the template directory")
+    n_pms = args.pms or max(args.regions, args.projects // 12)
+
+    tables = generate(args.template, args.projects, args.regions, n_pms, args.seed)
+    os.makedirs(args.out, exist_ok=True)
+    for name, df in tables.items():
+        path = dashboard_data.table_path(args.out, name, args.format)
+        if args.format == 'parquet':
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+        print(f"{name}: {len(df):,} rows")
+    if args.columnar:
+        dashboard_data.write_columnar(args.out, args.columnar)
+
+if __name__ == '__main__':
+    main()
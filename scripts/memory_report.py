@@ -0,0 +1,77 @@
+"""Per-session memory overhead of the dashboard dataset.
+
+Compares what each session costs under the two ways of caching load_data():
+
+  st.cache_data      every rerun unpickles its own full copy of the dataset
+  st.cache_resource  sessions share one frozen dataset and only pay for the
+                     frames their filters slice out (shared when unfiltered)
+
+Each strategy is simulated for --sessions sessions that all have the same page
+loaded (every phase frame touched) and is measured with tracemalloc.
+
+Usage: python scripts/memory_report.py [--base-path .] [--sessions 30] [--region West]
+"""
+import argparse
+import os
+import pickle
+import sys
+import tracemalloc
+from types import MappingProxyType
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import dashboard_data  # noqa: E402
+
+def _thaw(data):
+    """Plain dicts again, so the dataset pickles the way st.cache_data stored it."""
+    if isinstance(data, MappingProxyType):
+        return {key: _thaw(value) for key, value in data.items()}
+    return data
+
+def _session_view(shared, region, load_phase):
+    filter_index = shared['filter_index']
+    bitmap = filter_index.select(region=region)
+    view = dashboard_data.FilteredDataset(shared, filter_index, bitmap, load_phase=load_phase)
+    # Touch every phase frame, as a session that has visited each page would.
+    return [view[phase][table] for phase in dashboard_data.PHASES if phase in view for table in ('processes', 'kpis')]
+
+def _measure(make_session, sessions):
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    held = [make_session() for _ in range(sessions)]
+    total = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del held
+    return total / sessions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--base-path', default='.', help="directory holding the dashboard tables")
+    parser.add_argument('--sessions', type=int, default=30, help="number of concurrent sessions to simulate")
+    parser.add_argument('--region', default=None, help="region filter for the filtered scenario (default: first region)")
+    args = parser.parse_args(argv)
+
+    os.chdir(args.base_path)
+    os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')  # silence bare-mode warnings
+    import streamlit_app
+
+    shared = streamlit_app.load_data()
+    if not shared:
+        sys.exit("No dataset could be loaded from " + os.path.abspath('.'))
+    phases = {phase: streamlit_app.load_phase(phase) for phase in shared['phases']}
+    # st.cache_data held every phase in the one pickled dataset.
+    payload = pickle.dumps(dict(_thaw(shared), **_thaw(MappingProxyType(phases))))
+    region = args.region or sorted(shared['filter_index'].by_region)[0]
+
+    rows = [
+        ("st.cache_data (copy per rerun)", _measure(lambda: pickle.loads(payload), args.sessions)),
+        ("st.cache_resource, no filters", _measure(lambda: _session_view(shared, None, streamlit_app.load_phase), args.sessions)),
+        (f"st.cache_resource, region={region}", _measure(lambda: _session_view(shared, region, streamlit_app.load_phase), args.sessions)),
+    ]
+    print(f"Per-session overhead over {args.sessions} sessions (dataset pickle: {len(payload) / 2**20:.1f} MiB)")
+    for label, per_session in rows:
+        print(f"  {label:<40} {per_session / 2**20:8.2f} MiB   x{args.sessions} = {per_session * args.sessions / 2**20:8.1f} MiB")
+
+if __name__ == '__main__':
+    main()
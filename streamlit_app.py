@@ -1,42 +1,33 @@
 import streamlit as st
-import streamlit.components.v1 as components
 import pandas as pd
 import datetime
 import os
 import html
-import copy
 import re
 import math
 
+import dashboard_data
+import dashboard_perf
+from client_assets import install_client_assets, kpi_accent_class
+from kpi_catalog import build_kpi_tooltip, get_kpi_guidance, get_kpi_strength_detail
+from score_widgets import circular_score_meter_html, horizontal_risk_bar_html
+
+# Copy-on-write for the whole process, deliberately. load_data() hands every
+# session views of one frozen dataset (dashboard_data.freeze_frame), and any
+# page or helper may filter those frames and write to the result; copy-on-write
+# makes that first write copy instead of hitting the shared, read-only arrays.
+# It cannot be scoped with pd.option_context: pandas options are process-wide,
+# not per thread, and Streamlit runs concurrent sessions on threads of one
+# process. pandas 3 makes this behaviour the default.
+pd.set_option('mode.copy_on_write', True)
+
+# A widget inside a fragment reruns only that fragment, not the whole script.
+# Streamlit 1.33-1.36 ship it as experimental_fragment; older versions rerun everything.
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
 # --- Page Configuration (MUST BE THE FIRST STREAMLIT COMMAND) ---
 st.set_page_config(page_title="CR-Score Dashboard (Construction View)", layout="wide")
 
-# Style primary buttons as professional blue with bold labels.
-st.markdown(
-    """
-    <style>
-    div[data-testid="stAppViewContainer"] > section[data-testid="stMain"] > div[data-testid="stMainBlockContainer"] {
-        padding-top: 1rem !important;
-    }
-    .block-container {
-        padding-top: 1rem !important;
-    }
-    div.stButton > button[kind="primary"] {
-        background-color: #1d4ed8;
-        color: white;
-        font-weight: 700;
-        border: 1px solid #1e40af;
-    }
-    div.stButton > button[kind="primary"]:hover {
-        background-color: #1e40af;
-        color: white;
-        border: 1px solid #1e3a8a;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
-
 # --- App Configuration ---
 
 # --- Define the specific categories for this version of the dashboard ---
@@ -159,83 +150,7 @@ DUMMY_ACTION_ITEMS = {
 
 
 # --- UI Helper Functions ---
-def horizontal_risk_bar_html(score, height='1.65rem', font_size='1.2rem', top_offset='-1.8rem', width_percentage=100, box_height=None):
-    score = int(score) if pd.notna(score) else 0
-    indicator_position = f"{score}%"
-    gradient = "linear-gradient(to right, #ef4444 0%, #facc15 50%, #16a34a 100%)"
-    score_color = "black"
-    box_height_style = f"height: {box_height}; line-height: 1; overflow: visible;" if box_height else ""
-    html_content = f"""
-    <div style="width: {width_percentage}%; position: relative; margin-top: 0.75rem; margin-bottom: 1.2rem;">
-        <div style="width: 100%; background-color: #e5e7eb; border-radius: 9999px; height: {height}; position: relative;">
-            <div style="height: 100%; border-radius: 9999px; background: {gradient};"></div>
-            <div style="position: absolute; top: 0; bottom: 0; left: {indicator_position}; width: 3px; background-color: black; transform: translateX(-50%); z-index: 10;"></div>
-            <span style="position: absolute; top: {top_offset}; left: {indicator_position}; transform: translateX(-50%); color: {score_color}; font-weight: bold; font-size: {font_size}; white-space: nowrap; z-index: 20; background-color: white; padding: 0 0.3rem; border-radius: 0.25rem; border: 1px solid #d1d5db; display: inline-flex; align-items: center; justify-content: center; {box_height_style}">
-                {html.escape(str(score))}
-            </span>
-        </div>
-        <span style="position: absolute; top: 100%; left: 0; margin-top: 1px; font-weight:700;">0</span>
-        <span style="position: absolute; top: 100%; right: 0%; transform: translateX(50%); font-weight:700;">100</span>
-    </div>
-    """
-    return html_content
-
-def circular_score_meter_html(score, size=220):
-    score = float(score) if pd.notna(score) else 0
-    score = max(0, min(score, 100))
-
-    def polar_to_cartesian(cx, cy, radius, angle_deg):
-        angle_rad = math.radians(angle_deg)
-        return cx + radius * math.cos(angle_rad), cy - radius * math.sin(angle_rad)
-
-    def arc_path(cx, cy, radius, start_angle, end_angle):
-        start_x, start_y = polar_to_cartesian(cx, cy, radius, start_angle)
-        end_x, end_y = polar_to_cartesian(cx, cy, radius, end_angle)
-        large_arc_flag = 1 if abs(end_angle - start_angle) > 180 else 0
-        sweep_flag = 1 if end_angle < start_angle else 0
-        return f"M {start_x:.2f} {start_y:.2f} A {radius:.2f} {radius:.2f} 0 {large_arc_flag} {sweep_flag} {end_x:.2f} {end_y:.2f}"
-
-    cx, cy = 110, 122
-    radius = 74
-    start_angle = 210
-    total_sweep = 240
-    segment_span = total_sweep / 5
-    gap = 3.0
-    segment_colors = ["#ef4444", "#f97316", "#fbbf24", "#86efac", "#16a34a"]
-
-    segment_paths = []
-    for index, color in enumerate(segment_colors):
-        seg_start = start_angle - (index * segment_span)
-        seg_end = seg_start - (segment_span - gap)
-        segment_paths.append(
-            f'<path d="{arc_path(cx, cy, radius, seg_start, seg_end)}" fill="none" stroke="{color}" stroke-width="24" stroke-linecap="butt"></path>'
-        )
-
-    tick_labels = []
-    for value in range(0, 101, 20):
-        angle = start_angle - ((value / 100.0) * total_sweep)
-        label_x, label_y = polar_to_cartesian(cx, cy, radius + 28, angle)
-        tick_labels.append(
-            f'<text x="{label_x:.2f}" y="{label_y:.2f}" text-anchor="middle" dominant-baseline="middle" font-size="16" font-weight="800" fill="#111827">{value}</text>'
-        )
-
-    needle_angle = start_angle - ((score / 100.0) * total_sweep)
-    needle_x, needle_y = polar_to_cartesian(cx, cy, radius - 22, needle_angle)
-
-    html_content = f"""
-    <div style="display:flex; justify-content:center; align-items:center; width:100%; margin:0.25rem 0 0 0;">
-        <svg width="{size}" height="{int(size * 0.82)}" viewBox="0 0 220 220">
-            {''.join(segment_paths)}
-            {''.join(tick_labels)}
-            <circle cx="{cx}" cy="{cy}" r="48" fill="white" stroke="#d1d5db" stroke-width="2"></circle>
-            <line x1="{cx}" y1="{cy}" x2="{needle_x:.2f}" y2="{needle_y:.2f}" stroke="#1f2937" stroke-width="4" stroke-linecap="round"></line>
-            <circle cx="{cx}" cy="{cy}" r="6" fill="#1f2937"></circle>
-            <text x="{cx}" y="{cy + 29}" text-anchor="middle" font-size="34" font-weight="800" fill="#111827">{score:.0f}</text>
-        </svg>
-    </div>
-    """
-    return html_content
-
+@dashboard_perf.timed()
 def risk_reduction_bar_html(value, max_value, height='1.0rem', font_size='0.8rem'):
     """Create a horizontal bar chart for improvement percentages"""
     value = float(value) if pd.notna(value) else 0
@@ -254,327 +169,35 @@ def risk_reduction_bar_html(value, max_value, height='1.0rem', font_size='0.8rem
     """
     return html_content
 
-def parse_value(val):
-    if isinstance(val, str): val = val.replace('%', '').strip()
-    return pd.to_numeric(val, errors='coerce')
-
 def format_kpi_name(kpi_name):
     return str(kpi_name or "N/A").upper()
 
-KPI_GUIDANCE_MAP = {
-    '% of bids targeted': 'Tighten go/no-go criteria by market, client, and margin profile so bid effort focuses on highest win-probability opportunities.',
-    'as-built drawing accuracy': 'Run weekly as-built QA checks with field engineers and require redline updates before each pay-app cycle.',
-    'avg days to submit bid': 'Standardize bid kickoff templates and intermediate deadlines to compress estimating cycle time without reducing quality.',
-    'avg number of sub quotes per trade': 'Expand bidder lists per trade and set minimum quote coverage targets before final estimate lock.',
-    'avg selected sub emr': 'Prioritize subcontractors with stronger safety records and require mitigation plans when EMR exceeds target.',
-    'avg sub quote variance': 'Normalize scope sheets across bidders and hold scope leveling reviews to reduce spread caused by assumptions.',
-    'avg sub response rate': 'Issue bid invites earlier and automate reminder cadences to increase subcontractor response participation.',
-    'avg time to close punch item': 'Assign trade owner and due date to each punch item, then track aging in daily closeout huddles.',
-    'avg time to submit bid': 'Preload historical assemblies and vendor pricing to cut estimate build time for repeat project types.',
-    'bid package completeness rate': 'Use package completeness checklists before release to eliminate missing scope and addenda gaps.',
-    'bid rate per $1m of acv': 'Improve bid efficiency by reusing estimate components and limiting bids with low strategic fit.',
-    'bid win rate': 'Perform bid debriefs by segment and refine pricing strategy where losses consistently exceed threshold.',
-    'budgets create date': 'Set a post-award budget creation SLA and enforce it through project startup readiness gates.',
-    'budgets usage rate': 'Make budget adherence visible in weekly cost reviews and require explanations for off-budget commitments.',
-    'change order time to close': 'Create a fast-lane review workflow for pending change orders with clear owner and approval SLA.',
-    'change order to budget ratio': 'Reduce scope churn by validating design and owner decisions earlier in preconstruction.',
-    'client satisfaction score': 'Close client feedback loops monthly and assign action plans to recurring service pain points.',
-    'client training completion': 'Schedule owner training milestones before turnover and require signoff for each trained system.',
-    'compliance matrix completion rate': 'Track matrix completion weekly and escalate unresolved compliance items ahead of critical gates.',
-    'contract to budget ratio (deviation)': 'Reconcile contract values to control budget early and review deviations before procurement starts.',
-    'cost variance': 'Run variance-to-budget review weekly and trigger corrective action when any cost code drifts beyond threshold.',
-    'daily logs delay': 'Set same-day log submission standards and alert superintendents when logs are missing or late.',
-    'daily logs rate': 'Increase reporting consistency with mobile log prompts and end-of-day completion checks.',
-    'final payment received time': 'Submit complete closeout packages earlier and track owner payment blockers to resolution.',
-    'incident detail quality': 'Use a structured incident template and supervisor review to improve root-cause quality in reports.',
-    'incident rate': 'Focus on pre-task planning, high-risk activity controls, and rapid closure of corrective actions.',
-    'invoice to contract ratio (deviation)': 'Audit billing against contract milestones to prevent over/under billing drift.',
-    'licensing & certification compliance rate': 'Maintain a rolling credential register and block assignments for expired certifications.',
-    'meetings documentation': 'Standardize meeting minutes with decisions, owners, and due dates published within 24 hours.',
-    'meetings rate': 'Set recurring coordination cadence and enforce attendance for critical project functions.',
-    'near miss detail quality': 'Capture near-miss narratives with clear causal factors to improve preventive action quality.',
-    'near miss rate': 'Encourage reporting and trend near misses by activity type to target preventive controls.',
-    'o&m manuals submitted timely': 'Track O&M submittals by system and require trade turnover checklists ahead of handoff.',
-    'observation rate': 'Increase field observation frequency with scheduled safety walks and supervisor accountability.',
-    'observations closed on time': 'Assign close dates during observation entry and escalate overdue items in safety meetings.',
-    'payments to invoices ratio (deviation)': 'Align payment release workflow to approved invoices and resolve disputed line items quickly.',
-    'profit variance': 'Review forecasted margin monthly and intervene early on labor productivity or procurement overrun trends.',
-    'punch list items closed rate': 'Use zone-based closeout plans and trade-specific closure targets to maintain turnover pace.',
-    'quality insp. attach. rate': 'Require photo/document evidence on all quality inspections before closeout approval.',
-    'quality inspection rate': 'Set minimum inspection coverage by work package and track completion against plan.',
-    'rfis closed on time': 'Publish RFI aging dashboards and enforce turnaround SLAs with design and consultant teams.',
-    'rfis lead time': 'Prioritize critical-path RFIs and route them through expedited review with clear ownership.',
-    'rfis rate': 'Reduce avoidable RFIs via pre-install coordination and design clarification workshops.',
-    'safety insp. attach. rate': 'Require visual proof and corrective evidence for all safety inspections to ensure closure quality.',
-    'safety inspection rate': 'Increase planned safety inspection frequency and tie completion to supervisor KPIs.',
-    'safety training': 'Close training gaps with role-based refreshers and track completion before high-risk work starts.',
-    'schedule variance': 'Use look-ahead planning and constraint removal to recover tasks drifting off baseline.',
-    'sub prequal rate': 'Broaden and maintain a prequalified vendor pool to improve competition and reduce procurement risk.',
-    'subcontractor final payments': 'Link final payment release to complete closeout deliverables and verified lien documentation.',
-    'submittals closed on time': 'Track submittal aging by reviewer and escalate overdue approvals before they hit critical path.',
-    'submittals lead time': 'Submit long-lead packages first and lock reviewer turnaround commitments upfront.',
-    'submittals rate': 'Improve planning by mapping required submittals to upcoming work packages earlier.',
-    'avg insurance acquired cycle': 'Pre-collect insurance requirements and automate follow-ups to shorten policy acquisition cycle time.',
-    'avg permit approval cycle': 'Engage permitting authorities early and submit complete packages to reduce review rework.',
-    'avg sub coi received time': 'Set COI deadlines at award and automate reminders until compliant certificates are received.',
-    'budget to bid variance': 'Improve estimate handoff quality and scope alignment to reduce budget drift after award.',
-    'clash detection rate': 'Run model coordination at fixed intervals and require closure of high-severity clashes before release.',
-    'contingency adequacy': 'Calibrate contingency by risk register trends and adjust allowances as uncertainty resolves.',
-    'days until sub contracts executed': 'Use contract execution trackers and pre-negotiate key terms to accelerate signature turnaround.',
-    'drawings usage': 'Drive adoption of current drawing sets through mobile access and version-control checks in the field.',
-    'equipment cost variance': 'Track equipment utilization versus plan and redeploy underused assets to cut variance.',
-    'gantt chart completion rate': 'Enforce schedule update discipline weekly so plan progress reflects real execution status.',
-    'labor cost variance': 'Monitor labor productivity by crew and shift resources where earned-value trends deteriorate.',
-    'materials cost variance': 'Lock buyout pricing early and monitor material quantity deltas against takeoff baselines.',
-    'permit submission timeliness': 'Build permit deliverables into preconstruction milestones and enforce submit-by dates.',
-    'photos usage': 'Standardize photo capture requirements by activity to strengthen documentation and quality validation.',
-    'prime contract to budget variance': 'Align scope interpretation between prime contract and control budget during startup.',
-    'schedule to bid variance': 'Validate bid assumptions against detailed execution logic before final baseline approval.',
-    'specifications usage': 'Improve spec compliance by requiring scope teams to reference spec sections during planning and QA.'
-}
+def build_top_performing_kpis(kpi_cube, project_ids, phase=None, impact_category=None):
+    return kpi_cube.top('score_weighted', project_ids, phase=phase, impact_category=impact_category)
 
-KPI_STRENGTH_MAP = {
-    '% of bids targeted': 'A strong result shows the team is focusing effort on the right opportunities instead of spreading resources across low-fit pursuits.',
-    'as-built drawing accuracy': 'A strong result shows field conditions are being documented correctly, which lowers rework, warranty, and turnover risk.',
-    'avg days to submit bid': 'A strong result shows the estimating team can respond quickly without delaying pipeline decisions.',
-    'avg number of sub quotes per trade': 'A strong result shows good market coverage, which improves pricing confidence and reduces buyout risk.',
-    'avg selected sub emr': 'A strong result shows safer subcontractor selection, which lowers incident exposure during execution.',
-    'avg sub quote variance': 'A strong result shows scope alignment across bidders, which reduces pricing uncertainty and missed scope risk.',
-    'avg sub response rate': 'A strong result shows healthy subcontractor engagement, which improves estimate quality and procurement flexibility.',
-    'avg time to close punch item': 'A strong result shows the team resolves finish issues quickly, reducing turnover delays and owner dissatisfaction.',
-    'avg time to submit bid': 'A strong result shows the preconstruction process is efficient and responsive under deadline pressure.',
-    'bid package completeness rate': 'A strong result shows scope packages are well prepared, which lowers bidder confusion and post-award scope gaps.',
-    'bid rate per $1m of acv': 'A strong result shows bid effort is being used efficiently relative to available contract value.',
-    'bid win rate': 'A strong result shows the company is pursuing and pricing work effectively, which indicates strong market discipline.',
-    'budgets create date': 'A strong result shows projects are financially organized early, reducing startup confusion and cost control risk.',
-    'budgets usage rate': 'A strong result shows the budget is actively guiding decisions, which supports stronger cost governance.',
-    'change order time to close': 'A strong result shows scope changes are resolved quickly, reducing revenue leakage and schedule disruption.',
-    'change order to budget ratio': 'A strong result shows scope is stable and well controlled, which lowers commercial and execution risk.',
-    'client satisfaction score': 'A strong result shows the project team is delivering a positive client experience, lowering relationship and repeat-work risk.',
-    'client training completion': 'A strong result shows the owner is prepared to operate the asset, reducing turnover friction and support issues.',
-    'compliance matrix completion rate': 'A strong result shows required obligations are being tracked and completed, reducing legal and contractual risk.',
-    'contract to budget ratio (deviation)': 'A strong result shows the control budget accurately reflects contract scope, lowering downstream cost surprises.',
-    'cost variance': 'A strong result shows the project is staying close to plan financially, which is a direct sign of healthy cost control.',
-    'daily logs delay': 'A strong result shows field records are entered promptly, improving decision quality and reducing documentation gaps.',
-    'daily logs rate': 'A strong result shows disciplined field reporting, which improves visibility into project conditions and issues.',
-    'final payment received time': 'A strong result shows closeout and billing are being completed effectively, improving cash flow reliability.',
-    'incident detail quality': 'A strong result shows safety events are documented clearly, which improves learning and corrective action quality.',
-    'incident rate': 'A strong result shows the project is controlling hazardous work well, reducing harm and operational disruption.',
-    'invoice to contract ratio (deviation)': 'A strong result shows billing stays aligned with contract value, reducing commercial and collection risk.',
-    'licensing & certification compliance rate': 'A strong result shows work is being performed by properly qualified parties, lowering regulatory and safety risk.',
-    'meetings documentation': 'A strong result shows decisions and action items are captured well, reducing coordination failures and ambiguity.',
-    'meetings rate': 'A strong result shows the team maintains consistent coordination rhythm, which lowers communication breakdowns.',
-    'near miss detail quality': 'A strong result shows the team documents weak signals well, improving prevention before incidents occur.',
-    'near miss rate': 'A strong result shows hazards are being surfaced and monitored, which supports proactive risk reduction.',
-    'o&m manuals submitted timely': 'A strong result shows turnover requirements are under control, reducing late closeout and owner readiness risk.',
-    'observation rate': 'A strong result shows the team is actively looking for unsafe conditions, which strengthens leading-indicator safety management.',
-    'observations closed on time': 'A strong result shows issues are being acted on quickly, lowering the chance that known risks remain open.',
-    'payments to invoices ratio (deviation)': 'A strong result shows payment execution is staying aligned with invoicing, reducing cash-flow and dispute risk.',
-    'profit variance': 'A strong result shows the project is protecting expected margin, which indicates solid operational and financial control.',
-    'punch list items closed rate': 'A strong result shows closeout execution is disciplined, reducing turnover delay and reputational risk.',
-    'quality insp. attach. rate': 'A strong result shows inspections are backed by evidence, improving accountability and quality assurance confidence.',
-    'quality inspection rate': 'A strong result shows the team is checking work consistently, which lowers defect escape and rework risk.',
-    'rfis closed on time': 'A strong result shows information gaps are resolved quickly enough to avoid delaying field execution.',
-    'rfis lead time': 'A strong result shows questions are being answered within planned windows, reducing waiting and coordination risk.',
-    'rfis rate': 'A strong result shows design and field coordination are healthy, reducing confusion that can slow production.',
-    'safety insp. attach. rate': 'A strong result shows safety inspections are supported by evidence, improving trust in field verification.',
-    'safety inspection rate': 'A strong result shows safety oversight is active and consistent, which lowers exposure to uncontrolled conditions.',
-    'safety training': 'A strong result shows workers are being prepared for risk, which supports safer and more reliable execution.',
-    'schedule variance': 'A strong result shows the project is performing close to plan, reducing delay risk and recovery pressure.',
-    'sub prequal rate': 'A strong result shows the team has a strong vetted subcontractor pool, reducing performance and compliance risk.',
-    'subcontractor final payments': 'A strong result shows trade closeout is being completed cleanly, reducing lingering contractual disputes.',
-    'submittals closed on time': 'A strong result shows review workflows are supporting production instead of delaying material and equipment release.',
-    'submittals lead time': 'A strong result shows submittal cycles are staying within needed time windows, reducing procurement and schedule risk.',
-    'submittals rate': 'A strong result shows the team is actively moving required submittals through the pipeline, supporting execution readiness.',
-    'avg insurance acquired cycle': 'A strong result shows insurance compliance is secured quickly, reducing startup delay and exposure risk.',
-    'avg permit approval cycle': 'A strong result shows regulatory approvals are moving efficiently, reducing schedule uncertainty before work starts.',
-    'avg sub coi received time': 'A strong result shows subcontractor insurance documentation is being collected promptly, lowering compliance exposure.',
-    'budget to bid variance': 'A strong result shows the handoff from estimate to operating budget is accurate, reducing financial surprises after award.',
-    'clash detection rate': 'A strong result shows design coordination issues are being found early, reducing field conflicts and rework.',
-    'contingency adequacy': 'A strong result shows the project has realistic protection against uncertainty, lowering downside financial risk.',
-    'days until sub contracts executed': 'A strong result shows subcontract agreements are being finalized quickly, reducing procurement and mobilization risk.',
-    'drawings usage': 'A strong result shows teams are using current drawings in the field, reducing installation errors and confusion.',
-    'equipment cost variance': 'A strong result shows equipment spending is under control, indicating disciplined planning and utilization.',
-    'gantt chart completion rate': 'A strong result shows schedule data is being maintained reliably, improving planning and recovery decisions.',
-    'labor cost variance': 'A strong result shows labor productivity is tracking to plan, which is a strong indicator of execution health.',
-    'materials cost variance': 'A strong result shows procurement and consumption are being controlled well, reducing cost overrun risk.',
-    'permit submission timeliness': 'A strong result shows approvals are being pursued on schedule, reducing preventable startup delays.',
-    'photos usage': 'A strong result shows project conditions are being documented visually, improving transparency and issue resolution.',
-    'prime contract to budget variance': 'A strong result shows scope and budget are aligned early, lowering downstream commercial risk.',
-    'schedule to bid variance': 'A strong result shows execution planning is consistent with bid assumptions, reducing delivery risk after award.',
-    'specifications usage': 'A strong result shows teams are relying on technical requirements during execution, lowering quality and compliance risk.'
-}
-
-def get_kpi_guidance(kpi_name):
-    name = str(kpi_name or "").strip()
-    lowered = name.lower()
-
-    if lowered in KPI_GUIDANCE_MAP:
-        return KPI_GUIDANCE_MAP[lowered]
-
-    if "rfi" in lowered and "lead time" in lowered:
-        return "Set a 48-hour response SLA, assign an RFI owner per trade, and triage high-impact RFIs in daily coordination huddles."
-    if "rfi" in lowered and "closed on time" in lowered:
-        return "Track overdue RFIs by age bucket, escalate >7-day items to PM leadership, and require closeout notes for every late item."
-    if "rfi" in lowered and "rate" in lowered:
-        return "Reduce avoidable RFIs by tightening design coordination, running pre-install reviews, and validating scopes before field release."
-    if "submittal" in lowered and "lead time" in lowered:
-        return "Submit long-lead packages first, pre-coordinate reviewer calendars, and enforce target turnaround windows by submittal type."
-    if "submittal" in lowered and "rate" in lowered:
-        return "Increase first-pass approval rates by using a pre-submittal checklist and peer QA before formal submission."
-    if "submittal" in lowered and "closed on time" in lowered:
-        return "Create weekly aging reports, prioritize safety/critical-path submittals, and escalate stalled approvals after agreed thresholds."
-    if "incident" in lowered or "safety" in lowered:
-        return "Focus on leading indicators: complete weekly hazard observations, close corrective actions within 48 hours, and coach repeat-risk crews."
-    if "change order" in lowered:
-        return "Standardize change order documentation, pre-price scope changes early, and set approval SLAs with owners and subcontractors."
-    if "punch" in lowered:
-        return "Run rolling punch walks by zone, assign responsible trade/date for each item, and verify closure with photo evidence."
-    if "quality" in lowered:
-        return "Use hold-point inspections, trend recurring defects by trade, and deploy corrective training to the highest-defect work packages."
-    if "cost" in lowered or "budget" in lowered:
-        return "Review cost variance weekly, lock procurement assumptions early, and trigger recovery actions when variance exceeds thresholds."
-    if "schedule" in lowered or "timeline" in lowered:
-        return "Protect critical path tasks with look-ahead planning, resolve handoff blockers early, and track PPC for weekly commitments."
-    return "Define a clear owner, set a weekly target, and review variance-to-target in operations meetings until performance stabilizes."
-
-def get_kpi_strength_detail(kpi_name):
-    lowered = str(kpi_name or "").strip().lower()
-    if lowered in KPI_STRENGTH_MAP:
-        return KPI_STRENGTH_MAP[lowered]
-    return "Strong performance here reflects reliable execution and lower risk exposure in this process area."
-
-def build_top_performing_kpis(kpi_df):
-    if kpi_df.empty:
-        return pd.DataFrame(columns=['kpi_name', 'score_weighted'])
-    weight_col = next((c for c in ['KPI wt', 'kpi_wt', 'kpi_weight', 'importance_weight'] if c in kpi_df.columns), None)
-    working_df = kpi_df.copy()
-    working_df['score_numeric'] = pd.to_numeric(working_df.get('score', 0), errors='coerce').fillna(0)
-    if weight_col:
-        working_df['kpi_weight_numeric'] = pd.to_numeric(working_df[weight_col], errors='coerce').fillna(0)
-    else:
-        working_df['kpi_weight_numeric'] = 1.0
-    working_df['score_weighted'] = working_df['score_numeric'] * working_df['kpi_weight_numeric']
-    return working_df.groupby('kpi_name', as_index=False).agg(
-        score_weighted=('score_weighted', 'mean')
-    ).sort_values('score_weighted', ascending=False).head(5).reset_index(drop=True)
-
-def build_top_priority_kpis(kpi_df):
-    if kpi_df.empty:
-        return pd.DataFrame(columns=['kpi_name', 'priority_metric'])
-    metric_col = next((c for c in ['process_level_unrealized_value', 'phase_level_unrealized_value', 'unrealized_value'] if c in kpi_df.columns), None)
-    if not metric_col:
-        return pd.DataFrame(columns=['kpi_name', 'priority_metric'])
-    working_df = kpi_df.copy()
-    working_df['priority_metric'] = pd.to_numeric(working_df[metric_col], errors='coerce').fillna(0)
-    return working_df.groupby('kpi_name', as_index=False).agg(
-        priority_metric=('priority_metric', 'mean')
-    ).sort_values('priority_metric', ascending=False).head(5).reset_index(drop=True)
+def build_top_priority_kpis(kpi_cube, project_ids, phase=None, impact_category=None):
+    return kpi_cube.top('priority_metric', project_ids, phase=phase, impact_category=impact_category)
 
+@fragment
+@dashboard_perf.timed()
 def render_kpi_summary_section(title, rows_df, detail_func, detail_header, state_key=None, subtitle=None, accent_color=None):
-    marker_class = f"kpi-accent-{''.join(c for c in (accent_color or 'default') if c.isalnum())}"
-    if accent_color:
-        h = accent_color.lstrip('#')
-        r, g, b = int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
-        title_bg = f"rgba({r},{g},{b},0.30)"
-        header_sep = f"rgba({r},{g},{b},0.3)"
-    else:
-        title_bg = "transparent"
-        header_sep = "#e5e7eb"
-    badge_color = accent_color or "#6b7280"
-    tbl_class = f"kpi-tbl-{marker_class}"
+    marker_class = kpi_accent_class(accent_color)
+    tbl_class = f"kpi-tbl {marker_class}"
     with st.container(border=True):
-        if accent_color and not state_key:
-            st.markdown(f"""<style>
-                div[data-testid="stVerticalBlockBorderWrapper"]:has(.{marker_class}) {{
-                    border-top: 4px solid {accent_color} !important;
-                    border-radius: 0.5rem !important;
-                }}
-                div[data-testid="stVerticalBlockBorderWrapper"]:has(.{marker_class}) > div[data-testid="stVerticalBlock"] {{
-                    padding-top: 0 !important;
-                }}
-            </style><span class='{marker_class}' style='display:none;'></span>""", unsafe_allow_html=True)
-
-        title_color = "#111"
         if state_key:
-            btn_key = f"btn_{state_key}"
-            st.markdown(f"""<style>
-                div[data-testid="stVerticalBlockBorderWrapper"]:has(.st-key-{btn_key}) {{
-                    border-top: 4px solid {accent_color} !important;
-                    border-radius: 0.5rem !important;
-                    background: {title_bg} !important;
-                    padding-bottom: 0 !important;
-                    overflow-x: hidden !important;
-                    overflow-y: visible !important;
-                }}
-                div[data-testid="stVerticalBlockBorderWrapper"]:has(.st-key-{btn_key}) > div[data-testid="stVerticalBlock"] {{
-                    padding-top: 0 !important;
-                    padding-bottom: 0 !important;
-                    gap: 0 !important;
-                    background: transparent !important;
-                }}
-                div.st-key-{btn_key} {{
-                    margin-top: -3.2rem !important;
-                    margin-bottom: -0.7rem !important;
-                    display: flex !important;
-                    justify-content: flex-end !important;
-                    padding-right: 0.5rem !important;
-                    padding-bottom: 0.4rem !important;
-                    width: 100% !important;
-                    flex-shrink: 0 !important;
-                }}
-                div.st-key-{btn_key} > div[data-testid="stButton"] {{
-                    width: fit-content !important;
-                    margin-bottom: 0 !important;
-                    flex-shrink: 0 !important;
-                    white-space: nowrap !important;
-                }}
-                div.st-key-{btn_key} > div[data-testid="stButton"] > button {{
-                    width: fit-content !important;
-                    margin-bottom: 0 !important;
-                    white-space: nowrap !important;
-                }}
-            </style>""", unsafe_allow_html=True)
-            st.markdown(f"<h2 style='text-align: center; font-size: clamp(1rem, 3vw, 1.8rem); font-weight: 700; margin: -2rem -1rem 0 -1rem; padding: 0.748rem 9rem 0.748rem 1rem; background: {title_bg}; color: #111; border-radius: 0.5rem 0.5rem 0 0; white-space: nowrap; overflow: hidden; text-overflow: ellipsis;'>{title}</h2>", unsafe_allow_html=True)
+            btn_key = f"kpi_toggle_{state_key}"
+            st.markdown(f"<h2 class='kpi-section-title kpi-section-toggle {marker_class}'>{title}</h2>", unsafe_allow_html=True)
             button_label = "Hide Details" if st.session_state.get(state_key, True) else "Show Details"
             st.button(button_label, key=btn_key, on_click=lambda s_key=state_key: st.session_state.update({s_key: not st.session_state.get(s_key, True)}), type="primary")
             if not st.session_state.get(state_key, True):
                 return
         else:
-            st.markdown(f"<h2 style='text-align: center; font-size: 1.8rem; font-weight: 700; margin: -2rem -1rem 0.748rem -1rem; padding: 0.748rem 1rem; background: {title_bg}; color: #111; border-radius: 0.5rem 0.5rem 0 0;'>{title}</h2>", unsafe_allow_html=True)
+            st.markdown(f"<h2 class='kpi-section-title {marker_class}'>{title}</h2>", unsafe_allow_html=True)
 
         if rows_df.empty:
             st.info("No KPI data for current selection.")
             return
 
-        st.markdown(f"""<style>
-            .{tbl_class} {{ width:100%; border-collapse:separate; border-spacing:0 0.35rem; font-size:0.95rem; }}
-            div[data-testid="stVerticalBlockBorderWrapper"]:has(.{tbl_class}) {{
-                padding-top: 0 !important;
-            }}
-            div[data-testid="stVerticalBlockBorderWrapper"]:has(.{tbl_class}) > div[data-testid="stVerticalBlock"] {{
-                padding-top: 0 !important;
-                gap: 0 !important;
-            }}
-            .{tbl_class} th {{ text-align:left; padding:0.5rem 0.6rem; background:#f3f4f6; color:#374151; font-weight:700; font-size:0.8rem; text-transform:uppercase; letter-spacing:0.05em; border-bottom:none; }}
-            .{tbl_class} th:not(:last-child) {{ border-right:1px solid {header_sep}; }}
-            .{tbl_class} th:first-child {{ border-radius:0.375rem 0 0 0.375rem; }}
-            .{tbl_class} th:last-child  {{ border-radius:0 0.375rem 0.375rem 0; }}
-            .{tbl_class} td {{ padding:0.6rem 0.6rem; background:#f9fafb; vertical-align:top; border-right:none; height:4.5rem; }}
-            .{tbl_class} td:first-child {{ border-radius:0.375rem 0 0 0.375rem; }}
-            .{tbl_class} td:last-child  {{ border-radius:0 0.375rem 0.375rem 0; }}
-            .{tbl_class} td.rank {{ width:3rem; }}
-            .{tbl_class} td.kpi-name {{ font-weight:700; text-transform:uppercase; color:#111; width:28%; vertical-align:middle; text-align:center; }}
-            .{tbl_class} td.guidance {{ color:#374151; }}
-            .{tbl_class} .kpi-badge {{ display:inline-flex; align-items:center; justify-content:center; width:1.8rem; height:1.8rem; background:{badge_color}; color:white; border-radius:0.3rem; font-weight:700; font-size:0.9rem; }}
-            /* Equal height KPI boxes */
-            div[data-testid="stHorizontalBlock"]:has(.{tbl_class}) {{ align-items:stretch !important; }}
-            div[data-testid="stHorizontalBlock"]:has(.{tbl_class}) > div[data-testid="stColumn"] {{ display:flex !important; flex-direction:column !important; }}
-            div[data-testid="stHorizontalBlock"]:has(.{tbl_class}) > div[data-testid="stColumn"] > div[data-testid="stVerticalBlock"] {{ flex:1 !important; display:flex; flex-direction:column; }}
-            div[data-testid="stHorizontalBlock"]:has(.{tbl_class}) > div[data-testid="stColumn"] > div[data-testid="stVerticalBlock"] > div[data-testid="stVerticalBlockBorderWrapper"] {{ flex:1; display:flex; flex-direction:column; }}
-            div[data-testid="stHorizontalBlock"]:has(.{tbl_class}) > div[data-testid="stColumn"] > div[data-testid="stVerticalBlock"] > div[data-testid="stVerticalBlockBorderWrapper"] > div[data-testid="stVerticalBlock"] {{ flex:1; }}
-        </style>""", unsafe_allow_html=True)
-
         rows_html = ""
         for i, row in rows_df.iterrows():
             kpi_name_display = html.escape(format_kpi_name(row['kpi_name']))
@@ -592,213 +215,52 @@ def render_kpi_summary_section(title, rows_df, detail_func, detail_header, state
             <tbody>{rows_html}</tbody>
         </table></div>""", unsafe_allow_html=True)
 
-def build_kpi_tooltip(kpi_name):
-    name = str(kpi_name or "").strip()
-    lowered = name.lower()
-
-    definition_overrides = {
-        # Bidding - bidresults
-        'bid win rate': 'Percentage of submitted bids that result in a contract award. Reflects the effectiveness of targeting, estimating, and proposal quality.',
-        'cost variance': 'Difference between estimated and actual project costs. Persistent variance signals estimation gaps, scope creep, or poor cost control.',
-        'profit variance': 'Difference between projected and actual profit margin. Reveals how well pricing and cost controls held up through execution.',
-        'schedule variance': 'Difference between planned and actual project completion timeline. Indicates schedule discipline and execution predictability.',
-        # Bidding - bidreview
-        '% of bids targeted': 'Percentage of identified opportunities intentionally pursued. High targeting rates signal disciplined go/no-go decision-making.',
-        'avg days to submit bid': 'Average elapsed time from bid invitation to submission. Shorter cycles with quality output indicate an efficient estimating process.',
-        'avg time to submit bid': 'Average elapsed time from bid invitation to completed submission. Tracks estimating team responsiveness and capacity under deadline pressure.',
-        'bid rate per $1m of acv': 'Number of bids submitted per $1M of annual contract value. Balances bid volume against revenue targets to avoid over- or under-bidding.',
-        # Bidding - compliance
-        'bid package completeness rate': 'Percentage of bid packages submitted with all required documents. Incomplete packages risk disqualification and signal process gaps.',
-        'compliance matrix completion rate': 'Percentage of compliance checklist items completed per bid. Tracks adherence to internal and client bidding requirements.',
-        'licensing & certification compliance rate': 'Percentage of required licenses and certifications held and current across the team. Non-compliance creates legal, safety, and operational risk.',
-        'sub prequal rate': 'Percentage of subcontractors that have passed prequalification screening. Higher rates reduce execution risk from unvetted or underqualified partners.',
-        # Bidding - estimating
-        'avg number of sub quotes per trade': 'Average number of competitive subcontractor bids received per trade. More quotes improve pricing accuracy and reduce cost and risk exposure.',
-        'avg selected sub emr': 'Average Experience Modification Rate of selected subcontractors. Lower EMR indicates a safer, less risky subcontractor pool with better safety track records.',
-        'avg sub quote variance': 'Spread between the highest and lowest subcontractor quotes per trade. High variance signals unclear scope, inconsistent takeoffs, or market uncertainty.',
-        'avg sub response rate': 'Percentage of subcontractors invited to bid who actually submit a quote. Low response rates may indicate scope issues, timing conflicts, or weak relationships.',
-        # Preconstruction - compliance
-        'avg insurance acquired cycle': 'Average days to obtain required insurance certificates after contract award. Delays can hold up project start and create uninsured liability gaps.',
-        'avg permit approval cycle': 'Average days from permit submission to regulatory approval. Longer cycles delay project start and indicate scope complexity or process inefficiency.',
-        'avg sub coi received time': 'Average time to receive Certificates of Insurance from subcontractors after request. Slow COI receipt exposes the project to periods of uninsured risk.',
-        'permit submission timeliness': 'Percentage of permits submitted within the required timeframe ahead of planned start. Late submissions cascade into downstream schedule risk.',
-        # Preconstruction - designReview
-        'clash detection rate': 'Frequency of design clashes identified during BIM or drawing coordination. Early detection prevents costly field conflicts and rework during construction.',
-        'drawings usage': 'Extent to which current drawing sets are actively referenced by project teams. Low usage signals document control gaps or teams working off outdated information.',
-        'photos usage': 'Rate of photo documentation captured and attached to field records. Supports accountability, dispute resolution, and quality verification throughout the project.',
-        'specifications usage': 'Extent to which technical specifications are actively referenced during work. Low usage increases risk of non-compliant installations and failed inspections.',
-        # Preconstruction - financialSetup
-        'budget to bid variance': 'Difference between the awarded contract amount and the internal project budget. Large gaps indicate estimation errors or scope changes made post-award.',
-        'contingency adequacy': 'Assessment of whether the contingency reserve is sized appropriately for the project risk profile. Underfunded contingency is a leading predictor of budget overruns.',
-        'days until sub contracts executed': 'Average days from subcontractor award to fully executed subcontract agreements. Delays leave scope, pricing, and liability undefined during early mobilization.',
-        'prime contract to budget variance': 'Difference between the prime contract value and the internal cost budget. Tracks whether margin integrity is preserved from contract execution through planning.',
-        # Preconstruction - subcontractorPlanning
-        'equipment cost variance': 'Difference between planned and actual equipment costs at close. Identifies gaps in equipment planning assumptions or unexpected field conditions.',
-        'gantt chart completion rate': 'Percentage of scheduled tasks marked complete on time in the master schedule. Reflects schedule discipline and the accuracy of preconstruction planning.',
-        'labor cost variance': 'Difference between planned and actual labor costs. Persistent variance signals productivity shortfalls, scope creep, or inaccurate labor estimating.',
-        'materials cost variance': 'Difference between planned and actual materials costs. High variance indicates procurement inefficiency, price escalation, or uncontrolled scope changes.',
-        'schedule to bid variance': 'Difference between the bid schedule duration and the actual execution schedule at completion. Tracks whether initial timeline commitments were realistic and maintained.',
-        # Construction - communication
-        'daily logs rate': 'Frequency and consistency of daily field log completion by site supervisors. Gaps in logging create accountability, documentation, and dispute risk.',
-        'daily logs delay': 'Lag between the field activity date and the daily log submission date. Delayed logs reduce accuracy and limit the ability to reconstruct events accurately.',
-        'meetings documentation': 'Completeness and timeliness of meeting records, decisions, and assigned actions. Poor documentation leads to unresolved issues, missed commitments, and disputes.',
-        'meetings rate': 'Frequency of planned coordination and production meetings held on schedule. Consistent meetings drive issue resolution, alignment, and proactive risk management.',
-        # Construction - financial
-        'budgets create date': 'Elapsed time to create the baseline project budget after project kickoff. Late budget creation delays cost control visibility and performance benchmarking.',
-        'budgets usage rate': 'Frequency with which project budgets are actively accessed and updated during execution. Low usage suggests cost tracking is disconnected from daily field operations.',
-        'change order time to close': 'Average days to fully execute a change order from identification to written approval. Slow closure ties up cash flow and allows scope ambiguity to persist.',
-        'change order to budget ratio': 'Total change order value relative to the original budget. High ratios indicate scope instability, owner-driven changes, or ineffective change management.',
-        'contract to budget ratio (deviation)': 'Deviation between contract value and the working cost budget. Reveals whether the project is being managed within its contracted and estimated scope.',
-        'invoice to contract ratio (deviation)': 'Deviation between amounts invoiced and contract values over time. Persistent over- or under-invoicing signals billing process breakdowns or disputes.',
-        'payments to invoices ratio (deviation)': 'Deviation between payments received and invoices submitted. Tracks cash flow health and whether the client is paying in accordance with contract terms.',
-        # Construction - operations
-        'rfis closed on time': 'Percentage of Requests for Information resolved within the required response window. Delays in RFI closure directly stall field productivity and sequence downstream work.',
-        'rfis lead time': 'Average elapsed time from RFI submission to design team response. Long lead times indicate design bottlenecks, unclear scope, or insufficient staffing.',
-        'rfis rate': 'Number of RFIs generated per unit of project time. Elevated rates may signal design gaps, scope ambiguity, or inadequate preconstruction coordination.',
-        'submittals closed on time': 'Percentage of submittals reviewed and approved within the required timeframe. Late approvals constrain procurement schedules and delay material deliveries.',
-        'submittals lead time': 'Average time from submittal submission to design team review completion. Long cycles compress the procurement schedule and create installation delays.',
-        'submittals rate': 'Frequency of submittals generated and processed per time period. Tracks whether the submittal pipeline is aligned with and supporting the construction schedule.',
-        # Construction - quality
-        'observation rate': 'Frequency of quality observations logged per project day by field supervisors. Higher rates reflect proactive quality monitoring and a culture of continuous inspection.',
-        'observations closed on time': 'Percentage of quality observations resolved and closed within the required timeframe. Unresolved items accumulate and increase the probability of rework and defects.',
-        'quality insp. attach. rate': 'Percentage of quality inspections with supporting photos or documents attached. Attachments validate compliance, support approvals, and protect against disputes.',
-        'quality inspection rate': 'Frequency of formal quality inspections conducted per project day. Consistent inspections catch defects early when correction costs are lowest.',
-        # Construction - safety
-        'incident detail quality': 'Completeness and accuracy of incident report documentation. Poor quality reports limit root cause analysis, corrective action, and regulatory compliance.',
-        'incident rate': 'Number of recordable safety incidents per hours worked on site. A key lagging indicator of safety culture, site conditions, and hazard control effectiveness.',
-        'near miss detail quality': 'Quality and completeness of near-miss event documentation. Well-documented near misses enable pattern recognition and prevention of future incidents.',
-        'near miss rate': 'Frequency of near-miss events reported per project period. Higher reporting rates often reflect a stronger safety culture where workers feel safe raising concerns.',
-        'safety insp. attach. rate': 'Percentage of safety inspections with supporting photos or documents attached. Documentation provides evidence of hazard identification and corrective action taken.',
-        'safety inspection rate': 'Frequency of formal safety inspections per project day. Regular inspections identify hazards before they escalate into recordable incidents.',
-        'safety training': 'Percentage of required safety training completed by field personnel on time. Undertrained workers are at significantly higher risk of incident involvement.',
-        # Closeout - clientHandover
-        'client satisfaction score': 'Client-rated satisfaction score collected at project completion. Reflects overall delivery quality, communication, and relationship management throughout the project.',
-        'client training completion': 'Percentage of required owner and end-user training sessions completed before handover. Incomplete training increases post-handover support burden and client frustration.',
-        # Closeout - finalDocumentation
-        'as-built drawing accuracy': 'Degree to which final as-built drawings match actual installed field conditions. Inaccurate as-builts create long-term facility management and renovation risk for the owner.',
-        'o&m manuals submitted timely': 'Percentage of Operations & Maintenance manuals submitted by required turnover deadlines. Late delivery delays the client\'s ability to operate and maintain the facility.',
-        # Closeout - financialReconciliation
-        'final payment received time': 'Days elapsed from project completion milestone to receipt of final payment. Delays indicate unresolved disputes, billing errors, or client cash flow issues.',
-        'subcontractor final payments': 'Percentage of subcontractors paid in full within required timeframes after closeout. Delayed final payments damage subcontractor relationships and create lien exposure.',
-        # Closeout - punchlistCompletion
-        'avg time to close punch item': 'Average days to resolve and formally close a punch list item. Long resolution times delay final acceptance, certificate of occupancy, and final payment.',
-        'punch list items closed rate': 'Percentage of punch list items closed relative to total items identified. Low rates signal resource constraints, scope disputes, or poor closeout planning.',
-    }
-
-    return definition_overrides.get(lowered, f"Operational performance metric tracking {name} across projects.")
-
+@dashboard_perf.timed()
 def display_kpi_table(kpi_df):
     if kpi_df.empty:
         st.info("No KPI data for this process and selected impact category.")
         return
-    kpi_df_copy = kpi_df.copy()
-    kpi_df_copy['actual_numeric'] = kpi_df_copy['actual'].apply(parse_value)
-    num_projects = kpi_df_copy['projectId'].nunique()
+    num_projects = kpi_df['projectId'].nunique()
     is_averaged = num_projects > 1
     
     if is_averaged:
-        display_df = kpi_df_copy.groupby('kpi_name').agg(
-            actual_numeric=('actual_numeric', 'mean'), score=('score', 'mean'),
+        display_df = kpi_df.groupby('kpi_name', observed=True).agg(
+            actual_numeric=('actual', 'mean'), score=('score', 'mean'),
             unrealized_value=('unrealized_value', 'mean'), bp_range_display=('bp_range_display', 'first'),
             unit=('unit', 'first')).reset_index()
     else:
-        display_df = kpi_df_copy.rename(columns={'actual_numeric': 'actual_numeric'})
+        display_df = kpi_df.assign(actual_numeric=kpi_df['actual'])
 
-    display_df['unrealized_value'] = pd.to_numeric(display_df.get('unrealized_value', 0), errors='coerce').fillna(0)
+    display_df['unrealized_value'] = display_df['unrealized_value'].fillna(0)
     display_df = display_df.sort_values(by='unrealized_value', ascending=False).reset_index(drop=True)
 
-    def assign_impact_labels(df):
-        labels = ['Average'] * len(df)
-        n = len(df)
-        if n == 0:
-            return labels
-        if n >= 5:
-            high_count, low_count = 2, 2
-        elif n >= 2:
-            high_count, low_count = 1, 1
-        else:
-            high_count, low_count = 1, 0
-        for i in range(high_count):
-            labels[i] = 'High'
-        for i in range(low_count):
-            labels[n - 1 - i] = 'Low'
-        return labels
-
-    display_df['impact_label'] = assign_impact_labels(display_df)
-
-    priority_styles = {
-        'High': 'background:#dcfce7; color:#166534;',
-        'Average': 'background:#ecfccb; color:#3f6212;',
-        'Low': 'background:#fef9c3; color:#854d0e;'
-    }
+    # High for the top rows by unrealized value, Low for the bottom rows, Average in between.
+    n = len(display_df)
+    high_count, low_count = (2, 2) if n >= 5 else (1, 1) if n >= 2 else (1, 0)
+    impact_labels = ['High'] * high_count + ['Average'] * (n - high_count - low_count) + ['Low'] * low_count
 
     actual_header = "Actual (Avg)" if is_averaged else "Actual"
-    tbl_id = f"proc-tbl-{id(kpi_df)}"
-
-    rows_html = ""
-    for _, row in display_df.iterrows():
-        actual_val = row['actual_numeric']
-        unit = row.get('unit', '')
-        actual_display = f"{actual_val:.0%}" if unit == '%' else f"{actual_val:.1f}"
-        kpi_name = str(row.get('kpi_name', 'N/A'))
-        kpi_name_display = html.escape(format_kpi_name(kpi_name))
-        tooltip_text = html.escape(build_kpi_tooltip(kpi_name), quote=True)
-        priority_label = row.get('impact_label', 'Average')
-        priority_style = priority_styles.get(priority_label, priority_styles['Average'])
-        rows_html += f"""<tr>
-            <td style='padding:0.6rem; background:#f9fafb; border-radius:0.375rem 0 0 0.375rem; font-size:1.235rem;'>
-                {kpi_name_display} <span class='kpi-tip-wrap'><span style='font-size:1.04rem; color:#6b7280; font-weight:600;'>[?]</span><span class='kpi-tip-box'>{tooltip_text}</span></span>
-            </td>
-            <td style='padding:0.6rem; background:#f9fafb; text-align:center; font-size:1.235rem;'>{html.escape(str(row.get('bp_range_display', 'N/A')))}</td>
-            <td style='padding:0.6rem; background:#f9fafb; text-align:center; font-size:1.235rem;'>{actual_display}</td>
-            <td style='padding:0.6rem; background:#f9fafb; text-align:center; font-size:1.235rem;'>{row.get('score', 0):.0f}</td>
-            <td style='padding:0.6rem; background:#f9fafb; border-radius:0 0.375rem 0.375rem 0; text-align:center;'>
-                <span style='display:inline-block; min-width:5rem; text-align:center; padding:0.2rem 0.6rem; border-radius:9999px; font-size:1.1rem; font-weight:700; {priority_style}'>{priority_label}</span>
-            </td>
+
+    # Format, escape and label whole columns, then join the rows once.
+    kpi_names = display_df['kpi_name'].astype(str) if 'kpi_name' in display_df.columns else pd.Series('N/A', index=display_df.index)
+    tooltips = {name: html.escape(build_kpi_tooltip(name), quote=True) for name in kpi_names.unique()}
+    units = display_df['unit'] if 'unit' in display_df.columns else pd.Series('', index=display_df.index)
+    actual_display = [f"{actual_val:.0%}" if unit == '%' else f"{actual_val:.1f}" for actual_val, unit in zip(display_df['actual_numeric'], units)]
+    bp_display = display_df['bp_range_display'].astype(str) if 'bp_range_display' in display_df.columns else pd.Series('N/A', index=display_df.index)
+    scores = display_df['score'] if 'score' in display_df.columns else pd.Series(0, index=display_df.index)
+
+    rows_html = "".join(
+        f"""<tr>
+            <td>{html.escape(format_kpi_name(kpi_name))} <span class='kpi-tip-wrap' data-tip="{tooltips[kpi_name]}"><span class='kpi-tip-marker'>[?]</span></span></td>
+            <td>{html.escape(bp_range)}</td>
+            <td>{actual_text}</td>
+            <td>{score:.0f}</td>
+            <td><span class='priority-pill priority-{priority_label.lower()}'>{priority_label}</span></td>
         </tr>"""
+        for kpi_name, bp_range, actual_text, score, priority_label in zip(kpi_names, bp_display, actual_display, scores, impact_labels)
+    )
 
-    st.markdown(f"""<style>
-        .{tbl_id} {{ width:100%; border-collapse:separate; border-spacing:0 0.35rem; font-size:1.235rem; }}
-        .{tbl_id} th {{ text-align:left; padding:0.5rem 0.6rem; background:#f3f4f6; color:#374151; font-weight:700; font-size:1.04rem; text-transform:uppercase; letter-spacing:0.05em; }}
-        .{tbl_id} th:first-child {{ border-radius:0.375rem 0 0 0.375rem; }}
-        .{tbl_id} th:last-child  {{ border-radius:0 0.375rem 0.375rem 0; }}
-        .{tbl_id} th:not(:last-child) {{ border-right:1px solid #e5e7eb; }}
-        .{tbl_id} th:nth-child(2), .{tbl_id} th:nth-child(3), .{tbl_id} th:nth-child(4), .{tbl_id} th:nth-child(5) {{ text-align:center; }}
-        .kpi-tip-wrap {{ display:inline-block; cursor:help; }}
-        .kpi-tip-box {{ display:none; position:fixed; background:#1e293b; color:#f8fafc; padding:0.55rem 0.8rem; border-radius:0.4rem; font-size:1.23rem; font-weight:400; line-height:1.5; width:420px; z-index:99999; pointer-events:none; white-space:normal; box-shadow:0 4px 12px rgba(0,0,0,0.3); }}
-    </style>""", unsafe_allow_html=True)
-    components.html("""<script>
-    (function() {
-        function initTooltips() {
-            var doc = window.parent.document;
-            doc.querySelectorAll('.kpi-tip-wrap').forEach(function(wrap) {
-                if (wrap._tipInit) return;
-                wrap._tipInit = true;
-                var box = wrap.querySelector('.kpi-tip-box');
-                if (!box) return;
-                wrap.addEventListener('mouseenter', function() {
-                    box.style.display = 'block';
-                    var rect = wrap.getBoundingClientRect();
-                    var tipH = box.offsetHeight;
-                    var tipW = box.offsetWidth;
-                    var top = rect.top - tipH - 8;
-                    if (top < 8) top = rect.bottom + 8;
-                    var left = rect.left;
-                    if (left + tipW > window.innerWidth - 8) left = window.innerWidth - tipW - 8;
-                    if (left < 8) left = 8;
-                    box.style.top = top + 'px';
-                    box.style.left = left + 'px';
-                });
-                wrap.addEventListener('mouseleave', function() {
-                    box.style.display = 'none';
-                });
-            });
-        }
-        initTooltips();
-        new MutationObserver(initTooltips).observe(window.parent.document.body, { childList: true, subtree: true });
-    })();
-    </script>""", height=0)
-    st.markdown(f"""<div style='overflow-x: auto;'><table class='{tbl_id}'>
+    st.markdown(f"""<div style='overflow-x: auto;'><table class='proc-tbl'>
         <thead><tr>
             <th>KPI Name</th>
             <th>Best Practice</th>
@@ -813,6 +275,7 @@ def format_process_name(name):
     if name in PROCESS_DISPLAY_NAMES: return PROCESS_DISPLAY_NAMES[name]
     return re.sub(r"(\w)([A-Z])", r"\1 \2", name).title()
 
+@dashboard_perf.timed()
 def display_top_action_items(page_key, action_items_df):
     """Displays the 'Top Priority Action Items' section with real data from CSV."""
     if action_items_df.empty:
@@ -848,56 +311,61 @@ def display_top_action_items(page_key, action_items_df):
 
 
 # --- Data Loading Function ---
-@st.cache_data
+# One read-only dataset per process, shared by every session (no per-rerun pickled copy).
+@dashboard_perf.timed()
+@st.cache_resource
 def load_data():
     base_path = "."; data = {}
     try:
-        summary_df = pd.read_csv(os.path.join(base_path, "executive_summary.csv"))
+        # Convert changed sources to the shared, memory-mapped Arrow store (once per host).
+        dashboard_data.sync_arrow_store(base_path)
+    except OSError as e:
+        st.warning(f"Could not update the Arrow data store, reading source files instead: {e}")
+    try:
+        if not dashboard_data.table_exists(base_path, "executive_summary"):
+            raise FileNotFoundError(2, "No such file", os.path.join(base_path, "executive_summary.csv"))
+        summary_df = dashboard_data.read_table(base_path, "executive_summary")
         data['executive_summary'] = summary_df[summary_df['impact_category'].isin(ALLOWED_IMPACT_CATEGORIES)]
         
         # Load action items data
-        action_items_file = os.path.join(base_path, "procore-itemized-combined.csv")
-        if os.path.exists(action_items_file):
-            action_items_df = pd.read_csv(action_items_file)
+        if dashboard_data.table_exists(base_path, "procore-itemized-combined"):
+            action_items_df = dashboard_data.read_table(base_path, "procore-itemized-combined")
             # Filter to only Construction categories (Schedule, Cost, Safety)
             data['action_items'] = action_items_df[action_items_df['impact_category'].isin(ALLOWED_IMPACT_CATEGORIES)]
         else:
             data['action_items'] = pd.DataFrame()
         
-        for phase in ['bidding', 'preconstruction', 'construction', 'closeout']:
-            processes_file = os.path.join(base_path, f"{phase}_processes.csv")
-            kpis_file = os.path.join(base_path, f"{phase}_kpis.csv")
-            if os.path.exists(processes_file) and os.path.exists(kpis_file):
-                df_p = pd.read_csv(processes_file)
-                df_k = pd.read_csv(kpis_file)
-
-                # Remove low-value near-miss KPIs from Construction/Safety views.
-                if phase == 'construction' and {'process_name', 'kpi_name'}.issubset(set(df_k.columns)):
-                    excluded_kpis = {'near miss rate', 'near miss detail quality'}
-                    is_safety_process = df_k['process_name'].astype(str).str.strip().str.lower() == 'safety'
-                    is_excluded_kpi = df_k['kpi_name'].astype(str).str.strip().str.lower().isin(excluded_kpis)
-                    df_k = df_k[~(is_safety_process & is_excluded_kpi)].copy()
-                
-                df_k['phase'] = phase.capitalize()
-
-                if 'project_id' in df_p.columns: df_p.rename(columns={'project_id': 'projectId'}, inplace=True)
-                if 'project_id' in df_k.columns: df_k.rename(columns={'project_id': 'projectId'}, inplace=True)
-                
-                data[phase] = {'processes': df_p, 'kpis': df_k}
-        return data
+        # Phase tables are read on first use by load_phase(); the summary pages
+        # only need the precomputed KPI cube and projects dimension.
+        data['phases'] = tuple(phase for phase in dashboard_data.PHASES if dashboard_data.phase_exists(base_path, phase))
+        derived = dashboard_data.read_derived_tables(base_path)
+        data['kpi_cube'] = dashboard_data.KpiCube(derived['kpi_cube'])
+        # One row per project (region, PM, value, dates); filters and the scoreboard join on its index.
+        data['projects'] = derived['projects'].set_index('projectId')
+
+        # Index the global filters once; reruns resolve them with bitmap operations.
+        filter_index = dashboard_data.ProjectFilterIndex(data['executive_summary'], data['projects'])
+        filter_index.register_rows('executive_summary', data['executive_summary'])
+        data['filter_index'] = filter_index
+        return dashboard_data.freeze_dataset(data)
     except FileNotFoundError as e:
-        st.warning(f"A data file was not found: {e.filename}"); return data
+        st.warning(f"A data file was not found: {e.filename}"); return dashboard_data.freeze_dataset(data)
     except Exception as e:
         st.error(f"An unexpected error occurred: {e}"); return None
 
+@dashboard_perf.timed()
+@st.cache_resource
+def load_phase(phase):
+    """One phase's processes and KPIs, read the first time a page needs them and shared from then on."""
+    return dashboard_data.freeze_dataset(dashboard_data.read_phase(".", phase))
+
 # --- Display Functions ---
+@dashboard_perf.timed()
 def display_executive_summary(data, summary_for_impact_calc, impact_category_filter):
     st.markdown("<h1 style='text-align: center; margin-bottom: 0;'>CR-Score Card</h1>", unsafe_allow_html=True); st.markdown("<h2 style='text-align: center; margin-top: 0; margin-bottom: 0.5rem; font-size: 1.5rem;'>Company ABC (Construction View)</h2>", unsafe_allow_html=True)
     
     summary_df = data['executive_summary']
-    all_kpis_df = pd.DataFrame()
-    if all(phase in data for phase in PHASE_INFO.keys()):
-        all_kpis_df = pd.concat([data[phase]['kpis'] for phase in PHASE_INFO.keys()]).drop_duplicates()
+    has_all_phases = all(phase in data for phase in PHASE_INFO.keys())
 
     if summary_df.empty: st.info("No project data matches the selected filters."); return
     
@@ -997,9 +465,13 @@ def display_executive_summary(data, summary_for_impact_calc, impact_category_fil
         </script>
         """)
 
-    kpis_for_actions = all_kpis_df[all_kpis_df['impact_category'] == impact_category_filter] if not all_kpis_df.empty else pd.DataFrame()
-    executive_top_performing = build_top_performing_kpis(kpis_for_actions)
-    executive_top_priority = build_top_priority_kpis(kpis_for_actions)
+    if has_all_phases:
+        project_ids = summary_df['projectId'].unique()
+        executive_top_performing = build_top_performing_kpis(data['kpi_cube'], project_ids, impact_category=impact_category_filter)
+        executive_top_priority = build_top_priority_kpis(data['kpi_cube'], project_ids, impact_category=impact_category_filter)
+    else:
+        executive_top_performing = pd.DataFrame(columns=['kpi_name', 'score_weighted'])
+        executive_top_priority = pd.DataFrame(columns=['kpi_name', 'priority_metric'])
 
     st.markdown("<hr style='margin-top: 1rem; margin-bottom: 0.75rem;'>", unsafe_allow_html=True)
     bottom_left, bottom_right = st.columns(2)
@@ -1009,6 +481,7 @@ def display_executive_summary(data, summary_for_impact_calc, impact_category_fil
         render_kpi_summary_section("Top Priority KPIs to Improve", executive_top_priority, get_kpi_guidance, "Guidance", accent_color="#ef4444")
 
 
+@dashboard_perf.timed()
 def display_phase_summary_page(phase_key, data, impact_category_filter, summary_for_impact_calc):
     if phase_key not in data:
         st.error(f"Data for the {phase_key} phase could not be loaded. Please ensure `{phase_key}_processes.csv` and `{phase_key}_kpis.csv` files are present.")
@@ -1027,7 +500,7 @@ def display_phase_summary_page(phase_key, data, impact_category_filter, summary_
     if summary_df.empty: st.info("No project data matches the selected filters."); return
 
     phase_score = summary_df[info['score_col']].mean()
-    process_scores = processes_df_all_categories.groupby('process_name')['score'].mean()
+    process_scores = processes_df_all_categories.groupby('process_name', observed=True)['score'].mean()
 
     with st.container(border=True):
         st.markdown(f"<h2 style='display:block; width:100%; text-align: center; font-size: 1.8rem; font-weight: 700; color: #111; border-bottom: 1px solid #e5e7eb; padding-bottom: 0.375rem;'>{phase_key.capitalize()} Phase Score</h2>", unsafe_allow_html=True)
@@ -1036,8 +509,9 @@ def display_phase_summary_page(phase_key, data, impact_category_filter, summary_
         with bar_col:
             st.markdown(f"<div style='margin-top: 2.0rem; padding-bottom: 1.5rem;'>{horizontal_risk_bar_html(phase_score, height='1.46rem', font_size='2.025rem', top_offset='-2.9rem', width_percentage=100)}</div>", unsafe_allow_html=True)
 
-    top_performing_df = build_top_performing_kpis(phase_kpis_all)
-    top_priority_df = build_top_priority_kpis(phase_kpis_all)
+    project_ids = summary_df['projectId'].unique()
+    top_performing_df = build_top_performing_kpis(data['kpi_cube'], project_ids, phase=phase_key)
+    top_priority_df = build_top_priority_kpis(data['kpi_cube'], project_ids, phase=phase_key)
 
     col_top_performing, col_top_priority = st.columns(2)
     with col_top_performing:
@@ -1050,37 +524,34 @@ def display_phase_summary_page(phase_key, data, impact_category_filter, summary_
 
     st.markdown(f"<h2 style='text-align: center; font-size: 1.5rem;'>{phase_key.capitalize()} Processes</h2>", unsafe_allow_html=True)
     for process_key in PHASE_PROCESS_MAPPING.get(phase_key, []):
-        score = process_scores.get(process_key, 0)
-        process_display_name = format_process_name(process_key)
-        state_key = f"show_kpis_{phase_key}_{process_key}"
-        button_label = "Hide KPIs" if st.session_state.get(state_key, False) else "Show KPIs"
-        btn_key = f"btn_{state_key}"
-
-        st.markdown(f"""<style>
-            div[data-testid="stColumn"]:has(div.st-key-{btn_key}) > div[data-testid="stVerticalBlock"] {{
-                display: flex !important;
-                flex-direction: row !important;
-                align-items: center !important;
-                gap: 0.75rem !important;
-            }}
-            div[data-testid="stColumn"]:has(div.st-key-{btn_key}) > div[data-testid="stVerticalBlock"] > div {{
-                width: auto !important;
-                flex-shrink: 0 !important;
-            }}
-            div.st-key-{btn_key} > div[data-testid="stButton"] > button {{
-                white-space: nowrap !important;
-            }}
-        </style>""", unsafe_allow_html=True)
-        proc_col, _ = st.columns([0.5, 0.5])
-        with proc_col:
-            st.markdown(f"<span style='font-size: 1.5rem; white-space: nowrap;'><strong>{process_display_name}</strong></span>", unsafe_allow_html=True)
-            st.button(button_label, key=btn_key, on_click=lambda s_key=state_key: st.session_state.update({s_key: not st.session_state.get(s_key, False)}), use_container_width=False, type="primary")
-
-        st.markdown(horizontal_risk_bar_html(score, width_percentage=100, height='1.02rem', font_size='1.42rem', top_offset='-2.03rem'), unsafe_allow_html=True)
-        if st.session_state.get(state_key, False):
-            display_kpi_table(kpis_df[kpis_df['process_name'] == process_key])
-
-def display_scoreboard(summary_for_impact_calc, data):
+        display_process_section(phase_key, process_key, process_scores.get(process_key, 0), kpis_df)
+
+@fragment
+@dashboard_perf.timed()
+def display_process_section(phase_key, process_key, score, kpis_df):
+    """One process of a phase page; its Show KPIs toggle reruns only this section."""
+    process_display_name = format_process_name(process_key)
+    state_key = f"show_kpis_{phase_key}_{process_key}"
+    button_label = "Hide KPIs" if st.session_state.get(state_key, False) else "Show KPIs"
+    btn_key = f"btn_{state_key}"
+
+    proc_col, _ = st.columns([0.5, 0.5])
+    with proc_col:
+        st.markdown(f"<span class='process-name'><strong>{process_display_name}</strong></span>", unsafe_allow_html=True)
+        st.button(button_label, key=btn_key, on_click=lambda s_key=state_key: st.session_state.update({s_key: not st.session_state.get(s_key, False)}), use_container_width=False, type="primary")
+
+    st.markdown(horizontal_risk_bar_html(score, width_percentage=100, height='1.02rem', font_size='1.42rem', top_offset='-2.03rem'), unsafe_allow_html=True)
+    if st.session_state.get(state_key, False):
+        display_kpi_table(kpis_df[kpis_df['process_name'] == process_key])
+
+@dashboard_perf.timed()
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_scoreboard_table(segment_col, filter_fingerprint, _summary_df, _projects):
+    """Scoreboard rows cached per (segmentation, filter set); the frames themselves are not hashed."""
+    return dashboard_data.build_scoreboard(_summary_df, _projects, segment_col)
+
+@dashboard_perf.timed()
+def display_scoreboard(summary_for_impact_calc, data, filter_fingerprint):
     """Display portfolio scoreboard with segment analysis"""
 
     if summary_for_impact_calc.empty:
@@ -1093,7 +564,7 @@ def display_scoreboard(summary_for_impact_calc, data):
 
     filter_col, title_col, spacer_col = st.columns([0.25, 0.5, 0.25])
     with filter_col:
-        st.markdown("<h3 style='text-align:left; margin-top:1.5rem; margin-bottom:0.25rem; font-size:1.56rem;'>Segment Portfolio By:</h3><style>h3 a { display: none !important; }</style>", unsafe_allow_html=True)
+        st.markdown("<h3 style='text-align:left; margin-top:1.5rem; margin-bottom:0.25rem; font-size:1.56rem;'>Segment Portfolio By:</h3>", unsafe_allow_html=True)
         segment_by = st.selectbox(
             "Segment Portfolio By:",
             ["Project", "Region", "Project Manager"],
@@ -1108,12 +579,8 @@ def display_scoreboard(summary_for_impact_calc, data):
             label_visibility="collapsed",
             on_change=lambda: st.session_state.update({'scoreboard_page': 0})
         )
-    st.markdown("""<style>
-        div.st-key-sc_search_input { margin-top: -1.2rem !important; }
-        div.st-key-sc_search_input input { font-size: 0.95rem !important; padding: 0.35rem 0.6rem !important; }
-    </style>""", unsafe_allow_html=True)
     with title_col:
-        st.markdown("<h1 style='text-align:center; margin-bottom:0;'>Portfolio Scoreboard</h1><style>h1 a, h2 a { display: none !important; }</style>", unsafe_allow_html=True)
+        st.markdown("<h1 style='text-align:center; margin-bottom:0;'>Portfolio Scoreboard</h1>", unsafe_allow_html=True)
         st.markdown("<h2 style='text-align:center; margin-top:0; margin-bottom:0.5rem; font-size:1.5rem;'>Segment Performance Analysis</h2>", unsafe_allow_html=True)
 
     # Map selection to column name
@@ -1124,60 +591,18 @@ def display_scoreboard(summary_for_impact_calc, data):
     }
     segment_col = segment_column_map[segment_by]
     
-    # Build project metadata from construction KPIs for value/start/end columns.
-    project_meta_df = pd.DataFrame(columns=['projectId', 'ProjValue', 'startDate', 'endDate'])
-    if 'construction' in data and 'kpis' in data['construction']:
-        construction_kpis = data['construction']['kpis'].copy()
-        required_cols = {'projectId', 'ProjValue', 'startDate', 'endDate'}
-        if required_cols.issubset(set(construction_kpis.columns)):
-            project_meta_df = construction_kpis[['projectId', 'ProjValue', 'startDate', 'endDate']].drop_duplicates()
-            project_meta_df = project_meta_df.groupby('projectId', as_index=False).first()
-
-            # Normalize value and date fields for consistent display.
-            project_meta_df['ProjValue_numeric'] = pd.to_numeric(
-                project_meta_df['ProjValue'].astype(str).str.replace(r'[$,]', '', regex=True),
-                errors='coerce'
-            )
-            project_meta_df['startDate_parsed'] = pd.to_datetime(project_meta_df['startDate'], errors='coerce')
-            project_meta_df['endDate_parsed'] = pd.to_datetime(project_meta_df['endDate'], errors='coerce')
-
-    # Calculate scoreboard data
-    scoreboard_data = []
-    
-    for segment_value in sorted(summary_for_impact_calc[segment_col].unique()):
-        segment_df = summary_for_impact_calc[summary_for_impact_calc[segment_col] == segment_value]
-        
-        # Calculate average score
-        avg_score = segment_df['score'].mean()
-
-        # Derive project metadata for this segment.
-        project_ids_in_segment = segment_df['projectId'].dropna().unique()
-        segment_meta = project_meta_df[project_meta_df['projectId'].isin(project_ids_in_segment)] if not project_meta_df.empty else pd.DataFrame()
-
-        est_proj_value = None
-        est_proj_start_date = None
-        est_proj_end_date = None
-
-        if not segment_meta.empty:
-            est_proj_value = segment_meta['ProjValue_numeric'].sum(min_count=1)
-            est_proj_start_date = segment_meta['startDate_parsed'].min()
-            est_proj_end_date = segment_meta['endDate_parsed'].max()
-        
-        scoreboard_data.append({
-            'Segment': segment_value,
-            'CR-Score': avg_score,
-            'Estimated Project Value': est_proj_value,
-            'Est Proj Start Date': est_proj_start_date,
-            'Est Proj End Date': est_proj_end_date
-        })
-    
-    # Create DataFrame and sort by CR-Score (highest first)
-    scoreboard_df = pd.DataFrame(scoreboard_data)
+    scoreboard_df = build_scoreboard_table(segment_col, filter_fingerprint, summary_for_impact_calc, data['projects'])
     
     if scoreboard_df.empty:
         st.info("No data available for selected segment.")
         return
-    
+    display_scoreboard_table(scoreboard_df, segment_by)
+
+@fragment
+@dashboard_perf.timed()
+def display_scoreboard_table(scoreboard_df, segment_by):
+    """Sortable, paged scoreboard table; its sort, paging and Go to Page controls rerun only this table."""
+    search_key = 'scoreboard_search'
     sort_col_key = 'scoreboard_sort_column'
     sort_dir_key = 'scoreboard_sort_direction'
     page_key = 'scoreboard_page'
@@ -1233,177 +658,45 @@ def display_scoreboard(summary_for_impact_calc, data):
             return label
         return f"{label} {'↑' if st.session_state[sort_dir_key] == 'asc' else '↓'}"
 
-    # Sort buttons targeted directly by st-key-* CSS classes — no marker needed.
-    # This means col 0 has exactly ONE element (just its button), so all columns are aligned.
-    st.markdown(f"""<style>
-        div[data-testid="stHorizontalBlock"]:has(.st-key-sc_sort_segment) {{
-            gap: 0 !important; margin-bottom: 0 !important;
-        }}
-        div.st-key-sc_sort_segment button,
-        div.st-key-sc_sort_cr button,
-        div.st-key-sc_sort_value button,
-        div.st-key-sc_sort_start button,
-        div.st-key-sc_sort_end button {{
-            background: #f3f4f6 !important; color: #374151 !important;
-            border: none !important; border-right: 1px solid #e5e7eb !important;
-            border-radius: 0 !important;
-            box-shadow: none !important; outline: none !important;
-            font-size: 0.8rem !important; font-weight: 700 !important;
-            text-transform: uppercase !important; letter-spacing: 0.05em !important;
-            padding: 0.5rem 0.6rem !important; transition: none !important;
-        }}
-        div.st-key-sc_sort_segment button:hover,
-        div.st-key-sc_sort_cr button:hover,
-        div.st-key-sc_sort_value button:hover,
-        div.st-key-sc_sort_start button:hover,
-        div.st-key-sc_sort_end button:hover {{
-            background: #e5e7eb !important; color: #111 !important;
-        }}
-        div.st-key-sc_sort_segment button:focus:not(:active),
-        div.st-key-sc_sort_cr button:focus:not(:active),
-        div.st-key-sc_sort_value button:focus:not(:active),
-        div.st-key-sc_sort_start button:focus:not(:active),
-        div.st-key-sc_sort_end button:focus:not(:active) {{
-            box-shadow: none !important;
-        }}
-        div.st-key-sc_sort_segment button {{ border-radius: 0.375rem 0 0 0.375rem !important; }}
-        div.st-key-sc_sort_end button     {{ border-radius: 0 0.375rem 0.375rem 0 !important; border-right: none !important; }}
-        .sc-tbl {{ width:100%; border-collapse:separate; border-spacing:0 0.35rem; font-size:0.95rem; }}
-        .sc-tbl td {{ padding:0.6rem 0.6rem; background:#f9fafb; vertical-align:middle; border:none; }}
-        .sc-tbl td:first-child {{ border-radius:0.375rem 0 0 0.375rem; }}
-        .sc-tbl td:last-child  {{ border-radius:0 0.375rem 0.375rem 0; }}
-        .sc-tbl td.seg-name    {{ font-weight:700; color:#111; width:20%; font-size:1.19rem; }}
-        .sc-tbl td.cr-score   {{ width:22%; padding-top:0.6rem; }}
-        .sc-tbl td.proj-value {{ text-align:center; width:20%; font-size:1.19rem; }}
-        .sc-tbl td.proj-date  {{ text-align:center; width:19%; font-size:1.19rem; }}
-        .sc-tbl .sc-bar-wrap span {{ padding: 0.1rem 0.30rem !important; line-height: 1 !important; }}
-        div[data-testid="stVerticalBlockBorderWrapper"]:has(.st-key-sc_sort_segment) {{ margin-top: -1.5rem !important; }}
-    </style>""", unsafe_allow_html=True)
     with st.container(border=True):
         hdr_cols = st.columns([0.20, 0.22, 0.20, 0.19, 0.19])
         with hdr_cols[0]:
+            st.button(sort_label('Segment', segment_by), key='sc_sort_segment', on_click=toggle_sort, args=('Segment',), use_container_width=True)
+        with hdr_cols[1]:
+            st.button(sort_label('CR-Score', 'CR-Score'), key='sc_sort_cr', on_click=toggle_sort, args=('CR-Score',), use_container_width=True)
+        with hdr_cols[2]:
+            st.button(sort_label('Estimated Project Value', 'Est Proj Value'), key='sc_sort_value', on_click=toggle_sort, args=('Estimated Project Value',), use_container_width=True)
+        with hdr_cols[3]:
+            st.button(sort_label('Est Proj Start Date', 'Est Proj Start'), key='sc_sort_start', on_click=toggle_sort, args=('Est Proj Start Date',), use_container_width=True)
+        with hdr_cols[4]:
+            st.button(sort_label('Est Proj End Date', 'Est Proj End'), key='sc_sort_end', on_click=toggle_sort, args=('Est Proj End Date',), use_container_width=True)
+
+        rows_html = ""
+        for _, row in paged_df.iterrows():
+            score_bar = horizontal_risk_bar_html(row['CR-Score'], height='0.9rem', font_size='1.0rem', top_offset='-1.45rem', box_height='1.3rem')
+            rows_html += f"""<tr>
+                <td class='seg-name'>{html.escape(str(row['Segment']))}</td>
+                <td class='cr-score'><div class='sc-bar-wrap'>{score_bar}</div></td>
+                <td class='proj-value'>{format_currency(row['Estimated Project Value'])}</td>
+                <td class='proj-date'>{format_date(row['Est Proj Start Date'])}</td>
+                <td class='proj-date'>{format_date(row['Est Proj End Date'])}</td>
+            </tr>"""
+        st.markdown(f"<div style='overflow-x: auto;'><table class='sc-tbl'><tbody>{rows_html}</tbody></table></div>", unsafe_allow_html=True)
 
     # Pagination controls
     if True:
-        st.markdown("""<style>
-            div[data-testid="stHorizontalBlock"]:has(.st-key-sc_pg_first) {
-                margin-top: -0.5rem !important;
-                gap: 0.5rem !important;
-                align-items: center !important;
-                flex-wrap: nowrap !important;
-                min-width: max-content !important;
-            }
-            div[data-testid="stHorizontalBlock"]:has(.st-key-sc_pg_first) > div[data-testid="stColumn"] {
-                flex: 0 0 auto !important;
-                width: auto !important;
-                min-width: 0 !important;
-                overflow: visible !important;
-            }
-            div.st-key-sc_pg_first button, div.st-key-sc_pg_prev button,
-            div.st-key-sc_pg_next button, div.st-key-sc_pg_last button {
-                background: #f3f4f6 !important; color: #000 !important;
-                border: 1px solid #e5e7eb !important; border-radius: 0.375rem !important;
-                font-size: 2.55rem !important; font-weight: 700 !important;
-                padding: 0 0.4rem !important; box-shadow: none !important;
-                height: 2.0rem !important; min-height: 0 !important; width: auto !important;
-                line-height: 1 !important; overflow: visible !important;
-                display: flex !important; align-items: center !important;
-                justify-content: center !important;
-            }
-            div.st-key-sc_pg_first button p, div.st-key-sc_pg_prev button p,
-            div.st-key-sc_pg_next button p, div.st-key-sc_pg_last button p {
-                font-size: 2.55rem !important; font-weight: 700 !important;
-                color: #000 !important; line-height: 1 !important; margin: 0 !important;
-                padding: 0 !important; display: flex !important;
-                align-items: center !important; justify-content: center !important;
-            }
-            div.st-key-sc_pg_first button:hover, div.st-key-sc_pg_prev button:hover,
-            div.st-key-sc_pg_next button:hover, div.st-key-sc_pg_last button:hover {
-                background: #e5e7eb !important; color: #000 !important;
-            }
-            div.st-key-sc_pg_first button:disabled, div.st-key-sc_pg_prev button:disabled,
-            div.st-key-sc_pg_next button:disabled, div.st-key-sc_pg_last button:disabled {
-                opacity: 1 !important; cursor: default !important;
-            }
-            div.st-key-sc_pg_first button:disabled p, div.st-key-sc_pg_prev button:disabled p,
-            div.st-key-sc_pg_next button:disabled p, div.st-key-sc_pg_last button:disabled p {
-                color: #bbb !important;
-            }
-            div[data-testid="stHorizontalBlock"]:has(.st-key-sc_pg_first) {
-                margin-top: -0.5rem !important;
-                margin-bottom: 0 !important;
-                margin-left: auto !important;
-                margin-right: auto !important;
-                gap: 0.5rem !important;
-                align-items: center !important;
-                flex-wrap: nowrap !important;
-                width: max-content !important;
-            }
-            div[data-testid="stHorizontalBlock"]:has(.st-key-sc_pg_first) > div[data-testid="stColumn"] {
-                flex: 0 0 auto !important;
-                width: auto !important;
-                min-width: 0 !important;
-                overflow: visible !important;
-            }
-        </style>""", unsafe_allow_html=True)
         c1, c2, c3, c4, c5 = st.columns([1, 1, 2, 1, 1])
         with c1:
             st.button("«", key='sc_pg_first', on_click=lambda: st.session_state.update({page_key: 0}), disabled=(current_page == 0), use_container_width=True)
         with c2:
             st.button("‹", key='sc_pg_prev', on_click=lambda: st.session_state.update({page_key: max(0, current_page - 1)}), disabled=(current_page == 0), use_container_width=True)
         with c3:
-            st.markdown(f"<p style='text-align:center; margin:0; margin-top:-0.4rem; padding:0 1.5rem; font-weight:700; font-size:1.3rem; width:100%; white-space:nowrap; display:flex; align-items:center; justify-content:center; height:2.0rem;'>Page {current_page + 1} of {total_pages}</p>", unsafe_allow_html=True)
+            st.markdown(f"<p class='sc-page-label'>Page {current_page + 1} of {total_pages}</p>", unsafe_allow_html=True)
         with c4:
             st.button("›", key='sc_pg_next', on_click=lambda: st.session_state.update({page_key: min(total_pages - 1, current_page + 1)}), disabled=(current_page == total_pages - 1), use_container_width=True)
         with c5:
             st.button("»", key='sc_pg_last', on_click=lambda: st.session_state.update({page_key: total_pages - 1}), disabled=(current_page == total_pages - 1), use_container_width=True)
 
-        st.markdown("""<style>
-            div[data-testid="stHorizontalBlock"]:has(.st-key-sc_goto_input) {
-                margin-top: 0 !important;
-                margin-left: auto !important;
-                margin-right: auto !important;
-                width: max-content !important;
-                align-items: center !important;
-                gap: 0.4rem !important;
-            }
-            div[data-testid="stHorizontalBlock"]:has(.st-key-sc_goto_input) + div,
-            div[data-testid="stVerticalBlock"] > div:has(div[data-testid="stHorizontalBlock"]:has(.st-key-sc_goto_input)) {
-                margin-top: 0 !important;
-                padding-top: 0 !important;
-            }
-            div[data-testid="stVerticalBlock"] > div:has(+ div > div[data-testid="stHorizontalBlock"]:has(.st-key-sc_goto_input)) {
-                margin-bottom: 0 !important;
-                padding-bottom: 0 !important;
-            }
-            div.st-key-sc_goto_input, div.st-key-sc_goto_input > div, div.st-key-sc_goto_input > div > div {
-                min-height: 0 !important; height: auto !important;
-                margin-bottom: 0 !important; padding-bottom: 0 !important;
-            }
-            div.st-key-sc_goto_input input {
-                width: 3.0rem !important; text-align: center !important;
-                height: 2.0rem !important; min-height: 0 !important;
-                padding-top: 0 !important; padding-bottom: 0 !important;
-                padding-left: 0.4rem !important; padding-right: 0.4rem !important;
-                font-size: 1.3rem !important; font-weight: 700 !important;
-                line-height: normal !important; box-sizing: border-box !important;
-            }
-            div[data-testid="stHorizontalBlock"]:has(.st-key-sc_goto_input) > div[data-testid="stColumn"]:first-child {
-                flex: 0 0 max-content !important; width: max-content !important;
-                display: flex !important; align-items: center !important;
-            }
-            div[data-testid="stHorizontalBlock"]:has(.st-key-sc_goto_input) > div[data-testid="stColumn"]:last-child {
-                flex: 0 0 auto !important; width: auto !important;
-                display: flex !important; align-items: center !important;
-            }
-            div.st-key-sc_goto_btn button {
-                background: #f3f4f6 !important; color: #000 !important;
-                border: 1px solid #e5e7eb !important; border-radius: 0.375rem !important;
-                font-size: 0.85rem !important; font-weight: 600 !important;
-                padding: 0.3rem 0.7rem !important; box-shadow: none !important;
-            }
-        </style>""", unsafe_allow_html=True)
-
         def go_to_page():
             val = st.session_state.get('sc_goto_input', '#')
             try:
@@ -1414,37 +707,31 @@ def display_scoreboard(summary_for_impact_calc, data):
 
         gl, gi = st.columns([1, 1])
         with gl:
-            st.markdown("<p style='font-size:1.3rem;font-weight:700;margin:0;display:flex;align-items:center;height:2.0rem;white-space:nowrap;'>Go to Page</p>", unsafe_allow_html=True)
+            st.markdown("<p class='sc-goto-label'>Go to Page</p>", unsafe_allow_html=True)
         with gi:
             st.text_input("Go to page", value="#", key='sc_goto_input',
                           label_visibility='collapsed', on_change=go_to_page)
 
 # --- Main Application ---
 def main():
+    dashboard_perf.start_rerun()
+    profiler = dashboard_perf.start_requested_profile()
+    try:
+        render_dashboard(profiler)
+    finally:
+        # Reruns and st.stop() interrupt the script by raising; never leave the
+        # sampler running, or this thread's timings open for a later fragment rerun.
+        if profiler is not None:
+            profiler.stop()
+        # A no-op when render_dashboard got as far as finishing the rerun itself.
+        dashboard_perf.finish_rerun(interrupted=True)
+
+def render_dashboard(profiler):
     original_data = load_data()
     if not original_data: st.stop()
+    install_client_assets()
 
-    st.markdown("""<style>
-        section[data-testid="stSidebar"] label,
-        section[data-testid="stSidebar"] .stSelectbox label,
-        section[data-testid="stSidebar"] .stSlider label,
-        section[data-testid="stSidebar"] .stRadio label:first-of-type,
-        section[data-testid="stSidebar"] p { font-weight: 700 !important; }
-    </style>""", unsafe_allow_html=True)
-
-    # Build project metadata for additional global filters.
-    project_meta = pd.DataFrame(columns=['projectId', 'ProjValue_numeric', 'startDate_parsed'])
-    if 'construction' in original_data and 'kpis' in original_data['construction']:
-        construction_kpis = original_data['construction']['kpis'].copy()
-        required_cols = {'projectId', 'ProjValue', 'startDate'}
-        if required_cols.issubset(set(construction_kpis.columns)):
-            project_meta = construction_kpis[['projectId', 'ProjValue', 'startDate']].drop_duplicates()
-            project_meta = project_meta.groupby('projectId', as_index=False).first()
-            project_meta['ProjValue_numeric'] = pd.to_numeric(
-                project_meta['ProjValue'].astype(str).str.replace(r'[$,]', '', regex=True),
-                errors='coerce'
-            )
-            project_meta['startDate_parsed'] = pd.to_datetime(project_meta['startDate'], errors='coerce')
+    filter_index = original_data['filter_index']
 
     value_breakpoints = [
         0,
@@ -1466,29 +753,20 @@ def main():
         return float(label.replace('$', '').replace(',', ''))
 
     date_min = date_max = None
-    if not project_meta.empty and project_meta['startDate_parsed'].notna().any():
-        date_min = project_meta['startDate_parsed'].min().date()
-        date_max = project_meta['startDate_parsed'].max().date()
+    start_min, start_max = filter_index.start_date_bounds()
+    if start_min is not None:
+        date_min = start_min.date()
+        date_max = start_max.date()
     
     import base64 as _b64
     with open("static/cr_ai_logo.png", "rb") as _f:
         _logo_b64 = _b64.b64encode(_f.read()).decode()
-    st.sidebar.markdown(f"""<style>
-        section[data-testid='stSidebar'] > div:first-child {{ padding-top: 0 !important; }}
-        section[data-testid='stSidebar'] .stSidebarContent {{ padding-top: 0 !important; }}
-        section[data-testid='stSidebar'] [data-testid='stSidebarContent'] {{ padding-top: 0 !important; }}
-        [data-testid='stSidebarHeader'] {{ height: 2rem !important; min-height: 0 !important; padding: 0 !important; }}
-    </style><div style='text-align:center;padding-top:0.5rem;margin-bottom:0;'><img src='data:image/png;base64,{_logo_b64}' width='100'></div>""", unsafe_allow_html=True)
-    st.sidebar.markdown("<style>section[data-testid='stSidebar'] h1:first-of-type { margin-top: 0 !important; padding-top: 0 !important; }</style>", unsafe_allow_html=True)
+    st.sidebar.markdown(f"""<div style='text-align:center;padding-top:0.5rem;margin-bottom:0;'><img src='data:image/png;base64,{_logo_b64}' width='100'></div>""", unsafe_allow_html=True)
     st.sidebar.title("Global Filters")
-    unfiltered_summary_df = original_data.get('executive_summary', pd.DataFrame())
-    if not unfiltered_summary_df.empty:
-        project_ids = sorted(unfiltered_summary_df['projectId'].unique())
-        regions = sorted(unfiltered_summary_df['region'].unique())
-        pms = sorted(unfiltered_summary_df['projectManager'].unique())
-        impact_categories = sorted(unfiltered_summary_df['impact_category'].unique())
-    else:
-        project_ids, regions, pms, impact_categories = [], [], [], []
+    project_ids = list(filter_index.project_ids)
+    regions = sorted(filter_index.by_region)
+    pms = sorted(filter_index.by_project_manager)
+    impact_categories = sorted(filter_index.by_impact_category)
 
     default_index = 0
     if impact_categories and 'Schedule' in impact_categories:
@@ -1528,55 +806,38 @@ def main():
         date_range = None
         st.sidebar.markdown("Est Proj Start Date: N/A")
     
-    summary_for_impact_calc = original_data['executive_summary'].copy()
-    if filters['project'] != 'All Projects': summary_for_impact_calc = summary_for_impact_calc[summary_for_impact_calc['projectId'] == filters['project']]
-    if filters['region'] != 'All Regions': summary_for_impact_calc = summary_for_impact_calc[summary_for_impact_calc['region'] == filters['region']]
-    if filters['pm'] != 'All PMs': summary_for_impact_calc = summary_for_impact_calc[summary_for_impact_calc['projectManager'] == filters['pm']]
-
-    if value_range is not None:
-        min_value, max_value = value_range
-        if max_value == float('inf'):
-            value_mask = project_meta['ProjValue_numeric'] >= float(min_value)
-        else:
-            value_mask = project_meta['ProjValue_numeric'].between(float(min_value), float(max_value), inclusive='both')
-        value_project_ids = set(project_meta.loc[value_mask, 'projectId'])
-        summary_for_impact_calc = summary_for_impact_calc[summary_for_impact_calc['projectId'].isin(value_project_ids)]
-
-    if date_range is not None:
-        start_date, end_date = date_range
-        start_ts = pd.Timestamp(start_date)
-        end_ts = pd.Timestamp(end_date)
-        date_project_ids = set(
-            project_meta.loc[
-                project_meta['startDate_parsed'].between(start_ts, end_ts, inclusive='both'),
-                'projectId'
-            ]
+    with dashboard_perf.span('filters'):
+        # Resolve the sidebar filters to a project bitmap once; every frame below reuses it.
+        project_filter = filters['project'] if filters['project'] != 'All Projects' else None
+        region_filter = filters['region'] if filters['region'] != 'All Regions' else None
+        pm_filter = filters['pm'] if filters['pm'] != 'All PMs' else None
+        start_range = (pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1])) if date_range is not None else None
+        project_bitmap = filter_index.select(project=project_filter, region=region_filter, project_manager=pm_filter,
+                                             value_range=value_range, start_range=start_range)
+
+        summary_for_impact_calc = filter_index.take('executive_summary', original_data['executive_summary'], project_bitmap)
+
+        # Filter action items based on sidebar selections
+        # Items are matched on their own projectId/region/PM columns, not their
+        # project's executive summary row, so items of projects missing from the
+        # summary still show when nothing is filtered.
+        action_items_filtered = original_data.get('action_items', pd.DataFrame())
+        if not action_items_filtered.empty:
+            item_mask = action_items_filtered['impact_category'] == filters['impact_category']
+            for column, value in (('projectId', project_filter), ('region', region_filter), ('projectManager', pm_filter)):
+                if value is not None:
+                    item_mask &= action_items_filtered[column] == value
+            action_items_filtered = action_items_filtered[item_mask]
+
+        summary_df = filter_index.take('executive_summary', original_data['executive_summary'], project_bitmap, impact_category=filters['impact_category'])
+
+        # Phase frames are sliced lazily, only for the page that reads them.
+        final_project_bitmap = project_bitmap & filter_index.by_impact_category.get(filters['impact_category'], False)
+        filtered_data = dashboard_data.FilteredDataset(
+            original_data, filter_index, final_project_bitmap,
+            overrides={'executive_summary': summary_df, 'action_items': action_items_filtered},
+            load_phase=load_phase
         )
-        summary_for_impact_calc = summary_for_impact_calc[summary_for_impact_calc['projectId'].isin(date_project_ids)]
-
-    # Filter action items based on sidebar selections
-    action_items_filtered = original_data.get('action_items', pd.DataFrame()).copy()
-    if not action_items_filtered.empty:
-        if filters['project'] != 'All Projects': 
-            action_items_filtered = action_items_filtered[action_items_filtered['projectId'] == filters['project']]
-        if filters['region'] != 'All Regions': 
-            action_items_filtered = action_items_filtered[action_items_filtered['region'] == filters['region']]
-        if filters['pm'] != 'All PMs': 
-            action_items_filtered = action_items_filtered[action_items_filtered['projectManager'] == filters['pm']]
-        action_items_filtered = action_items_filtered[action_items_filtered['impact_category'] == filters['impact_category']]
-
-    summary_df = summary_for_impact_calc.copy()
-    summary_df = summary_df[summary_df['impact_category'] == filters['impact_category']]
-    
-    filtered_data = copy.deepcopy(original_data)
-    filtered_data['executive_summary'] = summary_df
-    filtered_data['action_items'] = action_items_filtered
-    
-    final_filtered_project_ids = summary_df['projectId'].unique()
-    for phase in PHASE_INFO.keys():
-        if phase in filtered_data:
-            filtered_data[phase]['processes'] = filtered_data[phase]['processes'][filtered_data[phase]['processes']['projectId'].isin(final_filtered_project_ids)]
-            filtered_data[phase]['kpis'] = filtered_data[phase]['kpis'][filtered_data[phase]['kpis']['projectId'].isin(final_filtered_project_ids)]
 
     st.sidebar.caption(f"Last updated: {datetime.date.today().strftime('%m/%d/%Y')}")
     st.sidebar.markdown("---")
@@ -1588,7 +849,7 @@ def main():
     if page_selection == "Executive Summary":
         display_executive_summary(filtered_data, summary_for_impact_calc, filters['impact_category'])
     elif page_selection == "Portfolio Scoreboard":
-        display_scoreboard(summary_for_impact_calc, original_data)
+        display_scoreboard(summary_for_impact_calc, original_data, filter_index.fingerprint(project_bitmap))
     else:
         display_phase_summary_page(page_selection.lower(), filtered_data, filters['impact_category'], summary_for_impact_calc)
 
@@ -1599,5 +860,10 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
+    rerun_timings = dashboard_perf.finish_rerun(page=page_selection, filters=filters)
+    if dashboard_perf.panel_requested():
+        dashboard_perf.render_panel(rerun_timings)
+    dashboard_perf.render_profiler_controls(profiler, page_selection)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,45 @@
+"""Reading the derived tables with and without a columnar store."""
+import glob
+import os
+import shutil
+
+import pytest
+
+import dashboard_data
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def exports(tmp_path):
+    # CSV exports only: no Arrow or Parquet copies yet.
+    for path in glob.glob(os.path.join(ROOT, '*.csv')):
+        shutil.copy(path, tmp_path)
+    return str(tmp_path)
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    calls = []
+    build = dashboard_data.build_derived_tables
+    monkeypatch.setattr(dashboard_data, 'build_derived_tables', lambda base_path=".": (calls.append(base_path), build(base_path))[1])
+    return calls
+
+
+def test_derived_tables_are_built_once_without_a_store(exports, builds):
+    tables = dashboard_data.read_derived_tables(exports)
+
+    assert builds == [exports]
+    assert set(tables) == set(dashboard_data.DERIVED_TABLES)
+    assert tables['kpi_cube'].equals(dashboard_data.read_table(exports, 'kpi_cube'))
+    assert tables['projects'].equals(dashboard_data.read_table(exports, 'projects'))
+
+
+def test_stored_derived_tables_are_not_rebuilt(exports, builds):
+    dashboard_data.sync_arrow_store(exports)
+    builds.clear()
+
+    tables = dashboard_data.read_derived_tables(exports)
+
+    assert builds == []
+    assert len(tables['projects']) > 0
@@ -0,0 +1,135 @@
+"""ProjectFilterIndex row selection: offset ranges, the gather fallback and concurrent registration."""
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import dashboard_data
+
+REGIONS = ['Midwest', 'Northeast', 'West']
+CATEGORIES = ['Cost', 'Safety', 'Schedule']
+
+
+def make_index(n_projects=60):
+    ids = [f"P-{REGIONS[i % 3][:2].upper()}-{i:03d}" for i in range(n_projects)]
+    summary = pd.DataFrame({
+        'projectId': np.repeat(ids, len(CATEGORIES)),
+        'region': np.repeat([REGIONS[i % 3] for i in range(n_projects)], len(CATEGORIES)),
+        'projectManager': 'PM',
+        'impact_category': CATEGORIES * n_projects,
+        'score': 1.0,
+    })
+    summary = dashboard_data.ingest_table('executive_summary', summary)
+    projects = pd.DataFrame({
+        'region': [REGIONS[i % 3] for i in range(n_projects)],
+        'projectManager': 'PM',
+        'ProjValue': np.arange(n_projects, dtype=float),
+        'startDate': pd.date_range('2024-01-01', periods=n_projects),
+    }, index=pd.Index(ids, name='projectId'))
+    return dashboard_data.ProjectFilterIndex(summary, projects), ids
+
+
+def make_facts(ids, rng, categorical=True):
+    # Rows per project vary (some have none); one unknown project is mixed in.
+    counts = rng.integers(0, 6, len(ids))
+    project_ids = np.repeat(ids, counts).tolist() + ['P-XX-999'] * 3
+    facts = pd.DataFrame({
+        'projectId': project_ids,
+        'impact_category': rng.choice(CATEGORIES, len(project_ids)),
+    })
+    if categorical:
+        facts['projectId'] = facts['projectId'].astype('category')
+    return facts
+
+
+def expected(index, facts, bitmap, impact_category=None):
+    selected = {index.project_ids[i] for i in np.flatnonzero(bitmap)}
+    mask = facts['projectId'].astype(str).isin(selected)
+    if impact_category is not None:
+        mask &= facts['impact_category'] == impact_category
+    return facts[mask]
+
+
+@pytest.mark.parametrize('layout', ['sorted', 'sorted-object', 'unsorted'])
+def test_take_matches_isin(layout):
+    rng = np.random.default_rng(0)
+    index, ids = make_index()
+    facts = make_facts(ids, rng, categorical=layout != 'sorted-object')
+    if layout == 'unsorted':
+        facts = facts.sample(frac=1, random_state=0)
+    else:
+        facts = dashboard_data.sort_by_project(facts)
+    index.register_rows('facts', facts)
+
+    selections = [index.select(), index.select(region='West'), index.select(project=ids[7]),
+                  np.zeros(len(index), dtype=bool)]
+    selections += [rng.random(len(index)) < 0.3 for _ in range(20)]
+    for bitmap in selections:
+        for category in [None, 'Cost', 'Unknown']:
+            got = index.take('facts', facts, bitmap, impact_category=category)
+            assert got.index.equals(expected(index, facts, bitmap, category).index)
+
+
+def test_region_selection_is_one_slice():
+    index, ids = make_index()
+    facts = dashboard_data.sort_by_project(make_facts(ids, np.random.default_rng(1)))
+    index.register_rows('facts', facts)
+    assert isinstance(index.rows('facts', index.select(region='West')), slice)
+    assert isinstance(index.rows('facts', index.select(project=ids[3])), slice)
+
+
+def test_reregistering_never_hides_the_key():
+    # Other sessions keep selecting while a frame is registered again.
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        index, ids = make_index()
+        facts = dashboard_data.sort_by_project(make_facts(ids, np.random.default_rng(2)))
+        index.register_rows('facts', facts)
+        bitmap = index.select(region='Midwest')
+        errors = []
+        barrier = threading.Barrier(8)
+
+        def work():
+            barrier.wait()
+            try:
+                for _ in range(50):
+                    index.register_rows('facts', facts)
+                    index.take('facts', facts, bitmap)
+            except Exception as e:  # noqa: BLE001 - any failure is the race
+                errors.append(e)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(old_interval)
+    assert errors == []
+
+
+def test_concurrent_first_access_registers_once():
+    index, ids = make_index()
+    facts = dashboard_data.sort_by_project(make_facts(ids, np.random.default_rng(3)))
+    frames = {'processes': facts, 'kpis': facts}
+    bitmap = index.select(region='West')
+    calls = []
+    register_rows = index.register_rows
+    index.register_rows = lambda key, df: (calls.append(key), register_rows(key, df))
+    barrier = threading.Barrier(8)
+    results = []
+
+    def work():
+        barrier.wait()
+        results.append(len(dashboard_data._FilteredPhase('construction', frames, index, bitmap)['kpis']))
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == ['construction_kpis']
+    assert len(set(results)) == 1 and len(results) == 8
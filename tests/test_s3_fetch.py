@@ -0,0 +1,114 @@
+"""S3FrameCache against a moto-mocked bucket: ETag revalidation and its error paths."""
+import pandas as pd
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+import s3_fetch
+
+BUCKET = 'dashboard-data'
+PREFIX = 'exports/'
+
+
+@pytest.fixture
+def aws_env(monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+
+
+@pytest.fixture
+def s3(aws_env):
+    with mock_aws():
+        client = s3_fetch.make_s3_client()
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+@pytest.fixture
+def cache(s3, tmp_path):
+    return s3_fetch.S3FrameCache(s3, BUCKET, prefix=PREFIX, cache_dir=str(tmp_path))
+
+
+def put_csv(s3, filename, body):
+    s3.put_object(Bucket=BUCKET, Key=f"{PREFIX}{filename}", Body=body.encode())
+
+
+def forbid_download(monkeypatch):
+    def read_csv(*args, **kwargs):
+        raise AssertionError("downloaded and parsed although the cached copy is current")
+    monkeypatch.setattr(s3_fetch.pd, 'read_csv', read_csv)
+
+
+def test_make_s3_client_sizes_connection_pool(aws_env):
+    client = s3_fetch.make_s3_client(max_pool_connections=4)
+    assert client.meta.service_model.service_name == 's3'
+    assert client.meta.config.max_pool_connections == 4
+
+
+def test_first_fetch_downloads_and_fills_cache(s3, cache):
+    put_csv(s3, 'summary.csv', "projectId,score\nP-1,10\nP-2,20\nP-2,20\n")
+
+    df = cache.fetch('summary.csv')
+
+    assert df.to_dict('list') == {'projectId': ['P-1', 'P-2'], 'score': [10, 20]}
+    frame_path, meta_path = cache._paths('summary.csv')
+    pd.testing.assert_frame_equal(pd.read_parquet(frame_path), df)
+    etag = s3.head_object(Bucket=BUCKET, Key=f"{PREFIX}summary.csv")['ETag']
+    assert cache._read_meta(meta_path)['etag'] == etag
+
+
+def test_unchanged_object_is_served_from_cache(s3, cache, monkeypatch):
+    put_csv(s3, 'summary.csv', "projectId,score\nP-1,10\n")
+    first = cache.fetch('summary.csv')
+
+    forbid_download(monkeypatch)
+    second = cache.fetch('summary.csv')
+
+    pd.testing.assert_frame_equal(second, first)
+
+
+def test_changed_etag_replaces_cached_frame(s3, cache):
+    put_csv(s3, 'summary.csv', "projectId,score\nP-1,10\n")
+    cache.fetch('summary.csv')
+    _, meta_path = cache._paths('summary.csv')
+    old_etag = cache._read_meta(meta_path)['etag']
+
+    put_csv(s3, 'summary.csv', "projectId,score\nP-1,15\nP-3,30\n")
+    df = cache.fetch('summary.csv')
+
+    assert df.to_dict('list') == {'projectId': ['P-1', 'P-3'], 'score': [15, 30]}
+    assert cache._read_meta(meta_path)['etag'] != old_etag
+    pd.testing.assert_frame_equal(pd.read_parquet(cache._paths('summary.csv')[0]), df)
+
+
+def test_missing_object_raises_even_with_a_cached_copy(s3, cache):
+    put_csv(s3, 'summary.csv', "projectId,score\nP-1,10\n")
+    cache.fetch('summary.csv')
+    s3.delete_object(Bucket=BUCKET, Key=f"{PREFIX}summary.csv")
+
+    with pytest.raises(ClientError) as excinfo:
+        cache.fetch('summary.csv')
+    assert excinfo.value.response['Error']['Code'] == 'NoSuchKey'
+
+
+def test_fetch_many_returns_frames_and_errors_per_file(s3, cache):
+    put_csv(s3, 'a.csv', "projectId\nP-1\n")
+    put_csv(s3, 'b.csv', "projectId\nP-2\n")
+
+    results = cache.fetch_many(['a.csv', 'b.csv', 'missing.csv', 'a.csv'], max_workers=3)
+
+    assert list(results) == ['a.csv', 'b.csv', 'missing.csv']
+    assert results['a.csv']['projectId'].tolist() == ['P-1']
+    assert results['b.csv']['projectId'].tolist() == ['P-2']
+    assert isinstance(results['missing.csv'], ClientError)
+
+
+def test_fetch_many_revalidates_cached_files(s3, cache, monkeypatch):
+    put_csv(s3, 'a.csv', "projectId\nP-1\n")
+    cache.fetch_many(['a.csv'])
+
+    forbid_download(monkeypatch)
+    results = cache.fetch_many(['a.csv'])
+
+    assert results['a.csv']['projectId'].tolist() == ['P-1']